@@ -8,18 +8,43 @@ import argparse
 import sys
 
 from scraper import find_all_operator_info
-from recruitop import find_recruitment_combos
+from recruitop import (
+    find_recruitment_combos,
+    find_batch_recruitment_combos,
+    simulate_recruitment,
+    use_recruitment_oracle,
+    serve_recruitment
+)
+from sync import sync_data_sources
 from recruitfuncs.tag_shortcut_editor import (
     create_tag_shortcut,
     list_tag_shortcuts,
     delete_tag_shortcut
 )
+from inputfuncs.scraper_functions import use_offline_data
+from inputfuncs.http_session import get_connection_counts
 
 
 VERSION = "ark v2.4.0"
 ### FUNCTIONS ########################
 
 
+def positive_int(value: str) -> int:
+    """Converts an argument to an int, making sure it's at least 1
+    (for use as an argparse type)."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"must be at least 1, not {number}"
+        )
+
+    return number
+
+
 def initialize_scraper_args(
         parser: argparse.ArgumentParser
 ) -> None:
@@ -89,6 +114,32 @@ def initialize_scraper_args(
         action="store_true"
     )
 
+    parser.add_argument(
+        "-j", "--jobs",
+        help="""How many operators to look up at the same time when
+                multiple operators are specified. The results are
+                still displayed in the order the operators were
+                specified in. (default: 1)
+                """,
+        type=int,
+        default=1
+    )
+    parser.add_argument(
+        "--processes",
+        help="""Use separate processes instead of threads when
+                looking up operators at the same time (with -j).
+                Helps when a lot of Gamepress pages need to be parsed.
+                """,
+        action="store_true"
+    )
+    parser.add_argument(
+        "--refresh",
+        help="""Always ask Gamepress whether an operator's page
+                changed, instead of reusing the saved one.
+                """,
+        action="store_true"
+    )
+
     parser.set_defaults(
         func=find_all_operator_info
     )
@@ -231,10 +282,242 @@ def initialize_recruit_args(
         action="store_true"
     )
 
+    recruit_parser.add_argument(
+        "-t", "--top",
+        help="""Only displays this many of the best combinations. The
+                combinations are searched best first, so the rest are
+                never worked out.
+                """,
+        type=positive_int
+    )
+    recruit_parser.add_argument(
+        "-m", "--min-rarity",
+        help="""Only displays the combinations that guarantee at least
+                this rarity.
+                """,
+        type=int
+    )
+
+    recruit_parser.add_argument(
+        "--refresh",
+        help="""Always ask the server whether the recruitment JSON
+                changed and rebuild the recruitment pool, instead of
+                reusing the saved one.
+                """,
+        action="store_true"
+    )
     recruit_parser.set_defaults(
         func=find_recruitment_combos
     )
 
+    # The batch recruitment subparser
+    batch_parser = subparsers.add_parser(
+        "batch",
+        description="""Find operators for many recruitment screens at
+                    once, reading one screen per line.
+                    """
+    )
+    batch_parser.add_argument(
+        "file",
+        help="""The file to read screens from, or '-' to read them
+                from stdin. Each line is either the tags separated by
+                spaces (like `recruit`), a JSON list of tags, or a JSON
+                object with the tags under "tags". (default: -)
+                """,
+        nargs="?",
+        default="-",
+        type=str
+    )
+    batch_parser.add_argument(
+        "-b", "--beneficial",
+        help="""Only displays the combinations that only give you a
+                4, 5 or 6 star.
+                """,
+        action="store_true"
+    )
+    batch_parser.add_argument(
+        "-t", "--top",
+        help="""Only displays this many of the best combinations. The
+                combinations are searched best first, so the rest are
+                never worked out.
+                """,
+        type=positive_int
+    )
+    batch_parser.add_argument(
+        "-m", "--min-rarity",
+        help="""Only displays the combinations that guarantee at least
+                this rarity.
+                """,
+        type=int
+    )
+
+    batch_parser.add_argument(
+        "--json",
+        help="""Prints the results of each screen as one JSON object
+                per line instead (for use with other tools).
+                """,
+        action="store_true"
+    )
+    batch_parser.add_argument(
+        "--refresh",
+        help="""Always ask the server whether the recruitment JSON
+                changed and rebuild the recruitment pool, instead of
+                reusing the saved one.
+                """,
+        action="store_true"
+    )
+    batch_parser.set_defaults(
+        func=find_batch_recruitment_combos
+    )
+
+    # The simulation subparser
+    simulate_parser = subparsers.add_parser(
+        "simulate",
+        description="""Simulate lots of random recruitment screens and
+                    see how often each rarity can be guaranteed, how
+                    much each tag is worth, and how often
+                    --beneficial finds something.
+                    """
+    )
+    simulate_parser.add_argument(
+        "-n", "--screens",
+        help="How many screens to simulate. (default: 100000)",
+        type=int,
+        default=100000
+    )
+    simulate_parser.add_argument(
+        "-s", "--seed",
+        help="""The seed to simulate with. The same seed always gives
+                the same results. (default: a random one, which is
+                shown with the results)
+                """,
+        type=str
+    )
+    simulate_parser.add_argument(
+        "-w", "--weighted",
+        help="""Make each tag as likely to show up as the number of
+                operators that have it, instead of every tag being
+                equally likely.
+                """,
+        action="store_true"
+    )
+    simulate_parser.add_argument(
+        "-j", "--jobs",
+        help="""How many processes to simulate with.
+                (default: one per core)
+                """,
+        type=int
+    )
+    simulate_parser.add_argument(
+        "--json",
+        help="""Prints the results as a JSON object instead (for use
+                with other tools).
+                """,
+        action="store_true"
+    )
+    simulate_parser.add_argument(
+        "--refresh",
+        help="""Always ask the server whether the recruitment JSON
+                changed and rebuild the recruitment pool, instead of
+                reusing the saved one.
+                """,
+        action="store_true"
+    )
+    simulate_parser.set_defaults(
+        func=simulate_recruitment
+    )
+
+    # The screen oracle subparser
+    oracle_parser = subparsers.add_parser(
+        "oracle",
+        description="""Work out the best result of every possible 5 tag
+                    recruitment screen ahead of time, or report on
+                    those results.
+                    """
+    )
+    oracle_parser.add_argument(
+        "mode",
+        help="""`build` evaluates every screen of the current
+                recruitment pool and saves the results (after which
+                `recruit` also shows the best guaranteed rarity of any
+                5 tag screen), while `report` shows how many screens
+                guarantee each rarity.
+                """,
+        choices=["build", "report"],
+        action="store"
+    )
+    oracle_parser.add_argument(
+        "-j", "--jobs",
+        help="""How many processes to evaluate screens with in `build`
+                mode when NumPy isn't installed. (default: one per core)
+                """,
+        type=int
+    )
+    oracle_parser.add_argument(
+        "-m", "--min-rarity",
+        help="""In `report` mode, also lists every screen that
+                guarantees at least this rarity, and the combination
+                of tags that guarantees it.
+                """,
+        type=int
+    )
+    oracle_parser.add_argument(
+        "--json",
+        help="""In `report` mode, lists the screens as one JSON
+                object per line instead (for use with other tools).
+                """,
+        action="store_true"
+    )
+    oracle_parser.add_argument(
+        "--refresh",
+        help="""Always ask the server whether the recruitment JSON
+                changed and rebuild the recruitment pool, instead of
+                reusing the saved one.
+                """,
+        action="store_true"
+    )
+    oracle_parser.set_defaults(
+        func=use_recruitment_oracle
+    )
+
+    # The recruitment server subparser
+    serve_parser = subparsers.add_parser(
+        "serve",
+        description="""Keep the recruitment pool loaded in a local
+                    server, so that `recruit` commands are answered
+                    right away instead of loading it every time. Stop
+                    it with Ctrl+C.
+                    """
+    )
+    serve_parser.add_argument(
+        "-p", "--port",
+        help="""The port to listen on. (default: the one in
+                `src/info/network/serverSettings.txt`, where 0 means
+                any free port)
+                """,
+        type=int
+    )
+    serve_parser.add_argument(
+        "-r", "--reload-interval",
+        help="""How many seconds to wait between checks for a new
+                recruitment JSON. (default: the one in
+                `src/info/network/serverSettings.txt`)
+                """,
+        type=float
+    )
+    serve_parser.set_defaults(
+        func=serve_recruitment
+    )
+
+
+def initialize_sync_args(
+        parser: argparse.ArgumentParser
+) -> None:
+    """Set up the `sync` subcommand's flags and arguments."""
+    parser.set_defaults(
+        func=sync_data_sources
+    )
+
 ######################################
 
 
@@ -257,6 +540,29 @@ def initialize_parsers() -> argparse.ArgumentParser:
         action="version",
         version=VERSION
     )
+    parser.add_argument(
+        "--offline",
+        help="""Never connect to the internet, and read every JSON from
+                the snapshots in the data directory instead (which can
+                be downloaded using the `sync` command). Gamepress
+                pages are not available in this mode.
+                """,
+        action="store_true"
+    )
+    parser.add_argument(
+        "--data-dir",
+        help="""The folder that `sync` saves snapshots to and that
+                --offline reads them from. (default: ./data)
+                """,
+        default="./data"
+    )
+    parser.add_argument(
+        "--debug",
+        help="""After the command is done, prints how many connections
+                were opened and how many were reused (to stderr).
+                """,
+        action="store_true"
+    )
     parser.set_defaults(
         version=VERSION,
         func=handle_no_func
@@ -286,6 +592,15 @@ def initialize_parsers() -> argparse.ArgumentParser:
     )
     initialize_recruit_args(recruitment_parser)
 
+    sync_parser = subparsers.add_parser(
+        "sync",
+        description="""Download every JSON used by the other commands
+                    into the data directory, so that they can be used
+                    with --offline.
+                    """,
+    )
+    initialize_sync_args(sync_parser)
+
     return parser
 
 
@@ -295,8 +610,19 @@ def start_parser() -> None:
     parser = initialize_parsers()
     # Parse args and call the appropriate function
     args = parser.parse_args()
+
+    if args.offline:
+        use_offline_data(args.data_dir)
+
     args.func(args)
 
+    if args.debug:
+        connection_counts = get_connection_counts()
+        sys.stderr.write(
+            f"Connections: {connection_counts['opened']} opened, "
+            + f"{connection_counts['reused']} reused\n"
+        )
+
 
 if __name__ == "__main__":
     start_parser()
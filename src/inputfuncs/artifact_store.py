@@ -0,0 +1,136 @@
+"""A module with functions for saving and loading things this program
+builds out of fetched data (indexes, trimmed tables, etc.), so that
+they only have to be built again when the data they came from changes.
+"""
+
+import sys
+import os
+import threading
+import time
+import pickle
+from typing import Any, Optional
+
+from inputfuncs.input_reader import read_lines_into_dict
+
+
+def get_artifact_path(
+        kind: str,
+        key: str,
+        extension: str = ".pickle"
+) -> str:
+    """Returns the path of the file that a certain artifact is stored
+    in.
+
+    Keyword arguments:
+
+    kind -- string, what type of artifact this is (eg. the name of
+    the index), which becomes the folder it's stored in
+
+    key -- string, what the artifact was built from (usually the hash
+    of the data it was built out of)
+
+    extension -- string, the extension of the file (default: .pickle)
+    """
+    settings = read_lines_into_dict("./info/network/cacheSettings.txt")
+
+    return os.path.join(
+        settings["artifact_directory"],
+        kind,
+        key + extension
+    )
+
+
+def load_artifact(kind: str, key: str) -> Optional[Any]:
+    """Loads a previously saved artifact and returns it.
+
+    Returns None if it was never saved, or if the file can't be read
+    (in which case it should just be built again).
+    """
+    try:
+        with open(get_artifact_path(kind, key), "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+
+
+def save_artifact(
+        kind: str,
+        key: str,
+        artifact: Any,
+        prune: bool = True
+) -> None:
+    """Saves an artifact so that it can be loaded again later.
+
+    If prune is True, any other artifacts of the same kind are
+    removed, since that usually means the data they were built from
+    has changed.
+    """
+    path = get_artifact_path(kind, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write to a temporary file first so nothing can load a
+    # half-written artifact
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+    if prune:
+        prune_artifacts(path)
+
+
+def prune_artifacts(kept_path: str) -> None:
+    """Removes every artifact of the same kind as the one at kept_path
+    (ie. in the same folder), except for that one.
+
+    Artifacts that can't be removed right now (eg. because they're
+    still open somewhere) are simply left for next time.
+    """
+    directory = os.path.dirname(kept_path)
+
+    for file_name in os.listdir(directory):
+        old_path = os.path.join(directory, file_name)
+        if old_path != kept_path and not file_name.endswith(".tmp"):
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+
+def touch_artifact(kind: str, key: str) -> None:
+    """Marks an artifact as just used, so prune_old_artifacts() keeps
+    it around for longer."""
+    try:
+        os.utime(get_artifact_path(kind, key))
+    except OSError:
+        pass
+
+
+def prune_old_artifacts(kind: str, max_age: float) -> None:
+    """Removes every artifact of a certain kind that hasn't been saved
+    (or touched, see touch_artifact()) in the last max_age seconds.
+
+    This is for kinds with many artifacts that are all kept (eg. one
+    per page), which prune_artifacts() can't be used for.
+    """
+    directory = os.path.dirname(get_artifact_path(kind, ""))
+    oldest_time = time.time() - max_age
+
+    try:
+        file_names = os.listdir(directory)
+    except OSError:
+        return
+
+    for file_name in file_names:
+        old_path = os.path.join(directory, file_name)
+        try:
+            if os.path.getmtime(old_path) < oldest_time:
+                os.remove(old_path)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
@@ -0,0 +1,242 @@
+"""A module that keeps track of every JSON table this program reads
+(Aceship's character, skill, and building JSONs, etc.) and makes sure
+each of them is only fetched and decoded once per run."""
+
+import sys
+import os
+import hashlib
+import threading
+import asyncio
+from typing import Optional, Any, Sequence
+
+from inputfuncs.input_reader import read_line_from_file
+from inputfuncs.scraper_functions import scrape_json, get_cached_body_hash
+from inputfuncs.artifact_store import (
+    get_artifact_path,
+    load_artifact,
+    save_artifact,
+    prune_artifacts
+)
+from inputfuncs.record_store import RecordStore, write_record_store
+from inputfuncs.table_trimmers import (
+    TRIMMED_TABLE_VERSION,
+    iter_trimmed_members,
+    trim_table_stream
+)
+
+
+# The name of each table, and the file holding the url to fetch it from
+DATA_SOURCES = {
+    "character": "./info/scraper/operatorJsonUrl.txt",
+    "skill": "./info/scraper/skillsJsonUrl.txt",
+    "building": "./info/scraper/baseSkillsJsonUrl.txt",
+    "riic": "./info/scraper/riicJsonUrl.txt",
+    "recruit": "./info/recruitops/recruitTagJsonUrl.txt",
+    # Gamepress' stat rankings, keyed by operator name once it's loaded
+    "stats": "./info/scraper/statsJsonUrl.txt",
+}
+
+# The tables that are usually only read a few entries at a time, and
+# so are loaded as record tables (see get_record_table())
+RECORD_TABLES = ["character", "skill"]
+
+# Every table that has already been loaded this run, and the hash
+# of the body each one was decoded from
+_loaded_tables = {}
+_record_tables = {}
+_table_digests = {}
+
+# How many bytes of a JSON are read at a time when it's streamed
+STREAM_CHUNK_SIZE = 1 << 16
+
+# One lock per table, so that operators being looked up at the same
+# time don't all download the same table
+_table_locks = {name: threading.RLock() for name in DATA_SOURCES}
+
+
+def get_source_url(name: str) -> str:
+    """Returns the url that a certain table is fetched from."""
+    return read_line_from_file(DATA_SOURCES[name])
+
+
+def _fetch_source(name: str, refresh: bool = False):
+    """Fetches the JSON a table comes from, remembers the hash of its
+    body, and returns the Response object (or None if it failed).
+
+    The body of a cached JSON isn't read until the Response's content
+    is asked for, and the hash of it is taken from the cache instead,
+    so checking which version of a JSON we have costs next to nothing.
+
+    If refresh is True, the server is asked whether the JSON changed
+    even if the cached copy is still fresh. If it did, the table
+    loaded from the old JSON is forgotten, so the next call loads the
+    new one.
+    """
+    url = get_source_url(name)
+    response = scrape_json(url, refresh, stream=True)
+
+    if response is not None:
+        digest = get_cached_body_hash(url)
+        if digest is None:
+            digest = hashlib.sha256(response.content).hexdigest()
+        if _table_digests.get(name, digest) != digest:
+            _loaded_tables.pop(name, None)
+            _record_tables.pop(name, None)
+
+        _table_digests[name] = digest
+
+    return response
+
+
+def get_json_table(name: str) -> Optional[Any]:
+    """Returns the decoded JSON table with the specified name,
+    fetching and decoding it first if this is the first time it has
+    been asked for.
+
+    Every caller gets the same object back, so the table must never be
+    edited. Returns None if the table could not be fetched, in which
+    case the next call will try fetching it again.
+
+    Only the parts of the table this program reads are kept (see
+    table_trimmers.py). The trimmed table is saved as a binary
+    snapshot, so that later runs can load it in a few milliseconds
+    instead of decoding the whole JSON again, until the JSON changes.
+    """
+    with _table_locks[name]:
+        if name not in _loaded_tables.keys():
+            # If we already know which version of the JSON this is,
+            # its snapshot may let us skip fetching it again
+            table = (
+                load_artifact(
+                    "table_" + name,
+                    f"{_table_digests[name]}-v{TRIMMED_TABLE_VERSION}"
+                )
+                if name in _table_digests.keys()
+                else None
+            )
+
+            if table is None:
+                response = _fetch_source(name)
+                if response is None:
+                    return None
+
+                snapshot_key = (
+                    f"{_table_digests[name]}-v{TRIMMED_TABLE_VERSION}"
+                )
+                table = load_artifact("table_" + name, snapshot_key)
+                if table is None:
+                    # The JSON is decoded piece by piece and trimmed as
+                    # it goes, so the full table is never in memory
+                    table = trim_table_stream(
+                        name,
+                        response.iter_content(STREAM_CHUNK_SIZE)
+                    )
+                    save_artifact("table_" + name, snapshot_key, table)
+
+            _loaded_tables[name] = table
+
+    return _loaded_tables[name]
+
+
+def get_record_table(name: str) -> Optional[RecordStore]:
+    """Returns the table with the specified name as a RecordStore,
+    which can be used like a (read-only) dict but only decodes the
+    entries that are actually accessed.
+
+    The record file is named after the hash of the JSON, and is built
+    (by streaming the JSON) the first time a version of the JSON is
+    seen. After that, the JSON itself is never read again, only the
+    record file is opened. Returns None if the table could not be
+    fetched.
+    """
+    with _table_locks[name]:
+        if name not in _record_tables.keys():
+            digest = get_table_digest(name)
+            if digest is None:
+                return None
+
+            path = get_artifact_path(
+                "records_" + name,
+                f"{digest}-v{TRIMMED_TABLE_VERSION}",
+                ".records"
+            )
+
+            if not os.path.exists(path):
+                if name in _loaded_tables.keys():
+                    records = _loaded_tables[name].items()
+                else:
+                    # Stream the JSON straight into the record file, so
+                    # only one entry is ever decoded at a time
+                    response = _fetch_source(name)
+                    if response is None:
+                        return None
+
+                    path = get_artifact_path(
+                        "records_" + name,
+                        f"{_table_digests[name]}-v{TRIMMED_TABLE_VERSION}",
+                        ".records"
+                    )
+                    records = iter_trimmed_members(
+                        name,
+                        response.iter_content(STREAM_CHUNK_SIZE)
+                    )
+
+                write_record_store(path, records)
+                prune_artifacts(path)
+
+            _record_tables[name] = RecordStore(path)
+
+    return _record_tables[name]
+
+
+def load_tables(names: Sequence[str]) -> None:
+    """Fetches and loads every specified table at the same time, so
+    that loading all of them only takes as long as the slowest one.
+
+    Tables in RECORD_TABLES are loaded as record tables and the rest
+    as JSON tables, after which they can be retrieved as usual.
+    Tables that were already loaded are skipped.
+    """
+    loaders = [
+        (get_record_table, name)
+        if name in RECORD_TABLES
+        else (get_json_table, name)
+        for name in names
+        if name not in _record_tables.keys()
+        and name not in _loaded_tables.keys()
+    ]
+    if len(loaders) <= 1:
+        for loader, name in loaders:
+            loader(name)
+        return
+
+    async def load_all():
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(None, loader, name)
+            for loader, name in loaders
+        ])
+
+    asyncio.run(load_all())
+
+
+def get_table_digest(name: str, refresh: bool = False) -> Optional[str]:
+    """Returns the hash of the JSON that a table comes from, which
+    changes whenever the table itself changes.
+
+    The JSON is fetched (but not read, if it's cached) if it hasn't
+    been yet, or if refresh is True (in which case the server is always asked whether
+    it changed). Returns None if the JSON could not be fetched.
+    """
+    with _table_locks[name]:
+        if refresh or name not in _table_digests.keys():
+            if _fetch_source(name, refresh) is None:
+                return None
+
+    return _table_digests[name]
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
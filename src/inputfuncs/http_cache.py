@@ -0,0 +1,334 @@
+"""A module that contains the ResponseCache class, which keeps the
+bodies of previously fetched web pages and JSONs on disk so that they
+don't have to be downloaded again every time the program is run."""
+
+import sys
+import os
+import threading
+import json
+import time
+import hashlib
+from typing import Optional, Dict, BinaryIO
+
+from inputfuncs.input_reader import read_lines_into_dict
+
+
+class ResponseCache:
+    """The class for storing and retrieving cached responses.
+
+    Every cached url gets a small metadata file (named after the hash
+    of the url) that stores the validators (ETag, Last-Modified) sent
+    by the server, when the url was last fetched, and the hash of the
+    body. The bodies themselves are stored by the hash of their
+    content, so identical bodies are only ever stored once.
+
+    Whenever the cache grows over its maximum size, the least recently
+    used entries are removed until it fits again.
+
+    Public variables:
+
+    directory
+
+    ttl
+
+    max_size
+
+    Public methods:
+
+    lookup(url)
+
+    is_fresh(entry)
+
+    get_conditional_headers(entry)
+
+    load_body(entry)
+
+    open_body(entry)
+
+    store(url, headers, body)
+
+    revalidate(entry, headers)
+
+    clear()
+
+    """
+
+    # Only these headers are kept around, as they're the only ones
+    # needed to revalidate or to decode the body again later.
+    KEPT_HEADERS = ["ETag", "Last-Modified", "Content-Type"]
+
+    def __init__(
+            self,
+            directory: str,
+            ttl: int,
+            max_size: int
+    ) -> None:
+        """Initializes a ResponseCache.
+
+        Keyword arguments:
+
+        directory -- string, the folder that all cache files go in
+
+        ttl -- int, how many seconds an entry can be used without
+        asking the server if it has changed
+
+        max_size -- int, the maximum amount of bytes that all
+        cached bodies can take up together
+        """
+        self._directory = directory
+        self._ttl = ttl
+        self._max_size = max_size
+
+        self._meta_dir = os.path.join(directory, "meta")
+        self._blob_dir = os.path.join(directory, "blobs")
+
+    @property
+    def directory(self) -> str:
+        """Retrieves the folder this cache is stored in."""
+        return self._directory
+
+    @property
+    def ttl(self) -> int:
+        """Retrieves how long (in seconds) an entry stays fresh."""
+        return self._ttl
+
+    @property
+    def max_size(self) -> int:
+        """Retrieves the maximum size of this cache, in bytes."""
+        return self._max_size
+
+    def _meta_path(self, url: str) -> str:
+        """Returns the path of the metadata file for a url."""
+        url_hash = hashlib.sha256(url.encode("utf8")).hexdigest()
+        return os.path.join(self._meta_dir, url_hash + ".json")
+
+    def _blob_path(self, body_hash: str) -> str:
+        """Returns the path of the file holding a certain body."""
+        return os.path.join(self._blob_dir, body_hash)
+
+    def _write_file(self, path: str, data: bytes) -> None:
+        """Writes data to a file by writing to a temporary file first
+        and then replacing the real one, so that a half-written file
+        can never be read."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _write_entry(self, entry: Dict) -> None:
+        """Saves the metadata of an entry to its metadata file."""
+        self._write_file(
+            self._meta_path(entry["url"]),
+            json.dumps(entry).encode("utf8")
+        )
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Finds the cache entry for a url and returns it.
+
+        Returns None if the url was never cached (or was evicted).
+        """
+        try:
+            with open(self._meta_path(url), "r", encoding="utf8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("url") != url:
+            return None
+
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Checks whether an entry can be used without revalidating
+        it with the server first."""
+        return time.time() - entry["fetched"] < self._ttl
+
+    def get_conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        """Builds the headers needed for a conditional GET request,
+        so that the server can respond with a 304 if nothing changed.
+        """
+        headers = {}
+
+        if "ETag" in entry["headers"].keys():
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if "Last-Modified" in entry["headers"].keys():
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        return headers
+
+    def load_body(self, entry: Dict) -> Optional[bytes]:
+        """Reads the body of an entry from the disk and marks the entry
+        as recently used.
+
+        Returns None if the body is missing or has been tampered with,
+        in which case the entry should be treated as not cached.
+        """
+        try:
+            with open(self._blob_path(entry["body_hash"]), "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+
+        if hashlib.sha256(body).hexdigest() != entry["body_hash"]:
+            return None
+
+        entry["last_access"] = time.time()
+        self._write_entry(entry)
+
+        return body
+
+    def open_body(self, entry: Dict) -> Optional[BinaryIO]:
+        """Opens the body of an entry for reading and marks the entry
+        as recently used, so that a big body can be read a piece at a
+        time instead of all at once.
+
+        Returns None if the body is missing. Unlike load_body(), the
+        body isn't checked against its hash, since that would mean
+        reading the whole thing first.
+        """
+        try:
+            body_file = open(self._blob_path(entry["body_hash"]), "rb")
+        except OSError:
+            return None
+
+        entry["last_access"] = time.time()
+        self._write_entry(entry)
+
+        return body_file
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes) -> Dict:
+        """Saves a freshly downloaded body (and the headers that came
+        with it) to the cache, and returns the new entry.
+
+        If this makes the cache grow too big, old entries are evicted.
+        """
+        body_hash = hashlib.sha256(body).hexdigest()
+        if not os.path.exists(self._blob_path(body_hash)):
+            self._write_file(self._blob_path(body_hash), body)
+
+        now = time.time()
+        entry = {
+            "url": url,
+            "headers": {
+                header: headers[header]
+                for header in ResponseCache.KEPT_HEADERS
+                if header in headers.keys()
+            },
+            "body_hash": body_hash,
+            "size": len(body),
+            "fetched": now,
+            "last_access": now
+        }
+        self._write_entry(entry)
+
+        self._evict()
+
+        return entry
+
+    def revalidate(self, entry: Dict, headers: Dict[str, str]) -> None:
+        """Marks an entry as fresh again after the server responded
+        with a 304 (Not Modified), updating any new validators."""
+        for header in ResponseCache.KEPT_HEADERS:
+            if header in headers.keys():
+                entry["headers"][header] = headers[header]
+
+        entry["fetched"] = time.time()
+        self._write_entry(entry)
+
+    def _all_entries(self):
+        """Loads the metadata of every entry currently in the cache
+        and returns them with their metadata paths."""
+        entries = []
+
+        if not os.path.isdir(self._meta_dir):
+            return entries
+
+        for file_name in os.listdir(self._meta_dir):
+            if not file_name.endswith(".json"):
+                continue
+
+            path = os.path.join(self._meta_dir, file_name)
+            try:
+                with open(path, "r", encoding="utf8") as f:
+                    entries.append((path, json.load(f)))
+            except (OSError, ValueError):
+                continue
+
+        return entries
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries until every body
+        stored fits within the maximum size of the cache."""
+        entries = self._all_entries()
+
+        # Bodies can be shared between entries, so only count
+        # each one once
+        blob_sizes = {
+            entry["body_hash"]: entry["size"] for _, entry in entries
+        }
+        total_size = sum(blob_sizes.values())
+
+        if total_size <= self._max_size:
+            return
+
+        entries.sort(key=lambda e: e[1]["last_access"])
+        while total_size > self._max_size and len(entries) > 0:
+            path, entry = entries.pop(0)
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+            # Only delete the body once nothing else points to it
+            if all(e["body_hash"] != entry["body_hash"] for _, e in entries):
+                try:
+                    os.remove(self._blob_path(entry["body_hash"]))
+                except OSError:
+                    pass
+                total_size -= entry["size"]
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        for path, entry in self._all_entries():
+            for file_path in [path, self._blob_path(entry["body_hash"])]:
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+
+
+_response_cache = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Returns the ResponseCache used by every fetch in this program,
+    creating it from the cache settings file the first time.
+
+    Returns None if caching has been turned off in the settings.
+    """
+    global _response_cache
+
+    if _response_cache is None:
+        settings = read_lines_into_dict(
+            "./info/network/cacheSettings.txt"
+        )
+
+        if settings["enabled"].lower() != "true":
+            return None
+
+        _response_cache = ResponseCache(
+            settings["directory"],
+            int(settings["ttl"]),
+            int(settings["max_size"])
+        )
+
+    return _response_cache
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
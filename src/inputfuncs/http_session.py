@@ -0,0 +1,156 @@
+"""A module that holds the one requests Session shared by every fetch
+in this program, so that connections to the same host are kept alive
+and reused instead of being reopened for every request."""
+
+import sys
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from inputfuncs.input_reader import read_lines_into_dict
+
+
+# How many connections have been opened, and how many times a
+# connection has been checked out of a pool (opened or reused).
+_connection_counts = {"opened": 0, "checkouts": 0}
+_counts_lock = threading.Lock()
+
+
+def _count(counter: str) -> None:
+    """Increases one of the connection counters by one."""
+    with _counts_lock:
+        _connection_counts[counter] += 1
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    """An HTTPConnectionPool that counts its new and reused
+    connections."""
+
+    def _new_conn(self):
+        """Opens a new connection, counting it."""
+        _count("opened")
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        """Checks a connection out of the pool, counting it."""
+        _count("checkouts")
+        return super()._get_conn(timeout)
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """An HTTPSConnectionPool that counts its new and reused
+    connections."""
+
+    def _new_conn(self):
+        """Opens a new connection, counting it."""
+        _count("opened")
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        """Checks a connection out of the pool, counting it."""
+        _count("checkouts")
+        return super()._get_conn(timeout)
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter whose connection pools count how many
+    connections they open and reuse."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Sets up the pool manager, swapping in the counting pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool
+        }
+
+
+def get_accepted_encodings() -> str:
+    """Returns the value of the Accept-Encoding header to send.
+
+    Brotli is only asked for if a brotli library is installed, since
+    urllib3 can't decode it otherwise.
+    """
+    encodings = ["gzip", "deflate"]
+
+    try:
+        import brotli  # noqa: F401 # pylint: disable=import-outside-toplevel
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401 # pylint: disable=import-outside-toplevel
+            encodings.append("br")
+        except ImportError:
+            pass
+
+    return ", ".join(encodings)
+
+
+_session = None
+_timeout = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Returns the Session shared by every fetch in this program,
+    creating it from the session settings file the first time.
+
+    Requests made with it should pass get_timeout() as their timeout,
+    since a Session has no timeout of its own.
+    """
+    global _session, _timeout
+
+    with _session_lock:
+        if _session is None:
+            settings = read_lines_into_dict(
+                "./info/network/sessionSettings.txt"
+            )
+
+            adapter = CountingHTTPAdapter(
+                pool_connections=int(settings["pool_connections"]),
+                pool_maxsize=int(settings["pool_maxsize"])
+            )
+
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "Accept-Encoding": get_accepted_encodings(),
+                "Connection": "keep-alive"
+            })
+
+            _timeout = float(settings["timeout"])
+            _session = session
+
+    return _session
+
+
+def get_timeout() -> float:
+    """Returns how many seconds a request waits on the server (to
+    connect, or for the next piece of the response) before it's given
+    up on."""
+    get_session()
+
+    return _timeout
+
+
+def get_connection_counts() -> Dict[str, int]:
+    """Returns how many connections have been opened and how many
+    times an already open connection has been reused."""
+    with _counts_lock:
+        return {
+            "opened": _connection_counts["opened"],
+            "reused": (
+                _connection_counts["checkouts"]
+                - _connection_counts["opened"]
+            )
+        }
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
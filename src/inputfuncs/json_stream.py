@@ -0,0 +1,253 @@
+"""A module with functions for reading big JSON documents piece by
+piece, so that the whole document never has to be decoded into
+Python objects at once."""
+
+import sys
+import json
+import codecs
+from typing import Any, Iterable, Iterator, Sequence, Tuple, Union
+
+
+# How many characters have to be used up before they're cut off the
+# front of the buffer
+_COMPACT_SIZE = 1 << 20
+
+# Every character that can be part of a JSON number
+_NUMBER_CHARACTERS = "0123456789+-.eE"
+
+
+class _JsonStreamReader:
+    """Reads JSON tokens and values out of a stream of chunks, only
+    keeping the part of the document that hasn't been read yet."""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]) -> None:
+        """Initializes a _JsonStreamReader.
+
+        Keyword arguments:
+
+        chunks -- iterable, the pieces of the JSON document in order,
+        either as (utf8) bytes or as strings
+        """
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+
+    def _fill(self) -> bool:
+        """Adds the next chunk to the buffer.
+
+        Returns False if there are no chunks left.
+        """
+        if self._exhausted:
+            return False
+
+        # Drop everything that has already been read
+        if self._pos >= _COMPACT_SIZE:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._exhausted = True
+            self._buffer += self._text_decoder.decode(b"", final=True)
+            return False
+
+        self._buffer += (
+            self._text_decoder.decode(chunk)
+            if isinstance(chunk, bytes)
+            else chunk
+        )
+        return True
+
+    def _fill_more(self) -> bool:
+        """Keeps adding chunks until the unread part of the buffer has
+        at least doubled, so that retrying a big value that didn't fit
+        doesn't take forever.
+
+        Returns False if there were no chunks left at all.
+        """
+        wanted_length = len(self._buffer) + max(
+            len(self._buffer) - self._pos,
+            1
+        )
+
+        filled = False
+        while len(self._buffer) < wanted_length and self._fill():
+            filled = True
+
+        return filled
+
+    def peek(self) -> str:
+        """Skips any whitespace and returns the next character without
+        reading it. Returns an empty string at the end of the document.
+        """
+        while True:
+            while (
+                    self._pos < len(self._buffer)
+                    and self._buffer[self._pos] in " \t\n\r"
+            ):
+                self._pos += 1
+
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._fill():
+                return ""
+
+    def expect(self, character: str) -> None:
+        """Reads the next character, making sure it's the one that
+        was expected."""
+        if self.peek() != character:
+            raise ValueError(
+                f"Expected '{character}' at position {self._pos} "
+                + "of the JSON stream."
+            )
+
+        self._pos += 1
+
+    def _runs_to_end(self, pos: int) -> bool:
+        """Determines if the buffer from pos onwards is nothing but
+        characters that could be part of a number."""
+        while (
+                pos < len(self._buffer)
+                and self._buffer[pos] in _NUMBER_CHARACTERS
+        ):
+            pos += 1
+
+        return pos == len(self._buffer)
+
+    def read_value(self) -> Any:
+        """Reads and decodes the next complete JSON value."""
+        self.peek()
+
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(
+                    self._buffer,
+                    self._pos
+                )
+            except json.JSONDecodeError:
+                # Most likely the value just isn't complete yet
+                if not self._fill_more():
+                    raise
+                continue
+
+            # A number that runs up to the end of the buffer could
+            # still have more digits on the way (it may even have
+            # stopped early, at something like `1.` or `1.5e`)
+            if (
+                    isinstance(value, (int, float))
+                    and not isinstance(value, bool)
+                    and self._runs_to_end(end)
+                    and self._fill_more()
+            ):
+                continue
+
+            self._pos = end
+            return value
+
+
+def _open_members(
+        reader: _JsonStreamReader,
+        path: Sequence[str]
+) -> bool:
+    """Reads up to the first member of the object (or list) found at
+    the specified path, and returns whether it's a list."""
+    # Walk down to the object at the end of the path, skipping over
+    # (decoding and dropping) every sibling along the way
+    for wanted_key in path:
+        reader.expect("{")
+        while True:
+            if reader.peek() == "}":
+                raise KeyError(wanted_key)
+
+            key = reader.read_value()
+            reader.expect(":")
+
+            if key == wanted_key:
+                break
+
+            reader.read_value()
+            if reader.peek() != ",":
+                raise KeyError(wanted_key)
+            reader.expect(",")
+
+    if reader.peek() == "[":
+        reader.expect("[")
+        return True
+
+    reader.expect("{")
+    return False
+
+
+def _iter_members(
+        reader: _JsonStreamReader,
+        is_list: bool
+) -> Iterator[Tuple[Union[str, int], Any]]:
+    """Yields every member of an object (or item of a list) that was
+    opened with _open_members()."""
+    closing_character = "]" if is_list else "}"
+
+    if reader.peek() == closing_character:
+        return
+
+    index = 0
+    while True:
+        if is_list:
+            yield index, reader.read_value()
+            index += 1
+        else:
+            key = reader.read_value()
+            reader.expect(":")
+            yield key, reader.read_value()
+
+        if reader.peek() == closing_character:
+            return
+        reader.expect(",")
+
+
+def iter_json_members(
+        chunks: Iterable[Union[bytes, str]],
+        path: Sequence[str] = ()
+) -> Iterator[Tuple[Union[str, int], Any]]:
+    """Reads a JSON document from a stream of chunks and yields every
+    member of the object (or item of the list) found at the specified
+    path, as (key, value) pairs (or (index, item) pairs for a list).
+
+    Only one member is ever decoded at a time, and the stream is only
+    read as far as needed, so stopping early stops reading too.
+
+    Keyword arguments:
+
+    chunks -- iterable, the pieces of the JSON document in order (eg.
+    Response.iter_content())
+
+    path -- list, the keys leading from the top of the document to
+    the object whose members should be read (default: the top itself)
+    """
+    reader = _JsonStreamReader(chunks)
+
+    yield from _iter_members(reader, _open_members(reader, path))
+
+
+def open_json_members(
+        chunks: Iterable[Union[bytes, str]],
+        path: Sequence[str] = ()
+) -> Tuple[bool, Iterator[Tuple[Union[str, int], Any]]]:
+    """Same as iter_json_members(), but reads up to the first member
+    straight away and also returns whether the members are the items
+    of a list (which can't be told from the members themselves when
+    there aren't any)."""
+    reader = _JsonStreamReader(chunks)
+    is_list = _open_members(reader, path)
+
+    return is_list, _iter_members(reader, is_list)
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
@@ -2,35 +2,170 @@
 from a web source, instead of a file."""
 
 import sys
+import os
+import asyncio
+from urllib.parse import urlparse
+from typing import List, Optional, Sequence
+
 import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 from inputfuncs.input_reader import (
     read_line_from_file,
     read_lines_into_dict
 )
+from inputfuncs.http_cache import get_response_cache
+from inputfuncs.http_session import get_session, get_timeout
+
+
+# When this is set, every fetch is read from this folder of
+# snapshots instead of the internet
+_offline_directory = None
+
+
+def use_offline_data(directory):
+    """Makes every fetch from now on read from the snapshots in the
+    specified folder (made by `ark.py sync`) instead of the internet.
+    """
+    global _offline_directory
+    _offline_directory = directory
+
+
+def get_snapshot_path(url, directory):
+    """Returns the path of the file in a snapshot folder that holds
+    the body of a certain url.
+
+    The file is named after the last part of the url (eg.
+    `character_table.json`), just like if it was downloaded by hand.
+    """
+    return os.path.join(directory, os.path.basename(urlparse(url).path))
+
+
+def read_snapshot(url):
+    """Reads the snapshot of a url from the offline folder and returns
+    it as a Response object.
+
+    Returns None if there is no snapshot of the url, just like a
+    failed request would.
+    """
+    try:
+        with open(get_snapshot_path(url, _offline_directory), "rb") as f:
+            body = f.read()
+    except OSError:
+        return None
+
+    return build_cached_response(url, {"headers": {}}, body)
 
 
-def scrape_website(url):
+def build_cached_response(url, entry, body):
+    """Builds a Response object out of a cache entry and its body, so
+    that a cached page can be used exactly like a freshly fetched one.
+
+    The body can either be bytes, or a file that is only read once the
+    Response's content is asked for (just like a streamed request).
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = get_encoding_from_headers(response.headers)
+
+    if isinstance(body, bytes):
+        response._content = body
+        response._content_consumed = True
+    else:
+        response.raw = body
+
+    return response
+
+
+def get_cached_body_hash(url):
+    """Returns the hash of the cached body of a url (which is the same
+    as the sha256 of the body itself), without reading the body.
+
+    Returns None in offline mode, if caching is turned off, or if the
+    url isn't cached.
+    """
+    if _offline_directory is not None:
+        return None
+
+    cache = get_response_cache()
+    if cache is None:
+        return None
+
+    entry = cache.lookup(url)
+    return entry["body_hash"] if entry is not None else None
+
+
+def scrape_website(url, refresh=False, stream=False):
     """Sends a GET request to a certain url and returns the Response
     object if status code is 200.
 
     Returns None if the server responds with a different code.
+
+    If the url has been fetched before, the cached copy is returned
+    instead while it is still fresh. Once it isn't (or if refresh is
+    True), the server is asked whether it changed (using the cached
+    ETag/Last-Modified), and the cached copy is reused if it responds
+    with a 304.
+
+    If stream is True, a cached body is only read from the disk once
+    the Response's content is asked for, so it can be read a piece at
+    a time with iter_content() (or not at all).
+
+    In offline mode (see use_offline_data()), the url is read from its
+    snapshot instead and the internet is never touched.
     """
-    result = requests.get(url)
+    if _offline_directory is not None:
+        return read_snapshot(url)
+
+    cache = get_response_cache()
+    if cache is None:
+        result = get_session().get(url, timeout=get_timeout())
+
+        # if (True): # debugging
+        if result.status_code == 200:
+            return result
+
+        return None
+
+    entry = cache.lookup(url)
+    if entry is not None and not refresh and cache.is_fresh(entry):
+        body = cache.open_body(entry) if stream else cache.load_body(entry)
+        if body is not None:
+            return build_cached_response(url, entry, body)
+
+        entry = None  # The body went missing, so fetch it again
+
+    result = get_session().get(
+        url,
+        timeout=get_timeout(),
+        headers=(
+            cache.get_conditional_headers(entry)
+            if entry is not None
+            else {}
+        )
+    )
+
+    if result.status_code == 304 and entry is not None:
+        body = cache.open_body(entry) if stream else cache.load_body(entry)
+        if body is not None:
+            cache.revalidate(entry, result.headers)
+            return build_cached_response(url, entry, body)
+
+        # The body vanished between the lookup and now, so ask again
+        # without any validators.
+        result = get_session().get(url, timeout=get_timeout())
 
-    # if (True): # debugging
     if result.status_code == 200:
+        cache.store(url, result.headers, result.content)
         return result
 
     return None
 
 
-def scrape_for_operator(operator):
-    """Sends a GET request for a certain operator and returns the
-    Response object if status code is 200.
-
-    Returns None (as per scrape_website() implementation) if server
-    responds with a different code.
-    """
+def get_operator_url(operator):
+    """Returns the url of a certain operator's Gamepress page."""
     url_replacement_names = read_lines_into_dict(
         "./info/scraper/urlOperatorReplacements.txt")
 
@@ -42,10 +177,20 @@ def scrape_for_operator(operator):
         + url_replacement_names[operator]
     )
 
-    return scrape_website(operator_url)
+    return operator_url
+
+
+def scrape_for_operator(operator):
+    """Sends a GET request for a certain operator and returns the
+    Response object if status code is 200.
+
+    Returns None (as per scrape_website() implementation) if server
+    responds with a different code.
+    """
+    return scrape_website(get_operator_url(operator))
 
 
-def scrape_json(json_url):
+def scrape_json(json_url, refresh=False, stream=False):
     """Sends a GET request to a JSON url for a certain operator and
     returns the Response object if status code is 200.
 
@@ -53,7 +198,43 @@ def scrape_json(json_url):
     responds with a different code.
     """
 
-    return scrape_website(json_url)
+    return scrape_website(json_url, refresh, stream)
+
+
+async def scrape_website_async(url: str) -> Optional[requests.Response]:
+    """The asyncio version of scrape_website(), which lets the event
+    loop do other things (like send other requests) while waiting on
+    the response.
+
+    The request itself is still made with scrape_website() (on the
+    event loop's default thread pool), so it goes through the same
+    cache and shared session.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, scrape_website, url)
+
+
+async def scrape_json_async(json_url: str) -> Optional[requests.Response]:
+    """The asyncio version of scrape_json()."""
+    return await scrape_website_async(json_url)
+
+
+def scrape_all_websites(
+        urls: Sequence[str]
+) -> List[Optional[requests.Response]]:
+    """Sends a GET request to every url at the same time and returns
+    the Response objects (or None, as per scrape_website()) in the
+    same order as the urls.
+
+    This way, fetching several pages only takes as long as the
+    slowest one, instead of all of them added together.
+    """
+    async def scrape_all():
+        return await asyncio.gather(
+            *[scrape_website_async(url) for url in urls]
+        )
+
+    return asyncio.run(scrape_all())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,243 @@
+"""A module that describes which parts of each JSON table are actually
+read by this program, so that everything else can be thrown away before
+the tables are saved as snapshots."""
+
+import sys
+from typing import Any, Optional, Dict, Iterable, Iterator, Tuple, Union
+
+from inputfuncs.json_stream import iter_json_members, open_json_members
+
+
+# Bump this whenever a shape below changes, so that snapshots saved
+# with the old shape get rebuilt.
+TRIMMED_TABLE_VERSION = 1
+
+# Each shape mirrors the JSON it trims. Only the keys in a shape are
+# kept, None means "keep everything under this key", "*" stands for
+# every key of an object, and lists are trimmed item by item.
+CHARACTER_SHAPE = {
+    "*": {
+        "name": None,
+        "description": None,
+        "rarity": None,
+        "profession": None,
+        "itemUsage": None,
+        "itemDesc": None,
+        "tagList": None,
+        "phases": {
+            "attributesKeyFrames": {
+                "data": {
+                    "atk": None,
+                    "def": None,
+                    "maxHp": None,
+                    "magicResistance": None,
+                    "blockCnt": None,
+                    "cost": None,
+                    "baseAttackTime": None,
+                    "respawnTime": None,
+                }
+            }
+        },
+        "talents": {
+            "candidates": {
+                "name": None,
+                "unlockCondition": None,
+                "requiredPotentialRank": None,
+                "description": None,
+            }
+        },
+        "skills": {
+            "skillId": None,
+        },
+    }
+}
+
+SKILL_SHAPE = {
+    "*": {
+        "levels": {
+            "name": None,
+            "spData": {
+                "spCost": None,
+                "initSp": None,
+            },
+            "duration": None,
+            "description": None,
+            "blackboard": None,
+        }
+    }
+}
+
+BUILDING_SHAPE = {
+    "chars": {
+        "*": {
+            "buffChar": {
+                "buffData": {
+                    "buffId": None,
+                    "cond": None,
+                }
+            }
+        }
+    },
+    "buffs": {
+        "*": {
+            "buffName": None,
+            "roomType": None,
+        }
+    },
+}
+
+# The recruitment JSON is a list, so this is the shape of each item
+RECRUIT_SHAPE = {
+    "name_en": None,
+    "level": None,
+    "type": None,
+    "tags": None,
+    "hidden": None,
+    "globalHidden": None,
+}
+
+RIIC_SHAPE = {
+    "*": {
+        "name": None,
+        "desc": None,
+    }
+}
+
+# The shape of every table that can be trimmed
+TABLE_SHAPES = {
+    "character": CHARACTER_SHAPE,
+    "skill": SKILL_SHAPE,
+    "building": BUILDING_SHAPE,
+    "riic": RIIC_SHAPE,
+    "recruit": RECRUIT_SHAPE,
+}
+
+# List tables whose items are looked up by name, and the field each
+# item is named by. These are turned into a dict keyed by that name
+# (title-cased, eg. `Greythroat`), so finding an item doesn't need a
+# search through the whole list. The first item with a name wins.
+TABLE_INDEX_FIELDS = {
+    "stats": "title",
+}
+
+
+def trim_json(value: Any, shape: Optional[Dict]) -> Any:
+    """Trims a decoded JSON value down to the specified shape and
+    returns the trimmed copy.
+
+    Anything that isn't an object or a list (including null) is kept
+    as-is, so the trimmed JSON can be read by the exact same code as
+    the original one.
+    """
+    if shape is None:
+        return value
+
+    if isinstance(value, list):
+        return [trim_json(item, shape) for item in value]
+
+    if isinstance(value, dict):
+        if "*" in shape.keys():
+            return {
+                key: trim_json(item, shape["*"])
+                for key, item in value.items()
+            }
+
+        return {
+            key: trim_json(value[key], shape[key])
+            for key in shape.keys()
+            if key in value.keys()
+        }
+
+    return value
+
+
+def index_items(name: str, items: Iterable[Any]) -> Dict[str, Any]:
+    """Returns the items of a list table as a dict keyed by their
+    title-cased name (see TABLE_INDEX_FIELDS).
+
+    Items without a name are left out.
+    """
+    field = TABLE_INDEX_FIELDS[name]
+
+    index = {}
+    for item in items:
+        if isinstance(item, dict) and isinstance(item.get(field), str):
+            index.setdefault(item[field].title(), item)
+
+    return index
+
+
+def trim_table(name: str, table: Any) -> Any:
+    """Trims a table down to only the parts this program reads, and
+    returns it. Tables without a shape are returned untouched, and
+    tables in TABLE_INDEX_FIELDS are keyed by name."""
+    if name in TABLE_SHAPES.keys():
+        table = trim_json(table, TABLE_SHAPES[name])
+
+    if name in TABLE_INDEX_FIELDS.keys() and isinstance(table, list):
+        return index_items(name, table)
+
+    return table
+
+
+def _trim_members(
+        name: str,
+        members: Iterable[Tuple[Union[str, int], Any]]
+) -> Iterator[Tuple[Union[str, int], Any]]:
+    """Trims the top level members of a table as they're read (see
+    iter_trimmed_members())."""
+    shape = TABLE_SHAPES.get(name)
+
+    for key, value in members:
+        if shape is None:
+            yield key, value
+        elif isinstance(key, int):
+            # Lists are trimmed item by item
+            yield key, trim_json(value, shape)
+        elif "*" in shape.keys():
+            yield key, trim_json(value, shape["*"])
+        elif key in shape.keys():
+            yield key, trim_json(value, shape[key])
+
+
+def iter_trimmed_members(
+        name: str,
+        chunks: Iterable[Union[bytes, str]]
+) -> Iterator[Tuple[Union[str, int], Any]]:
+    """Reads a table's JSON from a stream of chunks and yields each of
+    its top level members (as key/value pairs, or index/item pairs
+    if the JSON is a list), already trimmed.
+
+    Only one member is decoded at a time, and members that aren't
+    part of the table's shape are dropped as soon as they're read.
+    """
+    return _trim_members(name, iter_json_members(chunks))
+
+
+def trim_table_stream(
+        name: str,
+        chunks: Iterable[Union[bytes, str]]
+) -> Any:
+    """Reads a table's JSON from a stream of chunks and returns it,
+    already trimmed (see trim_table()).
+
+    Unlike decoding the whole JSON and trimming it afterwards, the
+    untrimmed table never has to be held in memory all at once.
+    """
+    is_list, members = open_json_members(chunks)
+    members = _trim_members(name, members)
+
+    # Lists have their items numbered instead of named
+    if is_list:
+        if name in TABLE_INDEX_FIELDS.keys():
+            return index_items(name, (value for _, value in members))
+
+        return [value for _, value in members]
+
+    return dict(members)
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
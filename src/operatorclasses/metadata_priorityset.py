@@ -7,6 +7,7 @@ from typing import AbstractSet, Optional, Dict
 
 from operatorclasses.tagged_operator import TaggedOperator
 from operatorclasses.priorityset import PrioritySet
+from operatorclasses.rarity_stats import RarityStats
 
 
 class MetadataPrioritySet(PrioritySet):
@@ -28,12 +29,20 @@ class MetadataPrioritySet(PrioritySet):
 
     get_data(key)
 
+    get_all_data()
+
     """
 
+    # Most priority sets only ever get one piece of metadata (or none),
+    # so the metadata dict is only made once something is added
+    __slots__ = ("_metadata",)
+
     def __init__(
             self,
             intrinsic_set: AbstractSet[TaggedOperator],
-            priority_dict: Dict[str, int]
+            priority_dict: Dict[str, int],
+            priority: Optional[int] = None,
+            stats: Optional[RarityStats] = None
     ) -> None:
         """Initializes a MetadataPrioritySet
 
@@ -46,15 +55,25 @@ class MetadataPrioritySet(PrioritySet):
         
         priority_dict -- dict, a dict with the values of
         attributes in the set
+
+        priority -- int, the priority of this set if it's already
+        known, so it doesn't have to be calculated again (default:
+        None, meaning it will be calculated)
+
+        stats -- RarityStats, the rarity stats of the set if they're
+        already known (default: None, meaning they will be counted)
         """
-        super().__init__(intrinsic_set, priority_dict)
-        self._metadata = {}
+        super().__init__(intrinsic_set, priority_dict, priority, stats)
+        self._metadata = None
 
     def add_data(self, key: str, data: str) -> None:
         """Adds a certain key/data pairing to the metadata dict.
 
         If the key is already in the metadata, nothing happens.
         """
+        if self._metadata is None:
+            self._metadata = {}
+
         if key not in self._metadata.keys():
             self._metadata[key] = data
 
@@ -64,11 +83,11 @@ class MetadataPrioritySet(PrioritySet):
         If you are looking to see if a key exists in the metadata,
         use has_data(key).
         """
-        return self._metadata == {}
+        return not self._metadata
 
     def has_data(self, key: str) -> bool:
         """Checks to see if a certain key exists in the metadata."""
-        return key in self._metadata.keys()
+        return self._metadata is not None and key in self._metadata.keys()
 
     def get_data(self, key: str) -> Optional[str]:
         """Retrieves data from the metadata dict using a key."""
@@ -79,6 +98,9 @@ class MetadataPrioritySet(PrioritySet):
 
     def get_all_data(self) -> Dict[str, str]:
         """Retrieves the metadata dict and returns it."""
+        if self._metadata is None:
+            self._metadata = {}
+
         return self._metadata
 
 
@@ -0,0 +1,175 @@
+"""A module that contains the OperatorTagIndex class, which matches
+recruitment tags to the operators that have them using bitmasks, so
+that finding the operators with a combination of tags only takes a
+few integer operations."""
+
+import sys
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from operatorclasses.tagged_operator import TaggedOperator, intern_tag
+
+
+class OperatorTagIndex:
+    """A class that indexes a list of TaggedOperators by their tags.
+
+    Every operator gets one bit, and every tag gets one integer (a
+    mask) with the bits of all the operators that have that tag set.
+    Finding the operators that have every tag of a combination is then
+    just AND-ing the masks of those tags together, and the operators
+    themselves only have to be looked up for masks that aren't empty.
+
+    Operators are given their bits from highest rarity to lowest, so
+    decoding a mask always gives operators sorted by rarity
+    (highest first).
+
+    Public variables:
+
+    operators
+
+    all_mask
+
+    non_top_mask
+
+    rarity_masks
+
+    Public methods:
+
+    has_tag(tag)
+
+    get_tag_mask(tag)
+
+    get_tag_masks()
+
+    match(combo, allow_top)
+
+    decode(mask)
+
+    """
+
+    __slots__ = ("_operators", "_tag_masks", "_non_top_mask",
+                 "_rarity_masks")
+
+    def __init__(
+            self,
+            operator_list: Sequence[TaggedOperator],
+            tags: Iterable[str],
+            is_not_top_op: Callable[[TaggedOperator], bool]
+    ) -> None:
+        """Initializes an OperatorTagIndex.
+
+        Keyword arguments:
+
+        operator_list -- list, the TaggedOperators to index
+
+        tags -- list, every tag that can be searched for (tags of an
+        operator that aren't in here are ignored)
+
+        is_not_top_op -- function, returns True for operators that
+        can show up without the top operator tag
+        """
+        # sorted() is stable, so operators with the same rarity keep
+        # the order they came in
+        self._operators = sorted(
+            operator_list,
+            key=lambda o: o.rarity,
+            reverse=True
+        )
+        self._tag_masks = {tag: 0 for tag in tags}
+        self._non_top_mask = 0
+        self._rarity_masks = {}
+
+        # Operators keep their tags as IDs (see intern_tag()), so the
+        # masks are built by ID and only named at the end
+        id_masks = {intern_tag(tag): 0 for tag in self._tag_masks}
+
+        for bit, operator in enumerate(self._operators):
+            operator_bit = 1 << bit
+
+            self._rarity_masks[operator.rarity] = (
+                self._rarity_masks.get(operator.rarity, 0) | operator_bit
+            )
+
+            if is_not_top_op(operator):
+                self._non_top_mask |= operator_bit
+
+            for tag_id in operator.tag_ids:
+                if tag_id in id_masks.keys():
+                    id_masks[tag_id] |= operator_bit
+
+        self._tag_masks = {
+            tag: id_masks[intern_tag(tag)]
+            for tag in self._tag_masks
+        }
+
+    @property
+    def operators(self) -> List[TaggedOperator]:
+        """Retrieves every indexed operator, in the order of their
+        bits."""
+        return self._operators
+
+    @property
+    def all_mask(self) -> int:
+        """Retrieves a mask with every operator in it."""
+        return (1 << len(self._operators)) - 1
+
+    @property
+    def non_top_mask(self) -> int:
+        """Retrieves a mask with every operator that can be recruited
+        without the top operator tag."""
+        return self._non_top_mask
+
+    @property
+    def rarity_masks(self) -> Dict[int, int]:
+        """Retrieves a dict matching each rarity to the mask of every
+        operator with that rarity."""
+        return self._rarity_masks
+
+    def has_tag(self, tag: str) -> bool:
+        """Checks whether a tag can be searched for in this index."""
+        return tag in self._tag_masks.keys()
+
+    def get_tag_mask(self, tag: str) -> int:
+        """Retrieves the mask of every operator that has a tag."""
+        return self._tag_masks[tag]
+
+    def get_tag_masks(self) -> Dict[str, int]:
+        """Retrieves the masks of every tag, as a dict."""
+        return self._tag_masks
+
+    def match(self, combo: Sequence[str], allow_top: bool) -> int:
+        """Returns the mask of every operator that has all the tags in
+        a combination.
+
+        Keyword arguments:
+
+        combo -- list, a combination of tags
+
+        allow_top -- bool, whether top (6 star) operators should be
+        included in the result
+        """
+        mask = self.all_mask if allow_top else self._non_top_mask
+
+        for tag in combo:
+            mask &= self._tag_masks[tag]
+            if mask == 0:
+                break
+
+        return mask
+
+    def decode(self, mask: int) -> List[TaggedOperator]:
+        """Returns the operators in a mask, sorted by rarity
+        (highest first)."""
+        operators = []
+
+        while mask:
+            lowest_bit = mask & -mask
+            operators.append(self._operators[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+
+        return operators
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
@@ -4,9 +4,10 @@ but also an intrinsic 'priority' that can be compared with other
 priority sets)."""
 
 import sys
-from typing import AbstractSet, Dict
+from typing import AbstractSet, Dict, List, Optional, Tuple
 
 from operatorclasses.tagged_operator import TaggedOperator
+from operatorclasses.rarity_stats import RarityStats
 
 
 class PrioritySet:
@@ -23,6 +24,12 @@ class PrioritySet:
 
     priority
 
+    stats
+
+    min_rarity
+
+    max_rarity
+
     Public methods:
 
     get_priority()
@@ -30,23 +37,47 @@ class PrioritySet:
     get_intrinsic_set_copy()
     """
 
+    # A priority set is made for every combination of tags, so they
+    # don't get an instance dict
+    __slots__ = ("_intrinsic_set", "_stats", "_priority")
+
     def __init__(
             self,
             intrinsic_set: AbstractSet[TaggedOperator],
-            priority_dict: Dict[str, int]
+            priority_dict: Dict[str, int],
+            priority: Optional[int] = None,
+            stats: Optional[RarityStats] = None
     ):
         """Initializes a PrioritySet.
 
         Keyword arguments:
 
-        intrinsic_set -- set, the intrinsic set to be stored
+        intrinsic_set -- set, the intrinsic set to be stored (it's
+        kept as a tuple, so any ordering it has is kept too)
 
         priority_dict -- dict, a dict with the values of
         attributes in the set
+
+        priority -- int, the priority of this set if it's already
+        known, so it doesn't have to be calculated again (default:
+        None, meaning it will be calculated)
+
+        stats -- RarityStats, the rarity stats of the set if they're
+        already known (eg. from the combo table) (default: None,
+        meaning they will be counted from the set)
         """
 
-        self._intrinsic_set = intrinsic_set
-        self._priority = self._calc_priority(priority_dict)
+        self._intrinsic_set = tuple(intrinsic_set)
+        self._stats = (
+            RarityStats.from_operators(self._intrinsic_set, priority_dict)
+            if stats is None
+            else stats
+        )
+        self._priority = (
+            self._stats.priority
+            if priority is None
+            else priority
+        )
 
     def __repr__(self) -> str:
         """Returns a formatted representation of this priority set."""
@@ -56,12 +87,11 @@ class PrioritySet:
         )
 
     @property
-    def intrinsic_set(self) -> AbstractSet[TaggedOperator]:
-        """Retrieves this PrioritySet's intrinsic set.
+    def intrinsic_set(self) -> Tuple[TaggedOperator, ...]:
+        """Retrieves this PrioritySet's intrinsic set, as a tuple.
 
-        This will not copy the set, meaning the original
-        set could be edited. If you need a copied set, use
-        get_intrinsic_set_copy() instead.
+        This will not copy the set. If you need a copy of the set that
+        can be edited, use get_intrinsic_set_copy() instead.
         """
         return self._intrinsic_set
 
@@ -70,6 +100,23 @@ class PrioritySet:
         """Retrieves this priority."""
         return self._priority
 
+    @property
+    def stats(self) -> RarityStats:
+        """Retrieves the rarity stats of this set (see RarityStats)."""
+        return self._stats
+
+    @property
+    def min_rarity(self) -> int:
+        """Retrieves the lowest rarity in this set (0 if it's
+        empty)."""
+        return self._stats.min_rarity
+
+    @property
+    def max_rarity(self) -> int:
+        """Retrieves the highest rarity in this set (0 if it's
+        empty)."""
+        return self._stats.max_rarity
+
     def __eq__(self, other: object) -> bool:
         """Determines whether this priority set is the same as another object."""
         return (
@@ -77,36 +124,14 @@ class PrioritySet:
             and self.intrinsic_set == other.intrinsic_set
         )
 
-    def _calc_priority(self, priority_dict: Dict[str, int]) -> int:
-        """Calculate this set's priority based on a dict that is passed in.
-
-        Each attribute of the set will be checked against the dict and
-        a priority score will be assigned. Then, the current score
-        will be decreased based on how long the set is
-        (implemented -= len(self._intrinsic_set) * 3)
-
-        Keyword arguments:
-
-        priority_dict -- dict, a dictionary with key/value pairs that
-        contains values (value) for the attributes of the set (key)
-        """
-        cur_val = 0
-        for val in self.intrinsic_set:
-            cur_val += priority_dict[str(val.rarity)]
-
-        # TODO: Maybe i could move this out of here later
-        # that way this class becomes more generalized
-        cur_val -= len(self.intrinsic_set) * 3
-
-        return cur_val
-
-    def get_intrinsic_set_copy(self) -> AbstractSet[TaggedOperator]:
-        """Retrieves a copy of this PrioritySet's intrinsic set.
+    def get_intrinsic_set_copy(self) -> List[TaggedOperator]:
+        """Retrieves a copy of this PrioritySet's intrinsic set, as a
+        list.
 
         This is in case you need to edit the set, but need to preserve
         the original set.
         """
-        return self.intrinsic_set.copy()
+        return list(self._intrinsic_set)
 
 
 if __name__ == "__main__":
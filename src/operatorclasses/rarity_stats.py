@@ -0,0 +1,199 @@
+"""A module that contains the RarityStats class, which sums up the
+rarities of a group of operators (how many there are of each rarity,
+the lowest and highest rarity, and the priority of the group), so that
+none of it has to be worked out from the operators again."""
+
+import sys
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from operatorclasses.tagged_operator import TaggedOperator
+
+
+# Operator rarities go from 1 to this
+MAX_RARITY = 6
+
+
+class RarityStats:
+    """A class holding the aggregate rarity stats of a group of
+    operators.
+
+    Stats can be made straight from the operators, or from a mask of
+    an OperatorTagIndex. When a group is made by adding a tag to a
+    smaller group (eg. 'Guard + Melee' from 'Guard'), the smaller
+    group's stats can be passed in, and only the rarities that group
+    has are counted.
+
+    Public variables:
+
+    counts
+
+    count
+
+    min_rarity
+
+    max_rarity
+
+    priority
+
+    Public methods:
+
+    from_operators(operators, priority_dict)
+
+    from_mask(mask, rarity_masks, priority_dict, parent)
+
+    """
+
+    __slots__ = ("_counts", "_count", "_min_rarity", "_max_rarity",
+                 "_priority")
+
+    def __init__(
+            self,
+            counts: Tuple[int, ...],
+            priority_dict: Dict[str, int]
+    ) -> None:
+        """Initializes a RarityStats.
+
+        Keyword arguments:
+
+        counts -- tuple, how many operators there are of each rarity
+        (the index is the rarity, so index 0 is always 0)
+
+        priority_dict -- dict, a dict with the value of each rarity
+        (see PrioritySet)
+        """
+        self._counts = counts
+        self._count = sum(counts)
+
+        present_rarities = [
+            rarity
+            for rarity in range(1, MAX_RARITY + 1)
+            if counts[rarity] > 0
+        ]
+        self._min_rarity = present_rarities[0] if present_rarities else 0
+        self._max_rarity = present_rarities[-1] if present_rarities else 0
+
+        # Every operator is worth the value of its rarity, minus 3 so
+        # that bigger groups are worth less (counted per rarity instead
+        # of per operator)
+        self._priority = sum(
+            priority_dict[str(rarity)] * counts[rarity]
+            for rarity in present_rarities
+        ) - self._count * 3
+
+    def __repr__(self) -> str:
+        """Returns a representation of these stats in string format."""
+        return (
+            f"RarityStats(counts={self._counts}, "
+            + f"priority={self._priority})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Determines if these stats are the same as another
+        object's."""
+        return (
+            self.__class__ == other.__class__
+            and self._counts == other.counts
+            and self._priority == other.priority
+        )
+
+    def __getstate__(self) -> Tuple[Tuple[int, ...], int, int, int, int]:
+        """Returns what's needed to pickle these stats."""
+        return (
+            self._counts,
+            self._count,
+            self._min_rarity,
+            self._max_rarity,
+            self._priority
+        )
+
+    def __setstate__(
+            self,
+            state: Tuple[Tuple[int, ...], int, int, int, int]
+    ) -> None:
+        """Restores these stats from a pickled state."""
+        (
+            self._counts,
+            self._count,
+            self._min_rarity,
+            self._max_rarity,
+            self._priority
+        ) = state
+
+    @classmethod
+    def from_operators(
+            cls,
+            operators: Iterable[TaggedOperator],
+            priority_dict: Dict[str, int]
+    ) -> "RarityStats":
+        """Counts the rarities of some operators and returns their
+        stats."""
+        counts = [0] * (MAX_RARITY + 1)
+        for operator in operators:
+            counts[operator.rarity] += 1
+
+        return cls(tuple(counts), priority_dict)
+
+    @classmethod
+    def from_mask(
+            cls,
+            mask: int,
+            rarity_masks: Mapping[int, int],
+            priority_dict: Dict[str, int],
+            parent: Optional["RarityStats"] = None
+    ) -> "RarityStats":
+        """Counts the rarities of the operators in a mask of an
+        OperatorTagIndex and returns their stats.
+
+        Keyword arguments:
+
+        mask -- int, the mask of the operators
+
+        rarity_masks -- dict, the mask of every operator of each rarity
+        (see OperatorTagIndex.rarity_masks)
+
+        priority_dict -- dict, a dict with the value of each rarity
+
+        parent -- RarityStats, the stats of a group that every operator
+        in the mask is also in, if there is one (rarities that group
+        doesn't have are skipped) (default: None)
+        """
+        counts = [0] * (MAX_RARITY + 1)
+        for rarity, rarity_mask in rarity_masks.items():
+            if parent is not None and parent.counts[rarity] == 0:
+                continue
+
+            counts[rarity] = bin(mask & rarity_mask).count("1")
+
+        return cls(tuple(counts), priority_dict)
+
+    @property
+    def counts(self) -> Tuple[int, ...]:
+        """Retrieves how many operators there are of each rarity (the
+        index is the rarity)."""
+        return self._counts
+
+    @property
+    def count(self) -> int:
+        """Retrieves how many operators there are in total."""
+        return self._count
+
+    @property
+    def min_rarity(self) -> int:
+        """Retrieves the lowest rarity in the group (0 if empty)."""
+        return self._min_rarity
+
+    @property
+    def max_rarity(self) -> int:
+        """Retrieves the highest rarity in the group (0 if empty)."""
+        return self._max_rarity
+
+    @property
+    def priority(self) -> int:
+        """Retrieves the priority of the group (see PrioritySet)."""
+        return self._priority
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
@@ -4,7 +4,34 @@ and rarity, so that the information can be easily-accessable in
 one place."""
 
 import sys
-from typing import Sequence
+import threading
+from typing import Any, Sequence, Tuple
+
+
+# Every tag seen so far is given a small number (its ID), so that each
+# operator only has to store numbers instead of its own tag strings.
+_tag_ids = {}
+_tag_names = []
+_tag_lock = threading.Lock()
+
+
+def intern_tag(tag: str) -> int:
+    """Returns the ID of a tag, giving it a new one if it hasn't been
+    seen before."""
+    tag_id = _tag_ids.get(tag)
+    if tag_id is None:
+        with _tag_lock:
+            if tag not in _tag_ids:
+                _tag_names.append(sys.intern(tag))
+                _tag_ids[tag] = len(_tag_names) - 1
+            tag_id = _tag_ids[tag]
+
+    return tag_id
+
+
+def get_tag_name(tag_id: int) -> str:
+    """Returns the tag that has a certain ID."""
+    return _tag_names[tag_id]
 
 
 class TaggedOperator:
@@ -16,12 +43,18 @@ class TaggedOperator:
     bundles them up together so that all these attributes are
     easily-accessable and reusable.
 
+    Since a lot of these are created, they don't have an instance
+    dict (see __slots__), their tags are stored as IDs (see
+    intern_tag()), and their hash is only calculated once.
+
     Public variables:
 
     name
 
     tags
 
+    tag_ids
+
     rarity
 
     Public methods:
@@ -30,6 +63,8 @@ class TaggedOperator:
 
     """
 
+    __slots__ = ("_name", "_tag_ids", "_rarity", "_hash")
+
     def __init__(
             self,
             name: str,
@@ -48,8 +83,23 @@ class TaggedOperator:
         associated with this operator
         """
         self._name = name
-        self._tags = tags
+        self._tag_ids = tuple(intern_tag(tag) for tag in tags)
         self._rarity = rarity
+        self._hash = hash(name)
+
+    def __getstate__(self) -> Tuple[str, int, Tuple[str, ...]]:
+        """Returns what's needed to pickle this object.
+
+        Tag IDs (and hashes) are different in every process, so the
+        tags themselves are pickled instead.
+        """
+        return (self._name, self._rarity, self.tags)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        """Restores this object from a pickled state (see
+        __getstate__())."""
+        name, rarity, tags = state
+        self.__init__(name, rarity, tags)
 
     def __repr__(self) -> str:
         """Returns a representation of this object in string format."""
@@ -63,19 +113,20 @@ class TaggedOperator:
         TaggedOperator objects the same name if they are not meant to
         be the same thing.
         """
-        return hash(self._name)
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         """Determines if this is equal to something else."""
         return (
             self.__class__ == other.__class__
-            and self.name == other.name
+            and self._hash == other._hash
+            and self._name == other._name
             # and self._tags == other.get_tags() # not necessary for now
         )
 
     def get_tags_length(self) -> int:
         """Retrieves how many tags are stored in this object."""
-        return len(self._tags)
+        return len(self._tag_ids)
 
     @property
     def name(self) -> str:
@@ -83,10 +134,16 @@ class TaggedOperator:
         return self._name
 
     @property
-    def tags(self) -> Sequence[str]:
+    def tags(self) -> Tuple[str, ...]:
         """Retrieves all the tags of this operator, as
-        a list of strings."""
-        return self._tags
+        a tuple of strings."""
+        return tuple(_tag_names[tag_id] for tag_id in self._tag_ids)
+
+    @property
+    def tag_ids(self) -> Tuple[int, ...]:
+        """Retrieves the IDs of all the tags of this operator (see
+        intern_tag())."""
+        return self._tag_ids
 
     @property
     def rarity(self) -> int:
@@ -0,0 +1,74 @@
+"""This module finds the best combinations of a set of tags in order of
+priority (best first), so that callers that only want the top few
+combinations (or only the ones above some rarity) don't have to build,
+sort and format every combination to get them."""
+
+import sys
+import heapq
+import itertools
+from typing import Dict, Iterator, Sequence, Tuple
+
+from operatorclasses.rarity_stats import RarityStats
+
+from recruitfuncs.combo_table import MAX_COMBO_LENGTH, get_combo_key
+
+
+def iter_best_combos(
+        proper_tags: Sequence[str],
+        combo_table: Dict[Tuple[str, ...], Tuple[int, RarityStats]],
+        min_rarity: int = 0
+) -> Iterator[Tuple[Tuple[str, ...], int, RarityStats]]:
+    """Yields every 1-3 tag combination of the specified tags that
+    matches anyone, as the combo, the mask of its operators and its
+    rarity stats, from the highest priority to the lowest.
+
+    The combinations are the same ones get_all_combinations() in
+    recruitop makes, and combos with the same priority come out in the
+    reverse of the order it makes them in, so that reading everything
+    this yields backwards is the same as sorting all of them.
+
+    The combo table already knows the exact priority of every combo,
+    so only those numbers go into the heap. Nothing else about a combo
+    (like its operators) is looked at until it's taken off the heap,
+    so stopping early skips everything that didn't make the cut.
+
+    Keyword arguments:
+
+    proper_tags -- list, the (translated) tags of the screen
+
+    combo_table -- dict, the result of every combination of tags in
+    the pool (see recruitfuncs/combo_table.py)
+
+    min_rarity -- int, combos that could give an operator below this
+    rarity are skipped (default: 0, meaning none are)
+    """
+    heap = []
+
+    # Combos are made from tag positions, since a tag can be given
+    # more than once (just like get_all_combinations() does)
+    all_positions = itertools.chain.from_iterable(
+        itertools.combinations(range(len(proper_tags)), length)
+        for length in range(1, MAX_COMBO_LENGTH + 1)
+    )
+    for rank, positions in enumerate(all_positions):
+        combo = tuple(proper_tags[position] for position in positions)
+        combo_result = combo_table.get(get_combo_key(combo))
+        if combo_result is None or combo_result[1].min_rarity < min_rarity:
+            continue
+
+        # Ranks are all different, so the combo itself is never
+        # compared
+        heap.append((-combo_result[1].priority, -rank, combo))
+
+    heapq.heapify(heap)
+    while heap:
+        combo = heapq.heappop(heap)[2]
+        mask, stats = combo_table[get_combo_key(combo)]
+
+        yield combo, mask, stats
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
@@ -0,0 +1,158 @@
+"""This module builds (and saves) a table with the result of every
+1-3 tag combination in the recruitment pool, so that looking up a
+combination of tags is just a dictionary lookup."""
+
+import sys
+import hashlib
+import itertools
+from typing import Dict, Iterable, Tuple
+
+from operatorclasses.operator_tag_index import OperatorTagIndex
+from operatorclasses.rarity_stats import RarityStats
+
+from inputfuncs.artifact_store import load_artifact, save_artifact
+
+
+# Bump this whenever the layout of the table changes, so that tables
+# saved with the old layout get rebuilt.
+COMBO_TABLE_VERSION = 2
+
+# Since ops only have 3 tags, no combination is ever longer than this
+MAX_COMBO_LENGTH = 3
+
+
+def get_combo_key(combo: Iterable[str]) -> Tuple[str, ...]:
+    """Returns the key a combination of tags is stored under in a
+    combo table.
+
+    The key is the same no matter what order the tags are in, and
+    repeated tags are only counted once.
+    """
+    return tuple(sorted(set(combo)))
+
+
+def get_pool_digest(
+        tag_index: OperatorTagIndex,
+        top_tag: str,
+        priority_values: Dict[str, int]
+) -> str:
+    """Returns a hash of everything a combo table depends on (every
+    operator in the pool, every tag, and how combinations are scored),
+    which changes whenever the recruitment pool does."""
+    hasher = hashlib.sha256()
+
+    for operator in tag_index.operators:
+        hasher.update(
+            f"{operator.name}\t{operator.rarity}\t".encode("utf8")
+            + "\t".join(operator.tags).encode("utf8")
+            + b"\n"
+        )
+
+    hasher.update("\t".join(tag_index.get_tag_masks().keys()).encode("utf8"))
+    hasher.update(f"\n{top_tag}\n{sorted(priority_values.items())}".encode(
+        "utf8"
+    ))
+
+    return hasher.hexdigest()
+
+
+def build_combo_table(
+        tag_index: OperatorTagIndex,
+        top_tag: str,
+        priority_values: Dict[str, int]
+) -> Dict[Tuple[str, ...], Tuple[int, RarityStats]]:
+    """Finds the operators for every 1-3 tag combination and returns
+    a dict matching each combo key (see get_combo_key()) to the mask of
+    the matching operators and the rarity stats (including the
+    priority) of that combination.
+
+    Combinations that don't match any operator are left out.
+
+    Keyword arguments:
+
+    tag_index -- OperatorTagIndex, an index matching tags with
+    operators
+
+    top_tag -- string, the top operator tag (6 star operators only show
+    up in combinations that have this tag)
+
+    priority_values -- dict, how much each rarity is worth (see
+    PrioritySet)
+    """
+    combo_table = {}
+    all_tags = sorted(tag_index.get_tag_masks().keys())
+    rarity_masks = tag_index.rarity_masks
+
+    # Every combo is its parent (the combo without its last tag) plus
+    # one more tag, so its mask and stats come from its parent's.
+    # Parents are kept before the top operator rule is applied, since a
+    # parent without the top tag can still have a child with it. If a
+    # parent matches nobody, neither do any of its children.
+    parents = {(): (tag_index.all_mask, None)}
+
+    for amount_of_tags in range(1, MAX_COMBO_LENGTH + 1):
+        for combo in itertools.combinations(all_tags, amount_of_tags):
+            parent = parents.get(combo[:-1])
+            if parent is None:
+                continue
+
+            parent_mask, parent_stats = parent
+            mask = parent_mask & tag_index.get_tag_mask(combo[-1])
+            if mask == 0:
+                continue
+
+            stats = RarityStats.from_mask(
+                mask,
+                rarity_masks,
+                priority_values,
+                parent_stats
+            )
+            if amount_of_tags < MAX_COMBO_LENGTH:
+                parents[combo] = (mask, stats)
+
+            if top_tag not in combo:
+                top_mask = mask
+                mask &= tag_index.non_top_mask
+                if mask == 0:
+                    continue
+                if mask != top_mask:
+                    stats = RarityStats.from_mask(
+                        mask,
+                        rarity_masks,
+                        priority_values,
+                        stats
+                    )
+
+            combo_table[combo] = (mask, stats)
+
+    return combo_table
+
+
+def get_combo_table(
+        tag_index: OperatorTagIndex,
+        top_tag: str,
+        priority_values: Dict[str, int]
+) -> Dict[Tuple[str, ...], Tuple[int, RarityStats]]:
+    """Returns the combo table for a recruitment pool (see
+    build_combo_table()).
+
+    The table is saved after it's built, and loaded from then on until
+    the recruitment pool changes.
+    """
+    key = (
+        f"{get_pool_digest(tag_index, top_tag, priority_values)}"
+        + f"-v{COMBO_TABLE_VERSION}"
+    )
+
+    combo_table = load_artifact("recruit_combos", key)
+    if combo_table is None:
+        combo_table = build_combo_table(tag_index, top_tag, priority_values)
+        save_artifact("recruit_combos", key, combo_table)
+
+    return combo_table
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
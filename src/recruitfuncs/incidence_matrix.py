@@ -0,0 +1,180 @@
+"""This module holds the optional NumPy backend for recruitment, which
+stores the recruitment pool as an operator x tag matrix so that every
+combination of tags can be evaluated at once instead of one by one.
+
+NumPy isn't required; has_numpy() says whether this backend can be
+used at all."""
+
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from operatorclasses.operator_tag_index import OperatorTagIndex
+
+
+def has_numpy() -> bool:
+    """Checks whether NumPy is installed, and so whether this backend
+    can be used."""
+    return np is not None
+
+
+class IncidenceMatrix:
+    """A class that stores a recruitment pool as a boolean matrix (one
+    row per operator, one column per tag) and a vector of rarities.
+
+    The operators are in the same order as the bits of the
+    OperatorTagIndex the matrix is built from, so results can be
+    turned back into masks of that index.
+
+    Public variables:
+
+    tags
+
+    matrix
+
+    rarities
+
+    Public methods:
+
+    evaluate(combos, top_tag, priority_values)
+
+    to_masks(matches)
+
+    """
+
+    def __init__(self, tag_index: OperatorTagIndex) -> None:
+        """Initializes an IncidenceMatrix.
+
+        Raises an ImportError if NumPy isn't installed.
+
+        Keyword arguments:
+
+        tag_index -- OperatorTagIndex, the index of the pool to
+        turn into a matrix
+        """
+        if np is None:
+            raise ImportError("The NumPy backend needs NumPy installed.")
+
+        self._tags = list(tag_index.get_tag_masks().keys())
+        self._tag_ids = {tag: index for index, tag in enumerate(self._tags)}
+
+        operator_count = len(tag_index.operators)
+        self._matrix = np.zeros(
+            (operator_count, len(self._tags) + 1),
+            dtype=bool
+        )
+        for tag_id, tag in enumerate(self._tags):
+            mask = tag_index.get_tag_mask(tag)
+            self._matrix[:, tag_id] = [
+                (mask >> bit) & 1 for bit in range(operator_count)
+            ]
+
+        # The last column has every operator in it, so that shorter
+        # combinations can be padded with it
+        self._matrix[:, -1] = True
+
+        self._rarities = np.array(
+            [operator.rarity for operator in tag_index.operators],
+            dtype=np.int64
+        )
+
+    @property
+    def tags(self) -> List[str]:
+        """Retrieves every tag, in the order of the matrix's
+        columns."""
+        return self._tags
+
+    @property
+    def matrix(self) -> "np.ndarray":
+        """Retrieves the operator x tag matrix (with an extra last
+        column that every operator is in)."""
+        return self._matrix
+
+    @property
+    def rarities(self) -> "np.ndarray":
+        """Retrieves the rarity of every operator."""
+        return self._rarities
+
+    def evaluate(
+            self,
+            combos: Sequence[Sequence[str]],
+            top_tag: str,
+            priority_values: Dict[str, int]
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Evaluates every combination of tags at once.
+
+        Follows the same rules as the rest of recruitop (6 star
+        operators only show up with the top operator tag, and the
+        priority is worked out like PrioritySet does), so the results
+        are exactly the same as evaluating each combination by itself.
+
+        Returns four arrays, with one entry (or column) per combo: which
+        operators match (an operator x combo matrix), how many operators
+        match, the lowest rarity that matches (0 if nothing does), and
+        the priority.
+
+        Keyword arguments:
+
+        combos -- list, the combinations of tags (up to 3 tags each)
+
+        top_tag -- string, the top operator tag
+
+        priority_values -- dict, how much each rarity is worth (see
+        PrioritySet)
+        """
+        padding_id = len(self._tags)
+        combo_length = max((len(combo) for combo in combos), default=1)
+
+        combo_ids = np.full((len(combos), combo_length), padding_id)
+        for combo_index, combo in enumerate(combos):
+            combo_ids[combo_index, :len(combo)] = [
+                self._tag_ids[tag] for tag in combo
+            ]
+
+        # AND together the columns of every tag in each combo
+        matches = self._matrix[:, combo_ids[:, 0]]
+        for position in range(1, combo_length):
+            matches = matches & self._matrix[:, combo_ids[:, position]]
+
+        # Top operators only count for combos with the top tag
+        has_top_tag = (
+            combo_ids == self._tag_ids.get(top_tag, -1)
+        ).any(axis=1)
+        not_top = self._rarities < 6
+        matches &= has_top_tag[np.newaxis, :] | not_top[:, np.newaxis]
+
+        counts = matches.sum(axis=0)
+        lowest_rarities = np.where(
+            matches,
+            self._rarities[:, np.newaxis],
+            np.iinfo(np.int64).max
+        ).min(axis=0)
+        lowest_rarities[counts == 0] = 0
+
+        operator_values = np.array(
+            [priority_values[str(rarity)] for rarity in self._rarities],
+            dtype=np.int64
+        )
+        priorities = operator_values @ matches - counts * 3
+
+        return matches, counts, lowest_rarities, priorities
+
+    def to_masks(self, matches: "np.ndarray") -> List[int]:
+        """Turns an operator x combo matrix of matches (see evaluate())
+        back into one OperatorTagIndex mask per combo."""
+        packed = np.packbits(matches, axis=0, bitorder="little")
+
+        return [
+            int.from_bytes(packed[:, combo_index].tobytes(), "little")
+            for combo_index in range(matches.shape[1])
+        ]
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
@@ -0,0 +1,215 @@
+"""This module runs a small local server that keeps the recruitment
+pool loaded in memory and answers recruitment queries, so that each
+`recruit` command doesn't have to load everything again.
+
+Queries and answers are JSON objects, one per line, over a TCP
+connection to localhost. The server's port is written to a file (see
+info/network/serverSettings.txt), which is how commands find it."""
+
+import sys
+import os
+import json
+import socket
+import socketserver
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from inputfuncs.input_reader import read_lines_into_dict
+
+
+SERVER_SETTINGS_PATH = "./info/network/serverSettings.txt"
+
+
+def get_server_settings() -> Dict[str, str]:
+    """Reads the server settings file and returns it as a dict."""
+    return read_lines_into_dict(SERVER_SETTINGS_PATH)
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    """Answers every line (query) sent over one connection with one
+    line (answer)."""
+
+    def handle(self) -> None:
+        """Reads queries until the connection is closed."""
+        for line in self.rfile:
+            try:
+                query = json.loads(line)
+                if not isinstance(query, dict):
+                    raise ValueError("A query must be a JSON object.")
+
+                answer = self.server.answer_query(query)
+            except ValueError as e:
+                answer = {"error": str(e)}
+
+            self.wfile.write(json.dumps(answer).encode("utf8") + b"\n")
+            self.wfile.flush()
+
+
+class RecruitmentServer(socketserver.ThreadingTCPServer):
+    """A server holding some state (usually the loaded recruitment
+    pool) and a function that answers queries with it.
+
+    The state is loaded once when the server starts, then loaded again
+    every so often in the background. Queries keep being answered with
+    the old state until the new one is ready.
+
+    Public variables:
+
+    state
+
+    Public methods:
+
+    answer_query(query)
+
+    reload()
+
+    start_reloading(interval)
+
+    stop_reloading()
+
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+            self,
+            address: tuple,
+            load_state: Callable[[Optional[Any]], Optional[Any]],
+            answer: Callable[[Any, Dict[str, Any]], Dict[str, Any]]
+    ) -> None:
+        """Initializes a RecruitmentServer, loading its state.
+
+        Raises a RuntimeError if the state could not be loaded.
+
+        Keyword arguments:
+
+        address -- tuple, the host and port to listen on
+
+        load_state -- function, takes the current state (None the
+        first time) and returns the new one (or None if it can't be
+        loaded right now)
+
+        answer -- function, takes the state and a query (a dict) and
+        returns the answer (a dict that can be turned into JSON), or
+        raises a ValueError if the query is bad
+        """
+        self._load_state = load_state
+        self._answer = answer
+        self._state = load_state(None)
+        if self._state is None:
+            raise RuntimeError("The recruitment pool could not be loaded.")
+
+        self._stop_event = threading.Event()
+        self._reload_thread = None
+
+        super().__init__(address, _QueryHandler)
+
+    @property
+    def state(self) -> Any:
+        """Retrieves the state queries are currently answered with."""
+        return self._state
+
+    def answer_query(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Answers one query with the current state."""
+        return self._answer(self._state, query)
+
+    def reload(self) -> None:
+        """Loads the state again, and starts using it if it could be
+        loaded.
+
+        Swapping the state is a single assignment, so queries being
+        answered while this runs just use the old one.
+        """
+        new_state = self._load_state(self._state)
+        if new_state is not None:
+            self._state = new_state
+
+    def _reload_forever(self, interval: float) -> None:
+        """Reloads the state every interval seconds until
+        stop_reloading() is called."""
+        while not self._stop_event.wait(interval):
+            try:
+                self.reload()
+            except Exception as e:  # keep serving the old state
+                sys.stderr.write(f"Reloading failed: {e}\n")
+
+    def start_reloading(self, interval: float) -> None:
+        """Starts reloading the state in the background every interval
+        seconds."""
+        self._reload_thread = threading.Thread(
+            target=self._reload_forever,
+            args=(interval,),
+            daemon=True
+        )
+        self._reload_thread.start()
+
+    def stop_reloading(self) -> None:
+        """Stops reloading the state in the background."""
+        self._stop_event.set()
+
+
+def write_port_file(port: int) -> str:
+    """Writes the port the server is listening on to the port file,
+    and returns the path of the file."""
+    path = get_server_settings()["port_file"]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        f.write(f"{port} {os.getpid()}\n")
+    os.replace(temp_path, path)
+
+    return path
+
+
+def remove_port_file() -> None:
+    """Removes the port file, if it's this process's."""
+    path = get_server_settings()["port_file"]
+
+    try:
+        with open(path, "r") as f:
+            pid = int(f.read().split()[1])
+        if pid == os.getpid():
+            os.remove(path)
+    except (OSError, ValueError, IndexError):
+        pass
+
+
+def query_server(query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Sends a query to the running server and returns its answer.
+
+    Returns None if no server is running (or it doesn't answer in
+    time), in which case the query should be worked out locally.
+    """
+    settings = get_server_settings()
+
+    try:
+        with open(settings["port_file"], "r") as f:
+            port = int(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    try:
+        with socket.create_connection(
+                (settings["host"], port),
+                timeout=float(settings["timeout"])
+        ) as connection:
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection.sendall(json.dumps(query).encode("utf8") + b"\n")
+
+            with connection.makefile("rb") as server_file:
+                answer = server_file.readline()
+    except OSError:
+        return None
+
+    try:
+        return json.loads(answer)
+    except ValueError:
+        return None
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
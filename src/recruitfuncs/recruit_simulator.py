@@ -0,0 +1,217 @@
+"""This module simulates lots of random recruitment screens to find out
+how often each rarity can be guaranteed, how much each tag is worth,
+and how often the --beneficial filter finds anything."""
+
+import sys
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from recruitfuncs.screen_oracle import SCREEN_SIZE, evaluate_screen
+
+
+# How many screens each task simulates. Every task gets its own random
+# generator (seeded from the main seed and the task's number), so the
+# results only depend on the seed, not on how many processes are used.
+SCREENS_PER_TASK = 10000
+
+# The lowest guaranteed rarity that --beneficial counts as a hit
+BENEFICIAL_RARITY = 4
+
+# Set in every worker process by _initialize_worker(), so that these
+# only have to be sent to each worker once
+_worker_combos = {}
+_worker_tag_weights = []
+
+
+class SimulationResults:
+    """A class that holds the combined results of simulated screens.
+
+    Results from different workers can be added together with +.
+
+    Public variables:
+
+    screen_count
+
+    rarity_counts
+
+    tag_screen_counts
+
+    tag_rarity_totals
+
+    beneficial_hits
+
+    Public methods:
+
+    get_tag_values()
+
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty SimulationResults."""
+        self.screen_count = 0
+        self.rarity_counts = Counter()
+        self.tag_screen_counts = Counter()
+        self.tag_rarity_totals = Counter()
+        self.beneficial_hits = 0
+
+    def __add__(self, other: "SimulationResults") -> "SimulationResults":
+        """Returns the results of both simulations combined."""
+        combined = SimulationResults()
+        combined.screen_count = self.screen_count + other.screen_count
+        combined.rarity_counts = self.rarity_counts + other.rarity_counts
+        combined.tag_screen_counts = (
+            self.tag_screen_counts + other.tag_screen_counts
+        )
+        combined.tag_rarity_totals = (
+            self.tag_rarity_totals + other.tag_rarity_totals
+        )
+        combined.beneficial_hits = (
+            self.beneficial_hits + other.beneficial_hits
+        )
+
+        return combined
+
+    def get_tag_values(self) -> Dict[int, float]:
+        """Returns the average guaranteed rarity of the screens each tag
+        showed up on (by tag index)."""
+        return {
+            tag_id: self.tag_rarity_totals[tag_id] / screen_count
+            for tag_id, screen_count in self.tag_screen_counts.items()
+        }
+
+
+def get_tag_weights(
+        tag_masks: Sequence[int],
+        weighted: bool
+) -> List[int]:
+    """Returns how likely each tag is to show up on a screen.
+
+    If weighted is True, each tag is as likely as the number of
+    operators that have it. Otherwise, every tag is equally likely.
+    """
+    if not weighted:
+        return [1] * len(tag_masks)
+
+    # A tag nobody has can still show up, just rarely
+    return [max(bin(mask).count("1"), 1) for mask in tag_masks]
+
+
+def draw_screen(
+        rng: random.Random,
+        tag_weights: Sequence[int]
+) -> Tuple[int, ...]:
+    """Draws SCREEN_SIZE different tags (with the given weights) and
+    returns their indexes, sorted."""
+    # When every tag is equally likely, sample() is a lot faster
+    if len(set(tag_weights)) == 1:
+        return tuple(sorted(
+            rng.sample(range(len(tag_weights)), SCREEN_SIZE)
+        ))
+
+    remaining_tags = list(range(len(tag_weights)))
+    remaining_weights = list(tag_weights)
+    screen = []
+    for _ in range(SCREEN_SIZE):
+        position = rng.choices(
+            range(len(remaining_tags)),
+            weights=remaining_weights
+        )[0]
+        screen.append(remaining_tags.pop(position))
+        remaining_weights.pop(position)
+
+    return tuple(sorted(screen))
+
+
+def _initialize_worker(
+        indexed_combos: Dict[Tuple[int, ...], Tuple[int, int, int]],
+        tag_weights: Sequence[int]
+) -> None:
+    """Gives a worker process what it needs to simulate screens."""
+    global _worker_combos, _worker_tag_weights
+
+    _worker_combos = indexed_combos
+    _worker_tag_weights = tag_weights
+
+
+def _simulate_task(task: Tuple[str, int, int]) -> SimulationResults:
+    """Simulates a number of screens using a random generator seeded
+    from the main seed and the task's number, and returns the results.
+
+    Keyword arguments:
+
+    task -- tuple, the main seed, the task's number, and how many
+    screens to simulate
+    """
+    seed, task_number, screen_count = task
+    rng = random.Random(f"{seed}:{task_number}")
+    results = SimulationResults()
+
+    for _ in range(screen_count):
+        screen = draw_screen(rng, _worker_tag_weights)
+        rarity = evaluate_screen(screen, _worker_combos)[0]
+
+        results.screen_count += 1
+        results.rarity_counts[rarity] += 1
+        if rarity >= BENEFICIAL_RARITY:
+            results.beneficial_hits += 1
+        for tag_id in screen:
+            results.tag_screen_counts[tag_id] += 1
+            results.tag_rarity_totals[tag_id] += rarity
+
+    return results
+
+
+def simulate_screens(
+        indexed_combos: Dict[Tuple[int, ...], Tuple[int, int, int]],
+        tag_weights: Sequence[int],
+        screen_count: int,
+        seed: str,
+        jobs: Optional[int] = None
+) -> SimulationResults:
+    """Simulates random recruitment screens across several processes
+    and returns the combined results.
+
+    Keyword arguments:
+
+    indexed_combos -- dict, every combo of the pool by tag indexes
+    (see screen_oracle.index_combos())
+
+    tag_weights -- list, how likely each tag is to show up (see
+    get_tag_weights())
+
+    screen_count -- int, how many screens to simulate
+
+    seed -- string, the seed that every task's random generator is
+    made from, so that the same seed always gives the same results
+
+    jobs -- int, how many processes to use (default: one per core)
+    """
+    tasks = [
+        (seed, task_number, min(
+            SCREENS_PER_TASK,
+            screen_count - task_number * SCREENS_PER_TASK
+        ))
+        for task_number in range(
+            (screen_count + SCREENS_PER_TASK - 1) // SCREENS_PER_TASK
+        )
+    ]
+
+    results = SimulationResults()
+    with ProcessPoolExecutor(
+            max_workers=jobs or os.cpu_count(),
+            initializer=_initialize_worker,
+            initargs=(indexed_combos, tag_weights)
+    ) as executor:
+        for task_results in executor.map(_simulate_task, tasks):
+            results += task_results
+
+    return results
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
@@ -0,0 +1,507 @@
+"""This module works out the best possible result of every 5 tag
+recruitment screen ahead of time (the screen oracle), so that any
+screen can be looked up instantly and screens can be searched by how
+good they are."""
+
+import sys
+import os
+import math
+import itertools
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from operatorclasses.operator_tag_index import OperatorTagIndex
+from operatorclasses.rarity_stats import RarityStats
+
+from inputfuncs.artifact_store import load_artifact, save_artifact
+from recruitfuncs.combo_table import MAX_COMBO_LENGTH
+from recruitfuncs.incidence_matrix import IncidenceMatrix, has_numpy, np
+
+
+# Bump this whenever the layout of the oracle changes, so that oracles
+# saved with the old layout get rebuilt.
+SCREEN_ORACLE_VERSION = 2
+
+# How many tags show up on one recruitment screen
+SCREEN_SIZE = 5
+
+# Stored as the best combo of a screen that has no good combo at all
+NO_COMBO = -1
+
+# Used to turn a combo's guaranteed rarity and priority into one score
+# (rarity first), since priorities are never anywhere near this big
+_RARITY_SCORE = 1 << 20
+_PRIORITY_OFFSET = 1 << 19
+
+# Set in every worker process by _initialize_worker(), so that the
+# combos only have to be sent to each worker once
+_worker_combos = {}
+_worker_tag_count = 0
+
+
+class ScreenOracle:
+    """A class holding the best result of every possible recruitment
+    screen.
+
+    Screens are numbered in the order itertools.combinations() gives
+    them out (using the index of each tag in the sorted tag list), and
+    for each one the oracle stores the best rarity that can be
+    guaranteed and which combination of tags guarantees it. Both are
+    kept in flat arrays, so the whole oracle only takes a few hundred
+    kilobytes.
+
+    Public variables:
+
+    tags
+
+    screen_count
+
+    pool_digest
+
+    Public methods:
+
+    get_screen_index(screen)
+
+    lookup(screen)
+
+    iter_screens(min_rarity)
+
+    get_rarity_counts()
+
+    """
+
+    def __init__(
+            self,
+            tags: Sequence[str],
+            combos: Sequence[Tuple[str, ...]],
+            rarities: bytes,
+            best_combos: array,
+            pool_digest: Optional[str] = None
+    ) -> None:
+        """Initializes a ScreenOracle.
+
+        Keyword arguments:
+
+        tags -- list, every tag (sorted), whose indexes make up
+        each screen
+
+        combos -- list, every combination of tags that matches an
+        operator, whose indexes are stored as the best combos
+
+        rarities -- bytes, the best guaranteed rarity of each screen
+        (0 if nothing can be guaranteed)
+
+        best_combos -- array, the index of the best combination of
+        each screen (NO_COMBO if there is none)
+
+        pool_digest -- string, the hash of the recruitment pool the
+        oracle was built for (see combo_table.get_pool_digest())
+        (default: None)
+        """
+        self._tags = list(tags)
+        self._tag_ids = {tag: index for index, tag in enumerate(tags)}
+        self._combos = list(combos)
+        self._rarities = rarities
+        self._best_combos = best_combos
+        self._pool_digest = pool_digest
+
+    @property
+    def tags(self) -> List[str]:
+        """Retrieves every tag that can be on a screen, sorted."""
+        return self._tags
+
+    @property
+    def pool_digest(self) -> Optional[str]:
+        """Retrieves the hash of the recruitment pool this oracle was
+        built for."""
+        return self._pool_digest
+
+    @property
+    def screen_count(self) -> int:
+        """Retrieves how many different screens there are."""
+        return len(self._rarities)
+
+    def get_screen_index(self, screen: Sequence[str]) -> int:
+        """Returns the index a screen is stored under.
+
+        Raises a ValueError if the screen doesn't have exactly
+        SCREEN_SIZE different tags, or has a tag that doesn't exist.
+        """
+        tag_ids = sorted(set(
+            self._tag_ids[tag]
+            for tag in screen
+            if tag in self._tag_ids.keys()
+        ))
+        if len(tag_ids) != SCREEN_SIZE or len(set(screen)) != SCREEN_SIZE:
+            raise ValueError(
+                f"A screen needs exactly {SCREEN_SIZE} different tags."
+            )
+
+        # Count every screen that comes before this one
+        tag_count = len(self._tags)
+        screen_index = 0
+        previous_id = -1
+        for position, tag_id in enumerate(tag_ids):
+            for skipped_id in range(previous_id + 1, tag_id):
+                screen_index += math.comb(
+                    tag_count - 1 - skipped_id,
+                    SCREEN_SIZE - 1 - position
+                )
+            previous_id = tag_id
+
+        return screen_index
+
+    def lookup(
+            self,
+            screen: Sequence[str]
+    ) -> Tuple[int, Optional[Tuple[str, ...]]]:
+        """Returns the best rarity a screen can guarantee, and the
+        combination of tags (sorted) that guarantees it (or None if
+        no combination matches anyone)."""
+        screen_index = self.get_screen_index(screen)
+        combo_id = self._best_combos[screen_index]
+
+        return (
+            self._rarities[screen_index],
+            None if combo_id == NO_COMBO else self._combos[combo_id]
+        )
+
+    def iter_screens(
+            self,
+            min_rarity: int = 0
+    ) -> Iterator[Tuple[Tuple[str, ...], int, Optional[Tuple[str, ...]]]]:
+        """Yields every screen that guarantees at least a certain
+        rarity, along with its best rarity and combination (see
+        lookup())."""
+        for screen_index, tag_ids in enumerate(itertools.combinations(
+                range(len(self._tags)),
+                SCREEN_SIZE
+        )):
+            if self._rarities[screen_index] < min_rarity:
+                continue
+
+            combo_id = self._best_combos[screen_index]
+            yield (
+                tuple(self._tags[tag_id] for tag_id in tag_ids),
+                self._rarities[screen_index],
+                None if combo_id == NO_COMBO else self._combos[combo_id]
+            )
+
+    def get_rarity_counts(self) -> Dict[int, int]:
+        """Returns how many screens guarantee each rarity."""
+        rarity_counts = {}
+        for rarity in self._rarities:
+            rarity_counts[rarity] = rarity_counts.get(rarity, 0) + 1
+
+        return rarity_counts
+
+
+def index_combos(
+        tag_index: OperatorTagIndex,
+        combo_table: Dict[Tuple[str, ...], Tuple[int, RarityStats]]
+) -> Tuple[
+        List[str],
+        List[Tuple[str, ...]],
+        Dict[Tuple[int, ...], Tuple[int, int, int]]
+]:
+    """Numbers every tag and every combo of a combo table, so that
+    screens can be evaluated using only numbers.
+
+    Returns every tag (sorted), every combo (sorted), and a dict
+    matching the tag indexes of each combo to its guaranteed rarity,
+    its priority, and its index.
+    """
+    all_tags = sorted(tag_index.get_tag_masks().keys())
+    tag_ids = {tag: index for index, tag in enumerate(all_tags)}
+    all_combos = sorted(combo_table.keys())
+
+    indexed_combos = {}
+    for combo_id, combo in enumerate(all_combos):
+        stats = combo_table[combo][1]
+
+        indexed_combos[tuple(tag_ids[tag] for tag in combo)] = (
+            stats.min_rarity,
+            stats.priority,
+            combo_id
+        )
+
+    return all_tags, all_combos, indexed_combos
+
+
+def evaluate_screen(
+        screen: Sequence[int],
+        indexed_combos: Dict[Tuple[int, ...], Tuple[int, int, int]]
+) -> Tuple[int, int, int]:
+    """Returns the guaranteed rarity, priority, and combo index of the
+    best combo of a screen (see index_combos()), or (0, 0, NO_COMBO) if
+    no combo of the screen matches anyone.
+
+    The best combo guarantees the highest rarity, and then has the
+    highest priority (the first one found wins ties). The tag indexes
+    of the screen must be sorted.
+    """
+    best = (0, 0, NO_COMBO)
+    for amount_of_tags in range(1, MAX_COMBO_LENGTH + 1):
+        for combo in itertools.combinations(screen, amount_of_tags):
+            result = indexed_combos.get(combo)
+            if result is not None and (
+                    best[2] == NO_COMBO
+                    or result[:2] > best[:2]
+            ):
+                best = result
+
+    return best
+
+
+def find_best_combo(
+        screen: Sequence[str],
+        combo_table: Dict[Tuple[str, ...], Tuple[int, RarityStats]]
+) -> Tuple[int, Optional[Tuple[str, ...]]]:
+    """Works out the best rarity a screen can guarantee and the combo
+    (sorted) that guarantees it, just like ScreenOracle.lookup() but
+    straight from a combo table. This is for screens the oracle can't
+    look up (eg. with tags it wasn't built with).
+
+    Ties are broken the same way as evaluate_screen() does.
+    """
+    best_rarity, best_priority, best_combo = 0, 0, None
+    tags = sorted(set(screen))
+    for amount_of_tags in range(1, MAX_COMBO_LENGTH + 1):
+        for combo in itertools.combinations(tags, amount_of_tags):
+            result = combo_table.get(combo)
+            if result is not None and (
+                    best_combo is None
+                    or (result[1].min_rarity, result[1].priority)
+                    > (best_rarity, best_priority)
+            ):
+                best_rarity = result[1].min_rarity
+                best_priority = result[1].priority
+                best_combo = combo
+
+    return best_rarity, best_combo
+
+
+def _initialize_worker(
+        combos: Dict[Tuple[int, ...], Tuple[int, int, int]],
+        tag_count: int
+) -> None:
+    """Gives a worker process the combos it needs to evaluate
+    screens."""
+    global _worker_combos, _worker_tag_count
+
+    _worker_combos = combos
+    _worker_tag_count = tag_count
+
+
+def _evaluate_screens(first_tag_id: int) -> Tuple[bytes, array]:
+    """Evaluates every screen whose first tag is a certain tag, and
+    returns their best rarities and best combos, in order.
+
+    Since screens are numbered in the order itertools.combinations()
+    gives them out, these screens always come one after another, so
+    the results of each first tag can just be joined together.
+    """
+    rarities = bytearray()
+    best_combos = array("h")
+
+    for other_tag_ids in itertools.combinations(
+            range(first_tag_id + 1, _worker_tag_count),
+            SCREEN_SIZE - 1
+    ):
+        best = evaluate_screen(
+            (first_tag_id,) + other_tag_ids,
+            _worker_combos
+        )
+
+        rarities.append(best[0])
+        best_combos.append(best[2])
+
+    return bytes(rarities), best_combos
+
+
+def _evaluate_all_screens_with_numpy(
+        tag_index: OperatorTagIndex,
+        all_tags: Sequence[str],
+        all_combos: Sequence[Tuple[str, ...]],
+        top_tag: str,
+        priority_values: Dict[str, int]
+) -> Tuple[bytes, array]:
+    """Evaluates every screen at once using the NumPy backend, and
+    returns the same results as _evaluate_screens() would for every
+    first tag, joined together."""
+    tag_count = len(all_tags)
+    tag_ids = {tag: index for index, tag in enumerate(all_tags)}
+
+    # Every combo gets a score that sorts by guaranteed rarity first and
+    # priority second, stored under a number made from its tag indexes
+    # (padded with tag_count, which no tag has)
+    _, _, lowest_rarities, priorities = IncidenceMatrix(tag_index).evaluate(
+        all_combos,
+        top_tag,
+        priority_values
+    )
+    scores = lowest_rarities * _RARITY_SCORE + priorities + _PRIORITY_OFFSET
+
+    combo_scores = np.full((tag_count + 1) ** MAX_COMBO_LENGTH, -1)
+    combo_numbers = np.full((tag_count + 1) ** MAX_COMBO_LENGTH, NO_COMBO)
+    for combo_id, combo in enumerate(all_combos):
+        combo_number = 0
+        for position in range(MAX_COMBO_LENGTH):
+            combo_number = combo_number * (tag_count + 1) + (
+                tag_ids[combo[position]]
+                if position < len(combo)
+                else tag_count
+            )
+
+        combo_scores[combo_number] = scores[combo_id]
+        combo_numbers[combo_number] = combo_id
+
+    # Work out the number of every combo of every screen, in the same
+    # order _evaluate_screens() goes through them (so ties are broken
+    # the same way)
+    screens = np.array(
+        list(itertools.combinations(range(tag_count), SCREEN_SIZE)),
+        dtype=np.int64
+    ).reshape(-1, SCREEN_SIZE)
+    screen_combo_numbers = []
+    for amount_of_tags in range(1, MAX_COMBO_LENGTH + 1):
+        for positions in itertools.combinations(
+                range(SCREEN_SIZE),
+                amount_of_tags
+        ):
+            combo_number = np.zeros(len(screens), dtype=np.int64)
+            for position in range(MAX_COMBO_LENGTH):
+                combo_number = combo_number * (tag_count + 1) + (
+                    screens[:, positions[position]]
+                    if position < len(positions)
+                    else tag_count
+                )
+            screen_combo_numbers.append(combo_number)
+    screen_combo_numbers = np.stack(screen_combo_numbers, axis=1)
+
+    # argmax() picks the first of the best, just like the loop does
+    screen_scores = combo_scores[screen_combo_numbers]
+    best_columns = screen_scores.argmax(axis=1)
+    all_rows = np.arange(len(screens))
+    best_scores = screen_scores[all_rows, best_columns]
+    best_combo_ids = combo_numbers[
+        screen_combo_numbers[all_rows, best_columns]
+    ]
+
+    rarities = np.where(best_scores < 0, 0, best_scores // _RARITY_SCORE)
+    best_combo_ids = np.where(best_scores < 0, NO_COMBO, best_combo_ids)
+
+    return (
+        rarities.astype(np.uint8).tobytes(),
+        array("h", best_combo_ids.astype(np.int16).tobytes())
+    )
+
+
+def build_screen_oracle(
+        tag_index: OperatorTagIndex,
+        combo_table: Dict[Tuple[str, ...], Tuple[int, RarityStats]],
+        top_tag: str,
+        priority_values: Dict[str, int],
+        jobs: Optional[int] = None,
+        pool_digest: Optional[str] = None
+) -> ScreenOracle:
+    """Evaluates every possible recruitment screen and returns the
+    results as a ScreenOracle.
+
+    If NumPy is installed, every screen is evaluated at once (see
+    incidence_matrix.py). Otherwise, screens are split up by their
+    first tag and evaluated in separate processes. Both give the
+    exact same oracle.
+
+    Keyword arguments:
+
+    tag_index -- OperatorTagIndex, an index matching tags with
+    operators
+
+    combo_table -- dict, the result of every combination of tags in
+    the pool (see recruitfuncs/combo_table.py)
+
+    top_tag -- string, the top operator tag
+
+    priority_values -- dict, how much each rarity is worth (see
+    PrioritySet)
+
+    jobs -- int, how many processes to use without NumPy (default:
+    one per core)
+
+    pool_digest -- string, the hash of the recruitment pool, kept in
+    the oracle (default: None)
+    """
+    # Workers only deal with tag indexes, and only need to know the
+    # guaranteed rarity and priority of each combo
+    all_tags, all_combos, indexed_combos = index_combos(
+        tag_index,
+        combo_table
+    )
+
+    if has_numpy():
+        rarities, best_combos = _evaluate_all_screens_with_numpy(
+            tag_index,
+            all_tags,
+            all_combos,
+            top_tag,
+            priority_values
+        )
+        return ScreenOracle(
+            all_tags,
+            all_combos,
+            rarities,
+            best_combos,
+            pool_digest
+        )
+
+    rarities = bytearray()
+    best_combos = array("h")
+    with ProcessPoolExecutor(
+            max_workers=jobs or os.cpu_count(),
+            initializer=_initialize_worker,
+            initargs=(indexed_combos, len(all_tags))
+    ) as executor:
+        for block_rarities, block_best_combos in executor.map(
+                _evaluate_screens,
+                range(len(all_tags) - SCREEN_SIZE + 1)
+        ):
+            rarities += block_rarities
+            best_combos += block_best_combos
+
+    return ScreenOracle(
+        all_tags,
+        all_combos,
+        bytes(rarities),
+        best_combos,
+        pool_digest
+    )
+
+
+def save_screen_oracle(pool_digest: str, oracle: ScreenOracle) -> None:
+    """Saves a ScreenOracle for the recruitment pool with a certain
+    hash (see combo_table.get_pool_digest())."""
+    save_artifact(
+        "recruit_oracle",
+        f"{pool_digest}-v{SCREEN_ORACLE_VERSION}",
+        oracle
+    )
+
+
+def load_screen_oracle(pool_digest: str) -> Optional[ScreenOracle]:
+    """Loads the ScreenOracle saved for the recruitment pool with a
+    certain hash.
+
+    Returns None if no oracle has been built for that pool yet.
+    """
+    return load_artifact(
+        "recruit_oracle",
+        f"{pool_digest}-v{SCREEN_ORACLE_VERSION}"
+    )
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
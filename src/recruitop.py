@@ -5,20 +5,65 @@ recruitment tags by taking in inputs, generating all possible
 import sys
 import argparse
 import itertools
-from typing import Optional, List, Type, Dict, AbstractSet, Sequence
+import json
+import hashlib
+import random
+from typing import Optional, List, Type, Dict, Sequence, Tuple, NamedTuple
 
+import requests
 from halo import Halo  # extremely important
 
 from operatorclasses.tagged_operator import TaggedOperator
 from operatorclasses.metadata_priorityset import MetadataPrioritySet
-
-from inputfuncs.input_reader import (
-    read_line_from_file,
-    read_lines_into_dict
+from operatorclasses.operator_tag_index import OperatorTagIndex
+from operatorclasses.rarity_stats import RarityStats
+
+from recruitfuncs.combo_table import (
+    MAX_COMBO_LENGTH,
+    get_combo_key,
+    get_combo_table,
+    get_pool_digest
+)
+from recruitfuncs.combo_search import iter_best_combos
+from recruitfuncs.screen_oracle import (
+    SCREEN_SIZE,
+    ScreenOracle,
+    index_combos,
+    build_screen_oracle,
+    find_best_combo,
+    load_screen_oracle,
+    save_screen_oracle
+)
+from recruitfuncs.recruit_simulator import get_tag_weights, simulate_screens
+from recruitfuncs.recruit_server import (
+    RecruitmentServer,
+    get_server_settings,
+    query_server,
+    remove_port_file,
+    write_port_file
 )
-from inputfuncs.scraper_functions import scrape_json
+
+from inputfuncs.input_reader import read_lines_into_dict
+from inputfuncs.data_sources import get_json_table, get_table_digest
+from inputfuncs.artifact_store import load_artifact, save_artifact
 
 # TODO: move some of the functions into a recruitfuncs module?
+
+# Bump this whenever the way the recruitment pool is built changes, so
+# that saved pools get rebuilt.
+RECRUITMENT_POOL_VERSION = 2
+
+# How much each rarity adds to (or takes away from) the priority of a
+# combination of tags
+PRIORITY_VALUES = {
+    "1": 0,
+    "2": -2,
+    "3": 0,
+    "4": 1,
+    "5": 2,
+    "6": 3,
+}
+
 ### FUNCTIONS ########################
 
 
@@ -36,19 +81,15 @@ def initialize_operator_list() -> Optional[List[Type[TaggedOperator]]]:
     Note that hidden operators (globalHidden or hidden) will not be
     included in this list.
     """
-    operatortags_rawjson = scrape_json(read_line_from_file(
-        "./info/recruitops/recruitTagJsonUrl.txt"
-    ))
+    # Getting the json content returns a list, so we call it a
+    # list appropriately
+    operatortags_list = get_json_table("recruit")
     # with open("tags_zh.json", "r", encoding="utf8") as f:
-    #     operatortags_rawjson = json.load(f)  # debug
+    #     operatortags_list = json.load(f)  # debug
 
-    if operatortags_rawjson is None:
+    if operatortags_list is None:
         return None
 
-    # Getting the json content returns a list, so we call it a
-    # list appropriately
-    operatortags_list = operatortags_rawjson.json()
-    # operatortags_list = operatortags_rawjson # debug
     operator_list = []
 
     name_replacements = read_lines_into_dict(
@@ -86,21 +127,21 @@ def initialize_operator_list() -> Optional[List[Type[TaggedOperator]]]:
     return operator_list
 
 
-def initialize_tag_dictionary(
-        operator_list: Sequence[Type[TaggedOperator]]
-) -> Dict[str, AbstractSet[str]]:
-    """Using a list of operators, initializes a dictionary matching
+def initialize_tag_index(
+        operator_list: Sequence[TaggedOperator]
+) -> OperatorTagIndex:
+    """Using a list of operators, initializes an index matching
     tags to operators that have those tags, and then returns it.
 
-    The keys are in Chinese because of the json, making it a bit
+    The tags are in Chinese because of the json, making it a bit
     harder to work with. Otherwise, it simply matches a tag with each
-    of the operators that has it.
+    of the operators that has it (see OperatorTagIndex).
 
     Keyword arguments:
     operator_list -- list, a list of TaggedOperator that is used to
-    build the dictionary
+    build the index
     """
-    tag_dict = {}
+    all_tags = []
 
     with open(
             "./info/recruitops/alltags.txt",
@@ -109,18 +150,11 @@ def initialize_tag_dictionary(
     ) as f:
         current_line = f.readline()
         while current_line != "" and current_line != "\n":
-            # By using sets to compare, we can
-            # easily combine results of searches later
-            tag_dict[current_line.rstrip()] = set([])
+            all_tags.append(current_line.rstrip())
 
             current_line = f.readline()
 
-    for operator in operator_list:
-        for tag in operator.tags:
-            if tag in tag_dict.keys():
-                tag_dict[tag].add(operator)
-
-    return tag_dict
+    return OperatorTagIndex(operator_list, all_tags, is_not_top_op)
 
 
 def is_not_top_op(operator: Type[TaggedOperator]) -> bool:
@@ -135,10 +169,19 @@ def get_formatted_op(operator: Type[TaggedOperator]) -> str:
     return f"{operator.name}: {operator.rarity}*"
 
 
+def format_combo_tags(
+        combo: Sequence[str],
+        reversed_translation_dict: Dict[str, str]
+) -> str:
+    """Returns a combination of tags as a formatted string of english
+    tags (eg. 'Top Operator + Defender')."""
+    return " + ".join(reversed_translation_dict[tag] for tag in combo)
+
+
 def generate_operator_set(
         combo: Sequence[str],
-        tag_dict: Dict[str, TaggedOperator],
-        translation_dict: Dict[str, str],
+        tag_index: OperatorTagIndex,
+        combo_table: Dict[Tuple[str, ...], Tuple[int, RarityStats]],
         reversed_translation_dict: Dict[str, str]
 ) -> Optional[MetadataPrioritySet]:
     """Using a provided combination of tags, checks if there are
@@ -152,98 +195,45 @@ def generate_operator_set(
 
     Keyword arguments:
     combo -- list, a combination of tags
-    tag_dict -- dict, a dict matching tags with operators
-    translation_dict -- dict, a dict translating english tags to
-    chinese tags
+    tag_index -- OperatorTagIndex, an index matching tags with
+    operators
+    combo_table -- dict, the result of every combination of tags in
+    the pool (see recruitfuncs/combo_table.py)
     reversed_translation_dict -- dict, a dict translating chinese tags
     to formatted english tags
     """
-    priority_values = {
-        "1": 0,
-        "2": -2,
-        "3": 0,
-        "4": 1,
-        "5": 2,
-        "6": 3,
-    }
+    # Every combination was already worked out when the combo table
+    # was built (top operators included only with the top operator
+    # tag), so all that's left is looking it up. Combinations that
+    # aren't in the table don't match anyone, so we return None.
+    combo_key = get_combo_key(combo)
+    if combo_key not in combo_table.keys():
+        return None
 
-    # Every combo will always have at least 1 entity, so
-    # we want the starting selection of operators all
-    # from the first tag, which we then splice out and then
-    # loop using the remaining tags.
-    #
-    # note: copy is reallllyyy important
-    # TODO: maybe make this better
-    possible_ops = (
-        tag_dict[combo[0]].copy()
-        if translation_dict["top-operator"] in combo
-        else set(
-            filter(
-                is_not_top_op,
-                tag_dict[combo[0]].copy()
-            )
-        )
-    )
+    possible_mask, stats = combo_table[combo_key]
 
     # This is to let us find out the tags we used to get this combo
-    converted_string = reversed_translation_dict[combo[0]]
-
-    # We have to loop over the rest of the tags and get the
-    # intersection of the current set of operators (from the first tag)
-    # and the rest of the operators from the rest of the tags.
-    for tag in combo[1:]:
-        # To prevent looping over this twice, we just get
-        # the converted chinese-to-english
-        # tag string here, and use if it we need it.
-        converted_string += " + " \
-            + reversed_translation_dict[tag]
-        # TODO: maybe make this better
-        new_ops = (
-            tag_dict[tag].copy()
-            if translation_dict["top-operator"] in combo
-            else set(
-                filter(
-                    is_not_top_op,
-                    tag_dict[tag].copy()
-                )
-            )
-        )
-        possible_ops &= new_ops
-
-        if len(possible_ops) <= 0:
-            break  # oh no its a bad break
-
-    # If there are operators that satisfy all the tags, this
-    # bit of code will run, returning a MetadataPrioritySet.
-    # If no operator satisfies them all, this function will return
-    # None, indicating no tags.
-    if len(possible_ops) > 0:
-        # Sorting all the possible ops in order of rarity
-        possible_ops = sorted(
-            possible_ops,
-            key=lambda o: o.rarity,
-            reverse=True
-        )
+    converted_string = format_combo_tags(combo, reversed_translation_dict)
 
-        current_match = MetadataPrioritySet(
-            possible_ops,
-            priority_values
-        )
-
-        current_match.add_data(
-            "tags",
-            converted_string
-        )
+    # Decoding the mask gives the ops in order of rarity already
+    current_match = MetadataPrioritySet(
+        tag_index.decode(possible_mask),
+        PRIORITY_VALUES,
+        stats=stats
+    )
 
-        return current_match
+    current_match.add_data(
+        "tags",
+        converted_string
+    )
 
-    return None
+    return current_match
 
 
 def get_all_combinations(
         proper_tags: Sequence[str],
-        tag_dict: Dict[str, TaggedOperator],
-        translation_dict: Dict[str, str],
+        tag_index: OperatorTagIndex,
+        combo_table: Dict[Tuple[str, ...], Tuple[int, RarityStats]],
         reversed_translation_dict: Dict[str, str]
 ) -> List[MetadataPrioritySet]:
     """Generates all the combinations of tags possible, gets the
@@ -252,9 +242,10 @@ def get_all_combinations(
 
     Keyword arguments:
     proper_tags -- list, the tags provided
-    tag_dict -- dict, a dict matching tags with operators
-    translation_dict -- dict, a dict translating english tags to
-    chinese tags
+    tag_index -- OperatorTagIndex, an index matching tags with
+    operators
+    combo_table -- dict, the result of every combination of tags in
+    the pool (see recruitfuncs/combo_table.py)
     reversed_translation_dict -- dict, a dict translating chinese tags
     to formatted english tags
     """
@@ -262,7 +253,7 @@ def get_all_combinations(
     all_matches = []
     # Since ops only have 3 tags, we get all combinations with 1-3
     # length
-    for amount_of_tags in range(1, 4):
+    for amount_of_tags in range(1, MAX_COMBO_LENGTH + 1):
         all_combos = itertools.combinations(
             proper_tags,
             amount_of_tags
@@ -270,8 +261,8 @@ def get_all_combinations(
         for combo in all_combos:
             current_match = generate_operator_set(
                 combo,
-                tag_dict,
-                translation_dict,
+                tag_index,
+                combo_table,
                 reversed_translation_dict
             )
 
@@ -308,7 +299,7 @@ def format_beneficial_tags(
         # take the last element of this sorted set and check
         # its rarity. If it's higher than 3, the rest of the set
         # should be higher than 3.
-        if list(op_set.intrinsic_set)[-1].rarity > 3:
+        if op_set.min_rarity > 3:
             messages.append(
                 op_set.get_data("tags")
             )
@@ -346,7 +337,7 @@ def format_normal_tags(
         messages.append(
             op_set.get_data("tags")
             if (
-                list(op_set.intrinsic_set)[-1].rarity <= 3
+                op_set.min_rarity <= 3
             )
             else f"***Good***\n{op_set.get_data('tags')}"
         )
@@ -362,19 +353,429 @@ def format_normal_tags(
 
     return messages
 
+
+class RecruitmentData(NamedTuple):
+    """Everything needed to look up combinations of tags, built once
+    per run (see initialize_recruitment_data())."""
+    tag_index: OperatorTagIndex
+    translation_dict: Dict[str, str]
+    reversed_translation_dict: Dict[str, str]
+    combo_table: Dict[Tuple[str, ...], Tuple[int, RarityStats]]
+    pool_digest: str
+
+
+def get_pool_source_digest(json_digest: str) -> str:
+    """Returns a hash of everything the recruitment pool is built from
+    (the tag JSON, the operator name replacements, and the list of
+    tags), which changes whenever any of them do."""
+    hasher = hashlib.sha256(
+        f"{json_digest}-v{RECRUITMENT_POOL_VERSION}".encode("utf8")
+    )
+
+    for path in [
+            "./info/recruitops/operatorNameReplacements.txt",
+            "./info/recruitops/alltags.txt"
+    ]:
+        with open(path, "rb") as f:
+            hasher.update(f.read())
+
+    return hasher.hexdigest()
+
+
+def get_recruitment_pool(refresh: bool = False) -> Optional[OperatorTagIndex]:
+    """Returns the recruitment pool, already indexed by tag.
+
+    The pool is saved after it's built, and reused until the tag JSON
+    (or the files it's built with) changes. If the tag JSON can't be
+    fetched at all (eg. there's no internet), the last saved pool is
+    used instead.
+
+    Returns None if the tag JSON could not be fetched and no pool was
+    ever saved.
+
+    Keyword arguments:
+
+    refresh -- bool, if True, always asks the server whether the tag
+    JSON changed and rebuilds the pool (default: False)
+    """
+    saved_pool = load_artifact("recruit_pool", "current")
+
+    try:
+        json_digest = get_table_digest("recruit", refresh)
+    except requests.exceptions.RequestException:
+        json_digest = None
+
+    if json_digest is None:
+        return saved_pool["tag_index"] if saved_pool is not None else None
+
+    source_digest = get_pool_source_digest(json_digest)
+    if (
+            not refresh
+            and saved_pool is not None
+            and saved_pool["source_digest"] == source_digest
+    ):
+        return saved_pool["tag_index"]
+
+    op_list = initialize_operator_list()
+    if op_list is None:
+        return None
+
+    tag_index = initialize_tag_index(op_list)
+    save_artifact(
+        "recruit_pool",
+        "current",
+        {"source_digest": source_digest, "tag_index": tag_index}
+    )
+
+    return tag_index
+
+
+def initialize_recruitment_data(
+        refresh: bool = False
+) -> Optional[RecruitmentData]:
+    """Loads the recruitment pool (see get_recruitment_pool()), reads
+    every tag conversion file, and loads (or builds) the pool's combo
+    table.
+
+    Returns None if the recruitment pool could not be loaded.
+    """
+    tag_index = get_recruitment_pool(refresh)
+    if tag_index is None:
+        return None
+
+    # Get both a proper translation from en to zh dict with the
+    # new tag shortcuts and the premade tags
+    # and a reversed dict initialized for proper tag conversion
+    translation_dict = {
+        **read_lines_into_dict(
+            "./info/recruitops/tagConversions.txt"
+        ),
+        **read_lines_into_dict(
+            "./info/recruitops/tagShortcuts.txt"
+        )
+    }
+    reversed_translation_dict = read_lines_into_dict(
+        "./info/recruitops/formattedTagConversions.txt",
+        reverse=True
+    )
+
+    # Every combination in the pool only has to be worked out once
+    # (until the pool changes), after that it's just lookups
+    combo_table = get_combo_table(
+        tag_index,
+        translation_dict["top-operator"],
+        PRIORITY_VALUES
+    )
+
+    return RecruitmentData(
+        tag_index,
+        translation_dict,
+        reversed_translation_dict,
+        combo_table,
+        get_pool_digest(
+            tag_index,
+            translation_dict["top-operator"],
+            PRIORITY_VALUES
+        )
+    )
+
+
+def translate_tags(
+        tags: Sequence[str],
+        translation_dict: Dict[str, str]
+) -> List[str]:
+    """Takes in the user tags and finds their proper, translated names
+    so that they can be used with the json.
+
+    Raises a ValueError if a tag doesn't exist.
+    """
+    proper_tags = []
+    # TODO: this tag process could probably be more optimized
+    for tag in tags:
+        if tag.lower() in translation_dict.keys():
+            proper_tags.append(translation_dict[tag.lower()])
+        else:
+            # TODO: exit nicer
+            raise ValueError(
+                f"The tag '{tag.lower()}' does not exist."
+            )
+
+    return proper_tags
+
+
+def get_sorted_selection(
+        proper_tags: Sequence[str],
+        recruitment_data: RecruitmentData
+) -> List[MetadataPrioritySet]:
+    """Finds the operators for every combination of the specified
+    (translated) tags, and returns the combinations that match anyone,
+    sorted by priority (best last)."""
+    # Find all possible combinations of each tag combo
+    all_matches = get_all_combinations(
+        proper_tags,
+        recruitment_data.tag_index,
+        recruitment_data.combo_table,
+        recruitment_data.reversed_translation_dict
+    )
+
+    # Sort based on priority so the combinations can be formatted.
+    #
+    # Consists of all the tag combinations and results, sorted
+    # by priority.
+    return sorted(
+        all_matches,
+        key=lambda s: s.priority
+    )
+
+
+def get_best_selection(
+        proper_tags: Sequence[str],
+        recruitment_data: RecruitmentData,
+        top: Optional[int] = None,
+        min_rarity: int = 0
+) -> List[MetadataPrioritySet]:
+    """Finds only the best combinations of the specified (translated)
+    tags, and returns them sorted by priority (best last), just like
+    get_sorted_selection() does.
+
+    The combinations are found best first (see
+    recruitfuncs/combo_search.py), so combinations that don't make the
+    cut are never built.
+
+    Keyword arguments:
+
+    proper_tags -- list, the tags provided
+
+    recruitment_data -- RecruitmentData, the loaded recruitment pool
+
+    top -- int, how many combinations to return at most (default:
+    None, meaning all of them)
+
+    min_rarity -- int, only combinations that guarantee at least this
+    rarity are returned (default: 0, meaning all of them)
+    """
+    best_combos = itertools.islice(
+        iter_best_combos(
+            proper_tags,
+            recruitment_data.combo_table,
+            min_rarity
+        ),
+        top
+    )
+
+    best_selection = []
+    for combo, mask, stats in best_combos:
+        current_match = MetadataPrioritySet(
+            recruitment_data.tag_index.decode(mask),
+            PRIORITY_VALUES,
+            stats=stats
+        )
+        current_match.add_data(
+            "tags",
+            format_combo_tags(
+                combo,
+                recruitment_data.reversed_translation_dict
+            )
+        )
+        best_selection.append(current_match)
+
+    # They were found best first, but are shown best last
+    best_selection.reverse()
+
+    return best_selection
+
+
+def get_selection(
+        args: argparse.Namespace,
+        proper_tags: Sequence[str],
+        recruitment_data: RecruitmentData
+) -> List[MetadataPrioritySet]:
+    """Returns the combinations of the specified (translated) tags
+    sorted by priority (best last), only finding the best ones if
+    args.top or args.min_rarity is specified."""
+    if args.top is None and args.min_rarity is None:
+        return get_sorted_selection(proper_tags, recruitment_data)
+
+    return get_best_selection(
+        proper_tags,
+        recruitment_data,
+        args.top,
+        args.min_rarity or 0
+    )
+
+
+def parse_tag_screen(line: str) -> List[str]:
+    """Reads the tags of one screen from a line of batch input and
+    returns them.
+
+    The line is either the tags separated by spaces (just like the
+    `recruit` command), or a JSON list of tags, or a JSON object with
+    the list of tags under "tags".
+
+    Raises a ValueError if a JSON line doesn't hold a list of tags.
+    """
+    line = line.strip()
+    if not line.startswith(("[", "{")):
+        return line.split()
+
+    try:
+        screen = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"The line isn't valid JSON ({e}).") from e
+
+    if isinstance(screen, dict):
+        screen = screen.get("tags")
+
+    if (
+            not isinstance(screen, list)
+            or not all(isinstance(tag, str) for tag in screen)
+    ):
+        raise ValueError("The line doesn't have a list of tags.")
+
+    # Tags in JSON can have real spaces in them
+    return [tag.replace(" ", "-") for tag in screen]
+
+
+def get_selection_json(
+        op_set: MetadataPrioritySet
+) -> Dict[str, object]:
+    """Returns one combination of tags and its operators as a dict
+    that can be turned into JSON."""
+    return {
+        "tags": op_set.get_data("tags"),
+        "priority": op_set.priority,
+        "good": op_set.min_rarity > 3,
+        "operators": [
+            {"name": operator.name, "rarity": operator.rarity}
+            for operator in op_set.intrinsic_set
+        ],
+    }
+
+
 ######################################
 
 
+def find_best_guarantee(
+        proper_tags: Sequence[str],
+        recruitment_data: RecruitmentData,
+        oracle: Optional[ScreenOracle]
+) -> Tuple[Optional[int], Optional[Tuple[str, ...]]]:
+    """Returns the best rarity a full screen can guarantee and the
+    combination of tags that guarantees it, or (None, None) if it
+    isn't a full screen or the oracle hasn't been built.
+
+    The oracle is only asked if it was built for the current pool and
+    knows every tag on the screen. Otherwise, the screen is worked out
+    from the combo table instead.
+    """
+    if oracle is None or len(set(proper_tags)) != SCREEN_SIZE:
+        return None, None
+
+    if oracle.pool_digest == recruitment_data.pool_digest:
+        try:
+            return oracle.lookup(proper_tags)
+        except ValueError:
+            pass  # A tag the oracle wasn't built with
+
+    return find_best_combo(proper_tags, recruitment_data.combo_table)
+
+
+def get_recruitment_messages(
+        args: argparse.Namespace,
+        proper_tags: Sequence[str],
+        recruitment_data: RecruitmentData,
+        oracle: Optional[ScreenOracle]
+) -> Tuple[List[str], Optional[str]]:
+    """Finds the combinations of the specified (translated) tags and
+    returns them as a list of formatted messages, along with a line
+    with the best rarity the screen can guarantee (if it's a full
+    screen and the oracle has been built, otherwise None)."""
+    all_sorted_selection = get_selection(
+        args,
+        proper_tags,
+        recruitment_data
+    )
+    messages = format_selections(args, all_sorted_selection)
+
+    # If this is a full screen and the oracle has been built, it
+    # already knows the best this screen can do
+    best_line = None
+    best_rarity, best_combo = find_best_guarantee(
+        proper_tags,
+        recruitment_data,
+        oracle
+    )
+    if best_combo is not None:
+        best_line = (
+            f"Best guaranteed rarity: {best_rarity}* ("
+            + format_combo_tags(
+                best_combo,
+                recruitment_data.reversed_translation_dict
+            )
+            + ")"
+        )
+
+    return messages, best_line
+
+
+def print_recruitment_results(
+        messages: List[str],
+        best_line: Optional[str]
+) -> None:
+    """Prints the formatted messages (and best rarity line) of a
+    recruitment search (see get_recruitment_messages())."""
+    sys.stdout.write("\n\nRecruitment Results\n\n")  # padding
+    sys.stdout.write(
+        "Note: the lower down the tag collection, "
+        + "the better the tags.\n\n\n"
+    )  # padding
+
+    if len(messages) <= 0:
+        sys.stdout.write("Could not find any recruitment results.\n")
+    else:
+        for msg in messages:
+            sys.stdout.write(msg + "\n")
+
+    if best_line is not None:
+        sys.stdout.write(best_line + "\n")
+    sys.stdout.write("\n")  # padding
+
+
 def find_recruitment_combos(args: argparse.Namespace) -> None:
     """Taking the specified namespace of arguments, this function will
     determine combinations of tags, find operators that match those
     combinations, and print to the screen a formatted list of
-    combinations and operators, sorted by value bottom-to-top."""
+    combinations and operators, sorted by value bottom-to-top.
+
+    If the recruitment server is running (see serve_recruitment()), it
+    does the work instead, since it already has everything loaded.
+    """
     spinner = Halo(text="Fetching...", spinner="dots", color="magenta")
     spinner.start()
 
-    op_list = initialize_operator_list()
-    if op_list is None:
+    # The server can't fetch fresh data or read offline snapshots for
+    # us, so those are always done here
+    answer = (
+        query_server({
+            "tags": args.tags,
+            "beneficial": args.beneficial,
+            "top": args.top,
+            "min_rarity": args.min_rarity,
+        })
+        if not args.refresh and not getattr(args, "offline", False)
+        else None
+    )
+    if answer is not None:
+        if "error" in answer:
+            spinner.fail("Failed.")
+            raise ValueError(answer["error"])
+
+        spinner.succeed("Success!")
+        print_recruitment_results(answer["messages"], answer["best"])
+        return
+
+    recruitment_data = initialize_recruitment_data(args.refresh)
+    if recruitment_data is None:
         spinner.fail("Failed.")
         sys.stdout.write(
             "\n\nThe tag JSON could not be fetched! Try again later."
@@ -383,69 +784,531 @@ def find_recruitment_combos(args: argparse.Namespace) -> None:
         spinner.text = "Calculating..."
         spinner.color = "yellow"
 
-        tag_dict = initialize_tag_dictionary(op_list)
+        proper_tags = translate_tags(
+            args.tags,
+            recruitment_data.translation_dict
+        )
 
-        # Get both a proper translation from en to zh dict with the
-        # new tag shortcuts and the premade tags
-        # and a reversed dict initialized for proper tag conversion
-        translation_dict = {
-            **read_lines_into_dict(
-                "./info/recruitops/tagConversions.txt"
-            ),
-            **read_lines_into_dict(
-                "./info/recruitops/tagShortcuts.txt"
+        messages, best_line = get_recruitment_messages(
+            args,
+            proper_tags,
+            recruitment_data,
+            (
+                load_screen_oracle(recruitment_data.pool_digest)
+                if len(set(proper_tags)) == SCREEN_SIZE
+                else None
             )
-        }
-        reversed_translation_dict = read_lines_into_dict(
-            "./info/recruitops/formattedTagConversions.txt",
-            reverse=True
         )
 
-        # Take in the user tags and find their proper, translated names
-        # so that they can be used with the json.
-        proper_tags = []
-        # TODO: this tag process could probably be more optimized
-        for tag in args.tags:
-            if tag.lower() in translation_dict.keys():
-                proper_tags.append(translation_dict[tag.lower()])
+        # Print the recruitment results
+        spinner.succeed("Success!")
+        print_recruitment_results(messages, best_line)
+
+
+class ServerState(NamedTuple):
+    """Everything the recruitment server keeps loaded (see
+    serve_recruitment())."""
+    recruitment_data: RecruitmentData
+    oracle: Optional[ScreenOracle]
+
+
+def load_server_state(
+        current_state: Optional[ServerState]
+) -> Optional[ServerState]:
+    """Loads the recruitment pool (and the screen oracle, if it's been
+    built) for the recruitment server.
+
+    When reloading, the server is asked whether the recruitment JSON
+    changed (which is cheap if it didn't), and the pool is only
+    rebuilt if it did. Otherwise the current state is kept (unless the
+    oracle has been built since). Returns None if the pool could not
+    be loaded.
+    """
+    if current_state is not None:
+        try:
+            old_digest = get_table_digest("recruit")
+            new_digest = get_table_digest("recruit", refresh=True)
+        except requests.exceptions.RequestException:
+            # Timed out or no internet
+            old_digest, new_digest = None, None
+
+        # Keep answering with the old pool if we can't tell
+        if new_digest is None or new_digest == old_digest:
+            if current_state.oracle is not None:
+                return current_state
+
+            return current_state._replace(
+                oracle=load_screen_oracle(
+                    current_state.recruitment_data.pool_digest
+                )
+            )
+
+    recruitment_data = initialize_recruitment_data()
+    if recruitment_data is None:
+        return None
+
+    if (
+            current_state is not None
+            and current_state.oracle is not None
+            and current_state.recruitment_data.pool_digest
+            == recruitment_data.pool_digest
+    ):
+        return current_state
+
+    return ServerState(
+        recruitment_data,
+        load_screen_oracle(recruitment_data.pool_digest)
+    )
+
+
+def answer_recruitment_query(
+        state: ServerState,
+        query: Dict[str, object]
+) -> Dict[str, object]:
+    """Answers a query sent to the recruitment server.
+
+    The query has the tags under "tags", and optionally the
+    "beneficial", "top" and "min_rarity" options of the `recruit`
+    command. The answer has the formatted messages under "messages",
+    and the best rarity line (or None) under "best".
+
+    Raises a ValueError if the query is bad or a tag doesn't exist.
+    """
+    tags = query.get("tags")
+    if (
+            not isinstance(tags, list)
+            or not all(isinstance(tag, str) for tag in tags)
+    ):
+        raise ValueError("The query doesn't have a list of tags.")
+
+    top = query.get("top")
+    if top is not None and (
+            not isinstance(top, int)
+            or isinstance(top, bool)
+            or top < 1
+    ):
+        raise ValueError("The number of top combinations must be 1 or more.")
+
+    proper_tags = translate_tags(
+        tags,
+        state.recruitment_data.translation_dict
+    )
+    messages, best_line = get_recruitment_messages(
+        argparse.Namespace(
+            beneficial=bool(query.get("beneficial")),
+            top=top,
+            min_rarity=query.get("min_rarity")
+        ),
+        proper_tags,
+        state.recruitment_data,
+        state.oracle
+    )
+
+    return {"messages": messages, "best": best_line}
+
+
+def serve_recruitment(args: argparse.Namespace) -> None:
+    """Starts a local server that keeps the recruitment pool loaded and
+    answers the queries of `recruit` commands until it's stopped
+    (with Ctrl+C).
+
+    The pool is checked for changes every args.reload_interval
+    seconds (or the interval in the server settings), and reloaded in
+    the background if it did change.
+    """
+    settings = get_server_settings()
+
+    spinner = Halo(text="Loading...", spinner="dots", color="magenta")
+    spinner.start()
+
+    try:
+        server = RecruitmentServer(
+            (
+                settings["host"],
+                args.port if args.port is not None else int(settings["port"])
+            ),
+            load_server_state,
+            answer_recruitment_query
+        )
+    except (RuntimeError, OSError) as e:
+        spinner.fail("Failed.")
+        sys.stdout.write(f"\n\nThe server could not be started: {e}\n")
+        return
+
+    host, port = server.server_address[:2]
+    write_port_file(port)
+    server.start_reloading(
+        args.reload_interval
+        if args.reload_interval is not None
+        else float(settings["reload_interval"])
+    )
+
+    spinner.succeed(f"Serving on {host}:{port}! (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        sys.stdout.write("\nStopping...\n")
+    finally:
+        server.stop_reloading()
+        server.server_close()
+        remove_port_file()
+
+
+def find_batch_recruitment_combos(args: argparse.Namespace) -> None:
+    """Reads tag screens (one per line) from args.file, or from stdin
+    if args.file is '-', and prints the recruitment results of each
+    screen as soon as it's read.
+
+    The recruitment pool, the tag index, and the tag conversions are
+    only loaded once, no matter how many screens there are. With
+    args.json, each result is printed as one line of JSON instead.
+    """
+    # JSON output is meant for other tools, so nothing else should be
+    # printed along with it
+    spinner = Halo(
+        text="Fetching...",
+        spinner="dots",
+        color="magenta",
+        enabled=not args.json
+    )
+    spinner.start()
+
+    # The file is opened first, so a wrong path doesn't have to wait
+    # for the pool to load before it's reported
+    try:
+        input_file = (
+            sys.stdin
+            if args.file == "-"
+            else open(args.file, "r", encoding="utf8")
+        )
+    except OSError as e:
+        spinner.fail("Failed.")
+        sys.stdout.write(
+            f"\n\nCould not open '{args.file}': {e.strerror}\n"
+        )
+        return
+
+    recruitment_data = initialize_recruitment_data(args.refresh)
+    if recruitment_data is None:
+        if input_file is not sys.stdin:
+            input_file.close()
+        spinner.fail("Failed.")
+        sys.stdout.write(
+            "\n\nThe tag JSON could not be fetched! Try again later.\n"
+        )
+        return
+
+    oracle = load_screen_oracle(recruitment_data.pool_digest)
+    spinner.succeed("Ready!")
+    if not args.json:
+        sys.stdout.write("\n\n")  # padding
+
+    try:
+        for line_number, line in enumerate(input_file, start=1):
+            if line.strip() == "":
+                continue
+
+            try:
+                tags = parse_tag_screen(line)
+                proper_tags = translate_tags(
+                    tags,
+                    recruitment_data.translation_dict
+                )
+            except ValueError as e:
+                if args.json:
+                    sys.stdout.write(json.dumps({
+                        "line": line_number,
+                        "error": str(e),
+                    }) + "\n")
+                else:
+                    sys.stdout.write(
+                        f"Line {line_number}: {e}\n\n"
+                        + "------------------------------------\n\n"
+                    )
+                sys.stdout.flush()
+                continue
+
+            all_sorted_selection = get_selection(
+                args,
+                proper_tags,
+                recruitment_data
+            )
+            best_rarity, best_combo = find_best_guarantee(
+                proper_tags,
+                recruitment_data,
+                oracle
+            )
+
+            if args.json:
+                sys.stdout.write(json.dumps({
+                    "line": line_number,
+                    "tags": tags,
+                    "results": [
+                        get_selection_json(op_set)
+                        for op_set in all_sorted_selection
+                        if not args.beneficial
+                        or op_set.min_rarity > 3
+                    ],
+                    "best_rarity": best_rarity,
+                }) + "\n")
             else:
-                # TODO: exit nicer
-                raise Exception(
-                    f"The tag '{tag.lower()}' does not exist."
+                sys.stdout.write(
+                    f"Line {line_number}: {' '.join(tags)}\n\n"
+                )
+                for msg in format_selections(args, all_sorted_selection):
+                    sys.stdout.write(msg + "\n")
+                if best_combo is not None:
+                    sys.stdout.write(
+                        f"Best guaranteed rarity: {best_rarity}* ("
+                        + format_combo_tags(
+                            best_combo,
+                            recruitment_data.reversed_translation_dict
+                        )
+                        + ")\n"
+                    )
+                sys.stdout.write(
+                    "\n------------------------------------\n\n"
                 )
 
-        # Find all possible combinations of each tag combo
-        all_matches = get_all_combinations(
-            proper_tags,
-            tag_dict,
-            translation_dict,
-            reversed_translation_dict
+            # Results are read by other programs as they come in
+            sys.stdout.flush()
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+
+def simulate_recruitment(args: argparse.Namespace) -> None:
+    """Simulates args.screens random recruitment screens and prints
+    how often each rarity can be guaranteed, how much each tag is
+    worth, and how often --beneficial finds something."""
+    # JSON output is meant for other tools, so nothing else should be
+    # printed along with it
+    spinner = Halo(
+        text="Fetching...",
+        spinner="dots",
+        color="magenta",
+        enabled=not args.json
+    )
+    spinner.start()
+
+    recruitment_data = initialize_recruitment_data(args.refresh)
+    if recruitment_data is None:
+        spinner.fail("Failed.")
+        sys.stdout.write(
+            "\n\nThe tag JSON could not be fetched! Try again later.\n"
         )
+        return
+
+    spinner.text = "Simulating..."
+    spinner.color = "yellow"
 
-        # Sort based on priority and format all the possible
-        # combinations.
-        #
-        # Consists of all the tag combinations and results, sorted
-        # by priority.
-        all_sorted_selection = sorted(
-            all_matches,
-            key=lambda s: s.priority
+    all_tags, _, indexed_combos = index_combos(
+        recruitment_data.tag_index,
+        recruitment_data.combo_table
+    )
+    tag_weights = get_tag_weights(
+        [recruitment_data.tag_index.get_tag_mask(tag) for tag in all_tags],
+        args.weighted
+    )
+    # Without a seed, pick one (and show it) so the run can be repeated
+    seed = (
+        args.seed
+        if args.seed is not None
+        else str(random.SystemRandom().randrange(1 << 32))
+    )
+
+    results = simulate_screens(
+        indexed_combos,
+        tag_weights,
+        args.screens,
+        seed,
+        args.jobs
+    )
+    spinner.succeed("Success!")
+
+    reversed_translation_dict = recruitment_data.reversed_translation_dict
+    tag_values = sorted(
+        results.get_tag_values().items(),
+        key=lambda item: item[1],
+        reverse=True
+    )
+    if results.screen_count <= 0:
+        average_rarity = 0
+    else:
+        average_rarity = sum(
+            rarity * count
+            for rarity, count in results.rarity_counts.items()
+        ) / results.screen_count
+
+    if args.json:
+        sys.stdout.write(json.dumps({
+            "screens": results.screen_count,
+            "seed": seed,
+            "weighted": args.weighted,
+            "rarity_counts": dict(sorted(results.rarity_counts.items())),
+            "beneficial_hits": results.beneficial_hits,
+            "average_rarity": average_rarity,
+            "tag_values": {
+                reversed_translation_dict[all_tags[tag_id]]: value
+                for tag_id, value in tag_values
+            },
+        }) + "\n")
+        return
+
+    messages = [
+        f"Simulated {results.screen_count} screens (seed {seed}"
+        + (", tags weighted by how common they are" if args.weighted else "")
+        + ").\n",
+        "Guaranteed rarity:",
+    ]
+    for rarity, count in sorted(results.rarity_counts.items()):
+        messages.append(
+            f"{rarity}*: {count / results.screen_count:.2%} ({count})"
         )
-        messages = format_selections(args, all_sorted_selection)
 
-        # Print the recruitment results
-        spinner.succeed("Success!")
-        sys.stdout.write("\n\nRecruitment Results\n\n")  # padding
+    messages.append(
+        "\nScreens with a beneficial combination: "
+        + f"{results.beneficial_hits / max(results.screen_count, 1):.2%}"
+    )
+    messages.append(
+        "\nAverage guaranteed rarity of screens with each tag "
+        + f"(overall: {average_rarity:.3f}):"
+    )
+    for tag_id, value in tag_values:
+        messages.append(
+            f"{reversed_translation_dict[all_tags[tag_id]]}: {value:.3f} "
+            + f"({value - average_rarity:+.3f})"
+        )
+
+    sys.stdout.write("\n\n")  # padding
+    for message in messages:
+        sys.stdout.write(message + "\n")
+    sys.stdout.write("\n")  # padding
+
+
+def build_recruitment_oracle(
+        args: argparse.Namespace,
+        recruitment_data: RecruitmentData
+) -> List[str]:
+    """Evaluates every possible recruitment screen, saves the results
+    as the screen oracle for the current pool, and returns a list of
+    messages summarizing it."""
+    oracle = build_screen_oracle(
+        recruitment_data.tag_index,
+        recruitment_data.combo_table,
+        recruitment_data.translation_dict["top-operator"],
+        PRIORITY_VALUES,
+        args.jobs,
+        recruitment_data.pool_digest
+    )
+    save_screen_oracle(recruitment_data.pool_digest, oracle)
+
+    return [f"Built the oracle for {oracle.screen_count} screens.\n"]
+
+
+def report_recruitment_oracle(
+        args: argparse.Namespace,
+        recruitment_data: RecruitmentData
+) -> Optional[List[str]]:
+    """Returns a list of messages with how many screens guarantee each
+    rarity, and every screen that guarantees at least
+    args.min_rarity (if specified).
+
+    Returns None if the oracle hasn't been built for the current pool.
+    """
+    oracle = load_screen_oracle(recruitment_data.pool_digest)
+    if oracle is None:
+        return None
+
+    reversed_translation_dict = recruitment_data.reversed_translation_dict
+    messages = []
+
+    if args.min_rarity is not None:
+        for screen, rarity, combo in oracle.iter_screens(args.min_rarity):
+            # Screens that don't guarantee anything have no combo
+            if args.json:
+                messages.append(json.dumps({
+                    "screen": [
+                        reversed_translation_dict[tag] for tag in screen
+                    ],
+                    "rarity": rarity,
+                    "combo": (
+                        [reversed_translation_dict[tag] for tag in combo]
+                        if combo is not None
+                        else None
+                    ),
+                }))
+            else:
+                messages.append(
+                    format_combo_tags(screen, reversed_translation_dict)
+                    + f" -> {rarity}* ("
+                    + (
+                        format_combo_tags(combo, reversed_translation_dict)
+                        if combo is not None
+                        else "no combination"
+                    )
+                    + ")"
+                )
+
+    if args.json and args.min_rarity is None:
+        messages.append(json.dumps({
+            "screens": oracle.screen_count,
+            "rarity_counts": oracle.get_rarity_counts(),
+        }))
+    elif not args.json:
+        if len(messages) > 0:
+            messages.append("")  # padding
+
+        messages.append(f"Out of {oracle.screen_count} screens:")
+        for rarity, count in sorted(oracle.get_rarity_counts().items()):
+            messages.append(f"{count} guarantee {rarity}*")
+
+    return messages
+
+
+def use_recruitment_oracle(args: argparse.Namespace) -> None:
+    """Builds the screen oracle or reports on it, depending on
+    args.mode, and prints the results to the screen."""
+    # JSON output is meant for other tools, so nothing else should be
+    # printed along with it
+    spinner = Halo(
+        text="Fetching...",
+        spinner="dots",
+        color="magenta",
+        enabled=not args.json
+    )
+    spinner.start()
+
+    recruitment_data = initialize_recruitment_data(args.refresh)
+    if recruitment_data is None:
+        spinner.fail("Failed.")
         sys.stdout.write(
-            "Note: the lower down the tag collection, "
-            + "the better the tags.\n\n\n"
-        )  # padding
+            "\n\nThe tag JSON could not be fetched! Try again later.\n"
+        )
+        return
 
-        if len(messages) <= 0:
-            sys.stdout.write("Could not find any recruitment results.\n")
-        else:
-            for msg in messages:
-                sys.stdout.write(msg + "\n")
+    spinner.text = "Calculating..."
+    spinner.color = "yellow"
+
+    if args.mode == "build":
+        messages = build_recruitment_oracle(args, recruitment_data)
+    else:
+        messages = report_recruitment_oracle(args, recruitment_data)
+
+    if messages is None:
+        spinner.fail("Failed.")
+        sys.stdout.write(
+            "\n\nThe oracle hasn't been built for the current "
+            + "recruitment pool yet! Run `recruitop oracle build` first.\n"
+        )
+        return
+
+    spinner.succeed("Success!")
+    if not args.json:
+        sys.stdout.write("\n\n")  # padding
+    for message in messages:
+        sys.stdout.write(message + "\n")
+    if not args.json:
         sys.stdout.write("\n")  # padding
 
 
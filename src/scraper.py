@@ -3,35 +3,41 @@ function in the 'ark' library, with both JSON parsing and Gamepress
 implementation implemented."""
 
 import argparse
+import functools
 import sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Optional, Tuple
 
 from halo import Halo  # extremely important
-from bs4 import BeautifulSoup
 
 from operatorclasses.operator import Operator
 
-from inputfuncs.input_reader import (
-    read_lines_into_dict,
-    read_line_from_file
+from inputfuncs.input_reader import read_lines_into_dict
+from inputfuncs.scraper_functions import use_offline_data
+from inputfuncs.data_sources import (
+    get_json_table,
+    get_record_table,
+    load_tables
 )
-from inputfuncs.scraper_functions import (
-    scrape_for_operator,
-    scrape_json
+from scraperfuncs.global_parser_functions import (
+    get_proper_operator_name,
+    parse_stats
 )
-from scraperfuncs.global_parser_functions import parse_stats
 
 # Import the needed search functions for Gamepress
 from scraperfuncs.gamepress_search_functions import (
     find_talents,
     find_base_skills,
     create_stats_json,
-    find_siblings_of_breakpoint,
     find_skills
 )
+from scraperfuncs.gamepress_page_parser import get_needed_sections
+from scraperfuncs.gamepress_page_cache import get_operator_page
 
 # Import the needed search functions for Aceship's JSON
 from scraperfuncs.json_parser_functions import (
     filter_description,
+    get_operator_index,
     create_stats_dict,
     parse_talents,
     parse_skills,
@@ -42,6 +48,19 @@ from scraperfuncs.json_parser_functions import (
 ### FUNCTIONS ########################
 
 
+def get_needed_tables(args):
+    """Returns the names of every JSON table needed to display what
+    was asked for in args."""
+    tables = ["character"]
+
+    if args.skills or args.vskills or args.all:
+        tables.append("skill")
+    if args.base or args.all:
+        tables += ["building", "riic"]
+
+    return tables
+
+
 def get_operator_dict(operator):
     """Searches the Aceship character JSON for a specified operator,
     and returns the associated character dict and the character key
@@ -55,38 +74,25 @@ def get_operator_dict(operator):
     # Since the JSON I first use to find info uses
     # properly formatted names, I have to convert any name
     # to a properly formatted one
-
-    # TODO: Does this break DRY? This appears in gamepress too
-    replacement_names = read_lines_into_dict(
-        "./info/scraper/jsonOperatorReplacements.txt"
-    )
-
-    formatted_name = operator.replace("-", " ").title()
-    proper_name = (
-        formatted_name
-        if formatted_name not in replacement_names.keys()
-        else replacement_names[formatted_name]
-    )
+    proper_name = get_proper_operator_name(operator)
 
     # with open("character_table.json", "r", encoding="utf8") as f:
     #     operator_raw_json = json.load(f)  # debug
-    operator_raw_json = scrape_json(read_line_from_file(
-        "./info/scraper/operatorJsonUrl.txt"
-    ))
-    if operator_raw_json is None:
+    # The character JSON is only fetched once per run, no matter how
+    # many operators are looked up, and only the entries we actually
+    # use are decoded.
+    operator_json = get_record_table("character")
+    if operator_json is None:
         return {}, None
 
-    operator_dict = {}
-    operator_key = None
-    operator_json = operator_raw_json.json()
-    # operator_json = operator_raw_json #debug
-    for operator in operator_json.keys():
-        # So that names like "SilverAsh" don't screw up the parser,
-        # we take the key and convert it to the title form (Silverash)
-        if operator_json[operator]["name"].title() == proper_name:
-            operator_key = operator
-            operator_dict = operator_json[operator]
-            break
+    # The index matches every (title form) name to its key, so we
+    # don't have to look through the entire JSON for every operator
+    operator_key = get_operator_index().get(proper_name)
+    operator_dict = (
+        operator_json[operator_key]
+        if operator_key is not None
+        else {}
+    )
 
     return operator_dict, operator_key
 
@@ -133,47 +139,48 @@ def get_info_from_gamepress(args, operator_name):
     which is then assigned to the Operator object that is
     to be returned.
     """
-    response = scrape_for_operator(operator_name)
-    if response is not None:  # response succeeds
-        src = response.content
+    # The stats table is only needed for stats, so we only load it then,
+    # but at the same time as the page so we don't wait twice. It's
+    # only fetched once per run, however many operators need it.
+    # The page is saved once it's parsed, so it's only downloaded and
+    # parsed again once it's old (or with --refresh).
+    get_page = functools.partial(
+        get_operator_page,
+        operator_name,
+        get_needed_sections(args),
+        args.refresh
+    )
+    if args.info or args.all:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            stats_future = executor.submit(get_json_table, "stats")
+            page = get_page()
+            stats_table = stats_future.result()
+    else:
+        page, stats_table = get_page(), None
 
+    if page is not None:  # the page was found
         images_dict = read_lines_into_dict(
             "./info/scraper/imageToText.txt"
         )
-        replacement_names = read_lines_into_dict(
-            "./info/scraper/jsonOperatorReplacements.txt"
-        )
-
-        soup = BeautifulSoup(src, "lxml")
-        # soup = BeautifulSoup(open("debug.html", "r", encoding="utf-8"), "lxml") # debugging
+        # page = extract_operator_page(open("debug.html", "rb").read(), ALL_SECTIONS) # debugging
 
         # Finding the default information that should be displayed
         # for every operator (eg. tags, description, etc.)
-        tags = list(
-            map(
-                lambda souptxt: souptxt.text.strip(),
-                soup.find_all("div", "tag-title")
-            )
-        )
+        tags = list(page.tags)
 
-        # We can find the rarity of an operator by finding the div
-        # named rarity-cell and counting how many images of stars
-        # are in it
-        rarity = len(soup.find("div", "rarity-cell").find_all("img"))
+        # The rarity is how many images of stars are in the
+        # rarity-cell div
+        rarity = page.rarity
 
-        profession_text = (
-            soup.find("div", "profession-title")
-            .text.strip()
-        )
+        profession_text = page.profession
 
-        desc = soup.find_all("div", "description-box")
+        desc = page.descriptions
 
         desc_text = (
             ["No proper description."]
             if (len(desc) < 3)
             else [
-                "".join(
-                    find_siblings_of_breakpoint(desc[item])).strip() + "\n"
+                desc[item].strip() + "\n"
                 for item in range(3)
             ]
         )
@@ -181,12 +188,7 @@ def get_info_from_gamepress(args, operator_name):
         # Since the alternative JSON I use to find stats may have
         # another name for an operator, I have to convert any name
         # to a proper one recognized by that specific json
-        formatted_name = operator_name.replace("-", " ").title()
-        proper_name = (
-            formatted_name
-            if formatted_name not in replacement_names.keys()
-            else replacement_names[formatted_name]
-        )
+        proper_name = get_proper_operator_name(operator_name)
 
         operator = Operator(
             proper_name,
@@ -239,26 +241,26 @@ def get_info_from_gamepress(args, operator_name):
                 "skills",
                 check_skills,
                 find_skills,
-                [soup, skill_tiers_to_check]
+                [page, skill_tiers_to_check]
             ],
             [
                 "talent",
                 args.talent,
                 find_talents,
-                [soup, images_dict]
+                [page, images_dict]
             ],
             [
                 "base skills",
                 args.base,
                 find_base_skills,
-                [soup, images_dict]
+                [page, images_dict]
             ],
         ]
 
         stats_requirements = [
             args.info,
             create_stats_json,
-            [soup, proper_name]
+            [page, proper_name, stats_table]
         ]
         # Set the operator object's properties based on conditional
         # list
@@ -397,40 +399,54 @@ def set_operator_properties(args, conds, stats_conds, operator):
 ######################################
 
 
-def find_operator_info(
+def gather_operator_info(
         args: argparse.Namespace,
         operator_name: str
-) -> None:
-    """With the specified arguments, calls all the functions
-    needed to find information and print all information
-    out to the screen.
+) -> Tuple[Optional[Operator], bool]:
+    """With the specified arguments, calls all the functions needed
+    to find information about an operator, and returns the built
+    Operator object (or None if it couldn't be found) along with
+    whether Gamepress was used instead of the JSONs.
 
     This function will determine whether to use Gamepress
     or JSON for information, then call either one's appropriate
     information-getting functions and build an Operator object using
     the provided information.
 
-    The Operator object will be used for printing. Nothing is returned.
+    Nothing is printed, so this can safely be called for multiple
+    operators at the same time.
     """
-    spinner = Halo(text="Fetching...", spinner="dots", color="magenta")
-    # Initialize the arguments for cmd purposes
-    spinner.start()
+    # Every JSON we'll need is fetched at the same time up front
+    if not args.gamepress:
+        load_tables(get_needed_tables(args))
 
     operator_dict, operator_key = get_operator_dict(operator_name)
 
-    spinner.text = "Parsing..."
-    spinner.color = "yellow"
-
     operator = parse_operator_data(
         args,
         operator_dict,
         operator_key,
         operator_name)
-    # ----------------------------------------
 
+    return operator, operator_dict == {} or args.gamepress
+
+
+def write_operator_info(
+        operator_name: str,
+        operator: Optional[Operator],
+        used_gamepress: bool,
+        spinner: Optional[Halo] = None
+) -> None:
+    """Prints out all the information in an Operator object (built by
+    gather_operator_info()) to the screen.
+
+    If a spinner is provided, it will be stopped with a success or
+    failure message before anything else is printed.
+    """
     if operator is not None:
-        spinner.succeed("Success!")
-        if operator_dict == {} or args.gamepress:
+        if spinner is not None:
+            spinner.succeed("Success!")
+        if used_gamepress:
             sys.stdout.write("\nSkipping JSON; Using gamepress.\n")
 
         # Print out the results
@@ -459,7 +475,8 @@ def find_operator_info(
                 sys.stdout.write(text + "\n")
 
     else:
-        spinner.fail("Failed.")
+        if spinner is not None:
+            spinner.fail("Failed.")
         sys.stdout.write(
             "\n\n"
             + operator_name.replace("-", " ").title()
@@ -474,11 +491,84 @@ def find_operator_info(
     sys.stdout.write("\n\n")
 
 
+def find_operator_info(
+        args: argparse.Namespace,
+        operator_name: str
+) -> None:
+    """With the specified arguments, finds all the information about
+    an operator and prints it out to the screen.
+
+    Nothing is returned.
+    """
+    spinner = Halo(text="Fetching...", spinner="dots", color="magenta")
+    # Initialize the arguments for cmd purposes
+    spinner.start()
+
+    operator, used_gamepress = gather_operator_info(args, operator_name)
+
+    write_operator_info(operator_name, operator, used_gamepress, spinner)
+
+
+def find_all_operator_info_concurrently(
+        args: argparse.Namespace
+) -> None:
+    """Finds the info of every operator in args.operator at the same
+    time (using args.jobs workers), then prints all of it to the screen
+    in the order the operators were specified.
+
+    Threads are used by default, since most of the time is spent
+    waiting on requests. If args.processes is specified, processes are
+    used instead so that parsing Gamepress pages also happens
+    in parallel.
+    """
+    spinner = Halo(text="Fetching...", spinner="dots", color="magenta")
+    spinner.start()
+
+    executor_class = (
+        ProcessPoolExecutor
+        if args.processes
+        else ThreadPoolExecutor
+    )
+    # Processes don't share our settings, so each one has to be
+    # switched to offline mode by itself
+    executor_options = (
+        {"initializer": use_offline_data, "initargs": (args.data_dir,)}
+        if args.processes and args.offline
+        else {}
+    )
+    with executor_class(
+            max_workers=args.jobs,
+            **executor_options
+    ) as executor:
+        # map() gives back the results in the same order as the
+        # operators, no matter which one finishes first
+        all_results = list(executor.map(
+            functools.partial(gather_operator_info, args),
+            args.operator
+        ))
+
+    spinner.succeed("Done!")
+
+    for index, (operator_name, (operator, used_gamepress)) in enumerate(
+            zip(args.operator, all_results)
+    ):
+        write_operator_info(operator_name, operator, used_gamepress)
+        sys.stdout.write(
+            ""
+            if index + 1 == len(args.operator)
+            else "------------------------------------\n\n"
+        )
+
+
 def find_all_operator_info(
         args: argparse.Namespace
 ) -> None:
     """Finds each operator's info as specified in args.operator and
     prints the info the the screen."""
+    if args.jobs > 1 and len(args.operator) > 1:
+        find_all_operator_info_concurrently(args)
+        return
+
     for index, operator in enumerate(args.operator):
         find_operator_info(args, operator)
         sys.stdout.write(
@@ -0,0 +1,146 @@
+"""This module saves the GamepressPage of every operator page that gets
+parsed (see gamepress_page_parser.py), so that looking up the same
+operator again doesn't have to download or parse its page at all.
+
+Each page is saved with the hash of the HTML it was parsed from. Once
+a saved page is older than the page_ttl in
+info/network/cacheSettings.txt, the HTML is fetched again, but it's
+only parsed again if its hash changed. Pages that haven't been looked
+up in page_max_age seconds are removed."""
+
+import sys
+import time
+import hashlib
+from typing import List, Optional, Tuple
+
+import requests
+
+from inputfuncs.input_reader import read_lines_into_dict
+from inputfuncs.scraper_functions import get_operator_url, scrape_website
+from inputfuncs.artifact_store import (
+    load_artifact,
+    save_artifact,
+    touch_artifact,
+    prune_old_artifacts
+)
+from scraperfuncs.gamepress_page_parser import (
+    ALL_SECTIONS,
+    GamepressPage,
+    extract_operator_page
+)
+
+
+# Bump this whenever GamepressPage (or how pages are parsed) changes,
+# so that pages saved the old way get parsed again.
+PAGE_CACHE_VERSION = 1
+
+
+def get_page_settings() -> Optional[Tuple[float, float]]:
+    """Returns how many seconds a saved page is used before its HTML
+    is fetched again, and how many seconds it's kept before it's
+    removed, or None if caching has been turned off in the settings."""
+    settings = read_lines_into_dict("./info/network/cacheSettings.txt")
+
+    if settings["enabled"].lower() != "true":
+        return None
+
+    return float(settings["page_ttl"]), float(settings["page_max_age"])
+
+
+def get_page_key(url: str) -> str:
+    """Returns the key that the page of a certain url is saved under."""
+    url_hash = hashlib.sha256(url.encode("utf8")).hexdigest()
+
+    return f"{url_hash}-v{PAGE_CACHE_VERSION}"
+
+
+def get_operator_page(
+        operator: str,
+        sections: List[str],
+        refresh: bool = False
+) -> Optional[GamepressPage]:
+    """Returns the GamepressPage of a certain operator, or None if
+    the page could not be fetched.
+
+    A saved page is returned straight away while it is still fresh.
+    Once it isn't (or if refresh is True), the HTML is fetched again
+    and the saved page is only replaced if the HTML changed. If the
+    HTML can't be fetched, the saved page is still used.
+
+    Keyword arguments:
+
+    operator -- string, the name of the operator (as used in its url)
+
+    sections -- list, the sections to read if caching is turned off
+    (see get_needed_sections()). Saved pages always have every
+    section, so they can be reused no matter what's asked for.
+
+    refresh -- bool, if True, always asks the server whether the page
+    changed instead of reusing the saved one (default: False)
+    """
+    url = get_operator_url(operator)
+    page_settings = get_page_settings()
+
+    if page_settings is None:
+        response = scrape_website(url, refresh)
+
+        return (
+            extract_operator_page(response.content, sections)
+            if response is not None
+            else None
+        )
+
+    ttl, max_age = page_settings
+    key = get_page_key(url)
+    entry = load_artifact("gamepress_page", key)
+    if (
+            entry is not None
+            and not refresh
+            and time.time() - entry["saved"] < ttl
+    ):
+        touch_artifact("gamepress_page", key)
+        return entry["page"]
+
+    try:
+        response = scrape_website(url, refresh)
+    except requests.exceptions.RequestException:
+        if entry is None:
+            raise
+        response = None
+
+    if response is None:
+        # An old page is better than no page (eg. when offline)
+        if entry is None:
+            return None
+
+        touch_artifact("gamepress_page", key)
+        return entry["page"]
+
+    content_hash = hashlib.sha256(response.content).hexdigest()
+    page = (
+        entry["page"]
+        if entry is not None and entry["content_hash"] == content_hash
+        else extract_operator_page(response.content, ALL_SECTIONS)
+    )
+
+    # Every operator has their own page, so the others are kept
+    save_artifact(
+        "gamepress_page",
+        key,
+        {
+            "url": url,
+            "content_hash": content_hash,
+            "saved": time.time(),
+            "page": page
+        },
+        prune=False
+    )
+    prune_old_artifacts("gamepress_page", max_age)
+
+    return page
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
@@ -0,0 +1,367 @@
+"""This module parses Gamepress operator pages into a GamepressPage,
+which holds everything the scraper reads from a page as plain text.
+
+A whole operator page is a lot of HTML, and turning all of it into a
+BeautifulSoup tree (then searching the whole tree again for every
+section) takes far longer than reading the few sections the scraper
+looks at. Instead, the page is parsed with lxml and gone over once,
+and every element of interest is put into its section by its class as
+it's found. The functions in gamepress_search_functions.py then format
+the GamepressPage, so a new section only needs a new bucket here, not
+another search of the page."""
+
+import sys
+import argparse
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import lxml.html
+from bs4 import UnicodeDammit
+
+
+# The classes of the divs every operator needs (tags, rarity,
+# profession, and description)
+BASIC_SECTIONS = [
+    "tag-title",
+    "rarity-cell",
+    "profession-title",
+    "description-box"
+]
+
+# Not a class, but the script with the myStats variable in it
+MY_STATS_SECTION = "myStats"
+
+# Every section a GamepressPage can have
+ALL_SECTIONS = BASIC_SECTIONS + [
+    "skill-cell",
+    "talent-cell",
+    "building-buff-cell",
+    "other-stat-value-cell",
+    MY_STATS_SECTION
+]
+
+# Each skill's tiers are in divs with this class, followed by the
+# tier's number
+SKILL_TIER_PREFIX = "skill-upgrade-tab-"
+
+# The characters BeautifulSoup counts as whitespace, as a table that
+# removes them
+_ASCII_SPACES = str.maketrans("", "", "\x20\x0a\x09\x0c\x0d")
+
+
+class GamepressPage(NamedTuple):
+    """Everything the scraper reads from a Gamepress operator page (see
+    extract_operator_page()).
+
+    Sections that weren't asked for are left empty.
+    """
+    tags: List[str]
+    rarity: int
+    profession: str
+    # The text of each description box (split at every <br>)
+    descriptions: List[str]
+    # Each skill's title, and the text of every div of each tier
+    skills: List[Tuple[str, Dict[str, List[str]]]]
+    # Each talent cell's talents, as their strings and image sources
+    talents: List[List[Tuple[List[str], List[str]]]]
+    # Each base skill's top strings, top image source, and bottom
+    # strings
+    base_skills: List[Tuple[List[str], Optional[str], List[str]]]
+    # The script with myStats in it, if it was found
+    my_stats: Optional[str]
+    # The strings of every other stat cell
+    other_stats: List[List[str]]
+
+
+def get_needed_sections(args: argparse.Namespace) -> List[str]:
+    """Returns the sections of an operator page (mostly div classes)
+    needed to display what was asked for in args."""
+    sections = list(BASIC_SECTIONS)
+
+    if args.skills or args.vskills or args.all:
+        sections.append("skill-cell")
+    if args.talent or args.all:
+        sections.append("talent-cell")
+    if args.base or args.all:
+        sections.append("building-buff-cell")
+    if args.info or args.all:
+        sections += ["other-stat-value-cell", MY_STATS_SECTION]
+
+    return sections
+
+
+def _normalize_string(string: str) -> str:
+    """Returns a piece of text the way BeautifulSoup would keep it
+    (text that's only whitespace becomes a single newline or space)."""
+    if string.translate(_ASCII_SPACES) != "":
+        return string
+
+    return "\n" if "\n" in string else " "
+
+
+def get_text(element: lxml.html.HtmlElement) -> str:
+    """Returns all the text in an element (like BeautifulSoup's
+    text)."""
+    return "".join(map(_normalize_string, element.itertext()))
+
+
+def get_stripped_strings(element: lxml.html.HtmlElement) -> List[str]:
+    """Returns every piece of text in an element, stripped, leaving
+    out the ones that are only whitespace (like BeautifulSoup's
+    stripped_strings)."""
+    return [
+        string.strip()
+        for string in element.itertext()
+        if string.strip() != ""
+    ]
+
+
+def _get_child_nodes(
+        parent: lxml.html.HtmlElement
+) -> List[Union[str, lxml.html.HtmlElement]]:
+    """Returns the children of an element with the text in between them
+    as strings, like BeautifulSoup's contents (comments are strings
+    too)."""
+    nodes = []
+    if parent.text:
+        nodes.append(_normalize_string(parent.text))
+
+    for child in parent:
+        nodes.append(
+            child
+            if isinstance(child.tag, str)
+            else _normalize_string(child.text or "")
+        )
+        if child.tail:
+            nodes.append(_normalize_string(child.tail))
+
+    return nodes
+
+
+def find_siblings_of_breakpoint(
+        element: lxml.html.HtmlElement
+) -> Union[List[str], str]:
+    """Gets all the text from the sibling of a breakpoint and return as
+    list of strings.
+
+    Sometimes, a description could be formatted with a br, which
+    doesn't work well when doing o.text.strip().
+    To solve that, we find the <br>'s sibling text (both previous and
+    next siblings), take the text, and format the text ourselves,
+    adding a `\\n` wherever needed.
+
+    If a <br> tag isn't found, just return the object's text, stripped.
+    """
+    brkpoint = list(element.iterdescendants("br"))
+
+    if brkpoint == []:
+        return get_text(element).strip()
+
+    description_list = []
+    for index, br_tag in enumerate(brkpoint):
+        siblings = _get_child_nodes(br_tag.getparent())
+        position = siblings.index(br_tag)
+
+        # We only need to get the previous siblings for the
+        # first <br> tag. Then we can just get the
+        # next siblings for every other <br> tag
+        # to complete the description.
+        if index == 0:
+            prev_brk_text = []
+            for sibling in reversed(siblings[:position]):
+                if isinstance(sibling, str):
+                    prev_brk_text.append(sibling)
+                elif sibling.tag == "br":
+                    break
+                else:
+                    prev_brk_text.append(get_text(sibling).strip())
+            prev_brk_text.reverse()
+            prev_brk_text[-1] += "\n"
+            description_list += prev_brk_text
+
+        next_brk_text = []
+        for sibling in siblings[position + 1:]:
+            if isinstance(sibling, str):
+                next_brk_text.append(sibling)
+            elif sibling.tag == "br":
+                break
+            else:
+                next_brk_text.append(get_text(sibling).strip())
+        next_brk_text[-1] += "\n"
+        description_list += next_brk_text
+
+    return description_list
+
+
+def _find_owner(
+        element: lxml.html.HtmlElement,
+        owners: Dict[lxml.html.HtmlElement, object]
+) -> Optional[object]:
+    """Returns what the closest ancestor of an element that's in owners
+    is matched with, or None if none of them are."""
+    for ancestor in element.iterancestors("div"):
+        if ancestor in owners:
+            return owners[ancestor]
+
+    return None
+
+
+def _get_base_skill(
+        base_skill: Dict[str, lxml.html.HtmlElement]
+) -> Tuple[List[str], Optional[str], List[str]]:
+    """Returns the top strings, top image source, and bottom strings of
+    a base skill's cells (see extract_operator_page())."""
+    top_cell = base_skill.get("top-cell")
+    bottom_cell = base_skill.get("bottom-cell")
+
+    top_image = (
+        next(top_cell.iter("img"), None)
+        if top_cell is not None
+        else None
+    )
+
+    return (
+        get_stripped_strings(top_cell) if top_cell is not None else [],
+        top_image.get("src") if top_image is not None else None,
+        get_stripped_strings(bottom_cell) if bottom_cell is not None else []
+    )
+
+
+def extract_operator_page(
+        src: bytes,
+        sections: List[str]
+) -> GamepressPage:
+    """Parses an operator page and returns a GamepressPage with the
+    specified sections in it (see get_needed_sections()), going over
+    the page only once.
+
+    Keyword arguments:
+
+    src -- bytes, the HTML of the operator page
+
+    sections -- list, the sections to read
+    """
+    # Work out the encoding the same way BeautifulSoup would, and give
+    # lxml its own parser (parsers can't be shared between threads)
+    markup = UnicodeDammit(src, is_html=True).unicode_markup
+    page = lxml.html.fromstring(
+        markup.encode("utf8"),
+        parser=lxml.html.HTMLParser(encoding="utf8")
+    )
+    section_classes = set(sections)
+
+    tags = []
+    rarity = None
+    profession = None
+    descriptions = []
+    skills = []
+    talents = []
+    base_skills = []
+    my_stats = None
+    other_stats = []
+
+    # The skill/talent/base skill of each of those cells, so that the
+    # divs inside them know where they go (a cell always comes before
+    # the divs inside it)
+    skill_cells = {}
+    talent_cells = {}
+    building_cells = {}
+
+    for element in page.iter("div", "script"):
+        if element.tag == "script":
+            if (
+                    my_stats is None
+                    and MY_STATS_SECTION in section_classes
+                    and element.text
+                    and "myStats =" in element.text
+            ):
+                my_stats = element.text
+            continue
+
+        classes = element.get("class")
+        if not classes:
+            continue
+
+        for element_class in classes.split():
+            # The sections themselves
+            if element_class not in section_classes:
+                pass
+
+            elif element_class == "tag-title":
+                tags.append(get_text(element).strip())
+
+            elif element_class == "rarity-cell":
+                # We can find the rarity of an operator by counting
+                # how many images of stars are in the first rarity-cell
+                if rarity is None:
+                    rarity = len(list(element.iter("img")))
+
+            elif element_class == "profession-title":
+                if profession is None:
+                    profession = get_text(element).strip()
+
+            elif element_class == "description-box":
+                descriptions.append(
+                    "".join(find_siblings_of_breakpoint(element))
+                )
+
+            elif element_class == "skill-cell":
+                skill_cells[element] = {"title": None, "tiers": {}}
+                skills.append(skill_cells[element])
+
+            elif element_class == "talent-cell":
+                talent_cells[element] = []
+                talents.append(talent_cells[element])
+
+            elif element_class == "building-buff-cell":
+                building_cells[element] = {}
+                base_skills.append(building_cells[element])
+
+            elif element_class == "other-stat-value-cell":
+                other_stats.append(get_stripped_strings(element))
+
+            # The parts of a section, which go with the cell they're in
+            if element_class == "skill-title-cell":
+                skill = _find_owner(element, skill_cells)
+                if skill is not None and skill["title"] is None:
+                    skill["title"] = get_text(element)
+
+            elif element_class.startswith(SKILL_TIER_PREFIX):
+                skill = _find_owner(element, skill_cells)
+                if skill is not None:
+                    skill["tiers"].setdefault(element_class, []).append(
+                        "".join(find_siblings_of_breakpoint(element))
+                    )
+
+            elif element_class == "talent-child":
+                cell_talents = _find_owner(element, talent_cells)
+                if cell_talents is not None:
+                    cell_talents.append((
+                        get_stripped_strings(element),
+                        [image.get("src") for image in element.iter("img")]
+                    ))
+
+            elif element_class in ("top-cell", "bottom-cell"):
+                base_skill = _find_owner(element, building_cells)
+                if (
+                        base_skill is not None
+                        and element_class not in base_skill.keys()
+                ):
+                    base_skill[element_class] = element
+
+    return GamepressPage(
+        tags,
+        rarity if rarity is not None else 0,
+        profession if profession is not None else "",
+        descriptions,
+        [(skill["title"] or "", skill["tiers"]) for skill in skills],
+        talents,
+        [_get_base_skill(base_skill) for base_skill in base_skills],
+        my_stats,
+        other_stats
+    )
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
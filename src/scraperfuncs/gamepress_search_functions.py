@@ -3,81 +3,21 @@ information from Gamepress."""
 
 import re
 import sys
-from bs4 import Tag
-from inputfuncs.input_reader import read_line_from_file
-from inputfuncs.scraper_functions import scrape_website
-
-
-def find_siblings_of_breakpoint(soupobj):
-    """Gets all the text from the sibling of a breakpoint and return as
-    list of strings.
-
-    Sometimes, a description could be formatted with a br, which
-    bs4 doesn't work well with when doing o.text.strip().
-    To solve that, we find the <br>'s sibling text (both previous and
-    next siblings), take the text, and format the text ourselves,
-    adding a `\\n` wherever needed.
-
-    If a <br> tag isn't found, just return the object's text, stripped.
-    """
-    brkpoint = soupobj.find_all("br")
-
-    # TODO: those two for loops are so similar omg
-    if brkpoint != []:
-        description_list = []
-        prev_brk_text = []
-        # previous_siblings gives you the tags in reverse,
-        # so you have to reverse it after getting them all
-        # also oh my freaking goodness both isinstance AND break
-        # in the same block?? execute this man
-        for sibling in brkpoint[0].previous_siblings:
-            if isinstance(sibling, Tag):
-                if sibling.name == "br":
-                    break
-
-                prev_brk_text.append(sibling.text.strip())
-            else:
-                prev_brk_text.append(str(sibling))
-        prev_brk_text.reverse()
-        prev_brk_text[-1] += "\n"
-        description_list += prev_brk_text
-
-        # We only need to get the previous siblings for the
-        # first <br> tag. Then we can just get the
-        # next siblings for every other <br> tag
-        # to complete the description.
-        for br_tag in brkpoint:
-            next_brk_text = []
-
-            for sibling in br_tag.next_siblings:
-                if isinstance(sibling, Tag):
-                    if sibling.name == "br":
-                        break
-
-                    next_brk_text.append(sibling.text.strip())
-                else:
-                    next_brk_text.append(str(sibling))
-            next_brk_text[-1] += "\n"
-            description_list += next_brk_text
-
-        return description_list
-    else:
-        return soupobj.text.strip()
 
 
 # Specific section locators
-def find_talents(soup, images_dict):
-    """Locates the talents section from the specified BeautifulSoup
-    object (which should contain an operator page), formates the text,
-    and returns a list of strings containing the formatted talents.
+def find_talents(page, images_dict):
+    """Formats the talents section of the specified GamepressPage
+    (see gamepress_page_parser.py), and returns a list of strings
+    containing the formatted talents.
 
     The `images_dict` dictionary is needed to convert images into their
     CLI equivalents.
 
-    The talents are located using the 'talent-cell' class as a
-    startpoint, and formatting the text found in there.
+    The talents come from the 'talent-cell' divs of the page, and
+    the text found in there is formatted.
     """
-    all_cells = soup.find_all("div", "talent-cell")
+    all_cells = page.talents
 
     if len(all_cells) == 0:
         return ["\n\nTalents\nNo talents found!"]
@@ -85,18 +25,14 @@ def find_talents(soup, images_dict):
     messages = []
     messages.append("\n\nTalents\n")
 
-    for cell in all_cells:
-        all_children = cell.find_all("div", "talent-child")
-
-        for child in all_children:
+    for all_children in all_cells:
+        for child_strings, child_images in all_children:
             text = ""
 
             # Converting images to their text equivalent
-            images = child.find_all("img")
-
             image_texts = []
-            for image in images:
-                image_texts.append(images_dict[image.attrs["src"]])
+            for image in child_images:
+                image_texts.append(images_dict[image])
             # Adds a delimiter (-) and a new line to
             # seperate the text from the name of talent, pot, etc.
             # cause FORMATTING
@@ -105,9 +41,7 @@ def find_talents(soup, images_dict):
             # Formatting and getting rid of the newlines and whatnot
             # The lists assist with formatting and proper segmenting
             # of the talents
-            all_text = []
-            for string in child.stripped_strings:
-                all_text.append(string)
+            all_text = list(child_strings)
 
             # inserts image_texts into all_text at index 2
             all_text[2: 2] = image_texts
@@ -123,18 +57,18 @@ def find_talents(soup, images_dict):
     return messages
 
 
-def find_base_skills(soup, images_dict):
-    """Locates the base skills section in the provided BeautifulSoup
-    object (which should contain an operator page), formats the text,
-    and returns a list of formatted messages.
+def find_base_skills(page, images_dict):
+    """Formats the base skills section of the specified GamepressPage
+    (see gamepress_page_parser.py), and returns a list of formatted
+    messages.
 
     The `images_dict` dictionary is required to convert images into
     their CLI equivalents.
 
-    The 'building-buff-cell' class is used to find where the
-    base skills are.
+    The base skills come from the 'building-buff-cell' divs of the
+    page.
     """
-    building_cells = soup.find_all("div", "building-buff-cell")
+    building_cells = page.base_skills
 
     if len(building_cells) == 0:
         return ["\n\nBase Skills\nNo base skills found!"]
@@ -142,28 +76,22 @@ def find_base_skills(soup, images_dict):
     messages = []
     messages.append("\n\nBase Skills\n")
 
-    if len(building_cells) == 0:
-        return ["No base skills found!"]
-
-    for cell in building_cells:
+    for top_strings, top_image, bottom_strings in building_cells:
         text = ""
 
-        # The base skills are laid out in top-cell, bottom-cell format
-        # Finding them seperately helps with formatting, even if it's technically a bit slower than
-        # just finding the whole div chunk and parsing with that.
-        top_cell = cell.find("div", "top-cell")
-        bottom_cell = cell.find("div", "bottom-cell")
+        # The base skills are laid out in top-cell, bottom-cell format,
+        # so they're kept seperately to help with formatting.
 
         # Potentials don't help with base skills, so this is only for E1, E2, etc.
-        image = images_dict[top_cell.find("img").attrs["src"]]
+        image = images_dict[top_image]
 
         # # Formatting and saving the text
-        for string in top_cell.stripped_strings:
+        for string in top_strings:
             text = text + string + "  "
 
         text += image + "\n "
 
-        for string in bottom_cell.stripped_strings:
+        for string in bottom_strings:
             text = text + string + " "
 
         messages.append(text + "\n")  # newline to make reading a bit easier
@@ -171,7 +99,7 @@ def find_base_skills(soup, images_dict):
     return messages
 
 
-def create_stats_json(soup, operator):
+def create_stats_json(page, operator, stats_table):
     """Creates the JSON file (dictionary) containing all the operator's stats, and returns it.
 
     This dictionary MUST have the basic operator stats
@@ -182,49 +110,37 @@ def create_stats_json(soup, operator):
     This function will first look and load the basic stats
     (ATK, DEF, HP) for each stage.
     Then it will attempt to load (Block, Cost, Res) from the
-    operator website under the variable myStats.
+    operator page's myStats variable (see gamepress_page_parser.py).
     Finally, it will attempt to load (Redeploy Time, Attack Interval)
-    from the operator website from a different section.
+    from the operator page's other stat cells.
     Thus, this function will look 3 times for the specified attributes.
 
+    The stats JSON has to be loaded beforehand (it's the "stats"
+    table in data_sources.py, keyed by operator name) and passed in as
+    `stats_table`, so that it's only fetched once no matter how many
+    operators are looked up. It can be None if that request failed.
+
     If any of these searches fails (except for the first one,
     which is essential), this function will simply set
     that attribute's value as -1, indicating failure to retrieve.
     """
-    # Load in the json file for all operators
     # TODO: should I make a response obj to hold any possible errors?
-
-    # Do this seperately because if I did it every time
-    # that would be a waste of time
-    # for requests that don't need this info.
-    stats_url = read_line_from_file(
-        "./info/scraper/url.txt") + "/stat-rankings?_format=json"
-    stats_info = scrape_website(stats_url)
-
-    if stats_info is None:
+    if stats_table is None:
         # print("Could not get the JSON file!")
         return {}  # Request failed
 
-    stats_json = None
-    for json_file in stats_info.json():
-        # for json_file in stats_info: # debugging
-        # Find the title so that names like GreyThroat don't screw
-        # up the parser.
-        if json_file["title"].title() == operator:
-            stats_json = json_file
-            break  # whoa a bad break
-
-    if stats_json is None:
+    # The table is keyed by the title-cased title, so that names like
+    # GreyThroat don't screw up the parser.
+    if operator not in stats_table.keys():
         # print("No operator found!")
         return {}  # No operator found in the big JSON file
 
-    # Find myStats from the operator's site
-    # This is so we can find res, cost, and block
-    good_scripts = soup.find_all("script", "")
-    for script in good_scripts:
-        if re.search(r"myStats =", str(script)):
-            mystats_script = script
-            break  # oh no another bad break
+    # The table is shared, so we add the other stats to a copy
+    stats_json = dict(stats_table[operator])
+
+    # myStats from the operator's site is needed so we can find res,
+    # cost, and block
+    mystats_script = page.my_stats if page.my_stats is not None else ""
 
     levels = ["ne", "e1", "e2"]
     wanted_attributes = ["arts", "cost", "block"]
@@ -234,7 +150,7 @@ def create_stats_json(soup, operator):
     for attr in wanted_attributes:
         all_stats = (
             re.findall(
-                fr'"{attr}": "(\d+)"', str(mystats_script)
+                fr'"{attr}": "(\d+)"', mystats_script
             )
         )
 
@@ -267,15 +183,10 @@ def create_stats_json(soup, operator):
 
     # other_stats will provide us with the atk speed
     # and redeploy time stats.
-    other_stats = soup.find_all("div", "other-stat-value-cell")
+    other_stats = page.other_stats
 
     if len(other_stats) > 0:
-        # Convert every object into their stripped strings counterpart
-        for stat in other_stats:
-            cur_stats_list = []
-            for string in stat.stripped_strings:
-                cur_stats_list.append(string)
-
+        for cur_stats_list in other_stats:
             if "Attack Interval" in cur_stats_list:
                 stats_json["atk_int"] = float(cur_stats_list[-1])
 
@@ -297,20 +208,19 @@ def create_stats_json(soup, operator):
     return stats_json
 
 
-def find_skills(soup, tiers_to_check):
-    """Locates the skills section in the provided BeautifulSoup
-    object (which should contain an operator page), formats the text,
-    and returns a list of formatted messages.
+def find_skills(page, tiers_to_check):
+    """Formats the skills section of the specified GamepressPage
+    (see gamepress_page_parser.py), and returns a list of formatted
+    messages.
 
     The tiers-to-check list is to choose a certain amount of skill
     tiers to display.
 
-    The 'skill-cell' class is used to find where the skills are
-    stored.
+    The skills come from the 'skill-cell' divs of the page.
     """
     # skill-cell is the class name that all skill blocks have,
-    # so we need to get them all
-    all_skills = soup.find_all("div", "skill-cell")
+    # so the page has them all
+    all_skills = page.skills
 
     # If the operator doesn't have any skill blocks,
     # they don't have any skills we can parse
@@ -323,17 +233,17 @@ def find_skills(soup, tiers_to_check):
     # consistant formatting
     messages.append("\n\nOperator Skills")
 
-    for skill in all_skills:
-        # Finding the skill title
+    for title, skill_tiers in all_skills:
+        # Adding the skill title
         # add an extra newline after every different
         # skill for readability
         messages[-1] += "\n"
-        title = skill.find("div", "skill-title-cell")
-        messages.append(title.text.strip())
+        messages.append(title.strip())
 
         for tier in tiers_to_check:
-            max_upgrade_level = tier
-            max_level = skill.find_all("div", max_upgrade_level)
+            # Each div of the tier was already split at its <br>s
+            # (see gamepress_page_parser.find_siblings_of_breakpoint())
+            max_level = list(skill_tiers.get(tier, []))
 
             # Getting the right level for the skill
             sp_string = ""
@@ -344,16 +254,6 @@ def find_skills(soup, tiers_to_check):
             else:
                 sp_string += f"{'Lv' + tier[-1:]:15}"
 
-            for i, lvl in enumerate(max_level):
-                # Since the page uses <br> to split text,
-                # we're gonna find the <br>, find the text before
-                # and after it, and use it for ourselves too.
-                #
-                # This will work for multiple br tags
-                max_level[i] = "".join(
-                    find_siblings_of_breakpoint(lvl)
-                )
-
             # Add some informative text to max level
             max_level[0] = "SP cost: " + max_level[0]
             max_level[1] = "Initial SP: " + max_level[1]
@@ -4,6 +4,29 @@ results."""
 
 import sys
 
+from inputfuncs.input_reader import read_lines_into_dict
+
+
+def get_proper_operator_name(operator):
+    """Converts an operator name given in the command line (eg.
+    `castle-3`) into the name used by the JSONs, and returns it.
+
+    The name is put in title form with spaces in place of any '-',
+    then swapped for its replacement in jsonOperatorReplacements.txt
+    if it has one (for names like Ch'en or Castle-3).
+    """
+    replacement_names = read_lines_into_dict(
+        "./info/scraper/jsonOperatorReplacements.txt"
+    )
+
+    formatted_name = operator.replace("-", " ").title()
+
+    return (
+        formatted_name
+        if formatted_name not in replacement_names.keys()
+        else replacement_names[formatted_name]
+    )
+
 
 def parse_stats(stats_dict):
     """Parses through the information in the provided stats dictionary
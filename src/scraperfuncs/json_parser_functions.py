@@ -4,11 +4,13 @@ through Aceship's JSONs and finding information from them."""
 import sys
 import re
 
-from inputfuncs.input_reader import (
-    read_line_from_file,
-    read_lines_into_dict
+from inputfuncs.input_reader import read_lines_into_dict
+from inputfuncs.data_sources import (
+    get_json_table,
+    get_record_table,
+    get_table_digest
 )
-from inputfuncs.scraper_functions import scrape_json
+from inputfuncs.artifact_store import load_artifact, save_artifact
 
 
 def filter_description(description):
@@ -37,6 +39,52 @@ def filter_description(description):
     return description_text
 
 
+def build_operator_index(operator_json):
+    """Builds and returns a dictionary matching the name of every
+    entry in the character JSON (in title form) to its key.
+
+    So that names like "SilverAsh" don't screw up the lookup, every
+    name is converted to its title form (Silverash) first, the same
+    way names from the command line are. If two entries share a name,
+    the first one in the JSON is kept.
+    """
+    operator_index = {}
+
+    for key, entry in operator_json.items():
+        if not isinstance(entry.get("name"), str):
+            continue
+
+        name = entry["name"].title()
+        if name not in operator_index.keys():
+            operator_index[name] = key
+
+    return operator_index
+
+
+def get_operator_index():
+    """Returns the name-to-key index of the character JSON.
+
+    The index is only built once for every version of the character
+    JSON (going through the record table one entry at a time), and
+    saved alongside the cached JSON so that later runs can simply load
+    it. Returns an empty dict if the JSON failed to load.
+    """
+    digest = get_table_digest("character")
+    if digest is None:
+        return {}
+
+    operator_index = load_artifact("operator_index", digest)
+    if operator_index is None:
+        operator_json = get_record_table("character")
+        if operator_json is None:
+            return {}
+
+        operator_index = build_operator_index(operator_json)
+        save_artifact("operator_index", digest, operator_index)
+
+    return operator_index
+
+
 # Specific section locators
 def create_stats_dict(operator_dict):
     """Creates a dictionary of operator stats using the JSON entry
@@ -144,25 +192,23 @@ def get_base_jsons():
     """Loads all the JSONs needed for parsing base skills,
     and returns both of them.
 
+    Both JSONs are only fetched once per run, and every call after
+    that returns the same (shared) dictionaries.
+
     If a JSON fails to load, this function will return an empty
     dictionary in place of the JSON file.
     """
     # with open("building_data_zh.json", "r", encoding="utf8") as f:
     #     base_skills_json = json.load(f)  # debug
-    # Fetch the jsons
-    base_skills_req = scrape_json(read_line_from_file(
-        "./info/scraper/baseSkillsJsonUrl.txt"
-    ))
-    riic_req = scrape_json(read_line_from_file(
-        "./info/scraper/riicJsonUrl.txt"
-    ))
-    base_skills_json, riic_json = {}, {}
+    # Fetch the jsons (only the first call actually downloads them)
+    base_skills_json = get_json_table("building")
+    riic_json = get_json_table("riic")
 
     # Make sure we retrieve the JSONs correctly
-    if base_skills_req is not None:
-        base_skills_json = base_skills_req.json()
-    if riic_req is not None:
-        riic_json = riic_req.json()
+    if base_skills_json is None:
+        base_skills_json = {}
+    if riic_json is None:
+        riic_json = {}
 
     # with open("riic.json", "r", encoding="utf8") as f:
     #     riic_json = json.load(f)
@@ -181,8 +227,8 @@ def parse_base_skills(operator_key):
     the base skills using another JSON, and format those details to
     form the final message list.
 
-    This function will make 2 other requests to other JSON files
-    in order to properly fetch base skills.
+    This function needs 2 other JSON files in order to properly fetch
+    base skills, which are only requested the first time they're used.
     """
     # We'll have to load in two seperate jsons...
     base_skills_json, riic_json = get_base_jsons()
@@ -245,20 +291,21 @@ def get_skill_jsons():
     """Loads the skill JSON needed to properly parse operator skills,
     and returns it.
 
+    The JSON is only fetched once per run, and every call after that
+    returns the same (shared) table. The table is a RecordStore, so
+    only the skills that are actually looked at are decoded.
+
     If the JSON fails to load, this function will return an empty
     dictionary in place of the JSON file.
     """
     # with open("skill_table.json", "r", encoding="utf8") as f:
     #     skills_json = json.load(f)  # debug
-    skills_req = scrape_json(read_line_from_file(
-        "./info/scraper/skillsJsonUrl.txt"
-    ))
-    skills_json = {}
+    skills_json = get_record_table("skill")
 
     # Make sure the request didn't fail, cause if it did, we can simply
     # provide an empty dict and have them catch it.
-    if skills_req is not None:
-        skills_json = skills_req.json()
+    if skills_json is None:
+        skills_json = {}
 
     return skills_json
 
@@ -275,7 +322,7 @@ def parse_skills(operator_dict, tiers_to_check):
     """
     skills_json = get_skill_jsons()
     # If failed to load skills_json
-    if skills_json == {}:
+    if len(skills_json) == 0:
         return ["\n\nSkills\nSkill JSON failed to load!"]
 
     # Couldn't find any skills...
@@ -0,0 +1,83 @@
+"""This module contains all the implementation for the 'sync'
+function in the 'ark' library, which downloads every JSON this
+program uses into a folder so that it can be used offline."""
+
+import argparse
+import glob
+import os
+import sys
+
+from halo import Halo  # extremely important
+
+from inputfuncs.input_reader import read_line_from_file
+from inputfuncs.scraper_functions import (
+    get_snapshot_path,
+    scrape_all_websites
+)
+
+
+def get_all_source_urls():
+    """Finds the url of every JSON this program uses (from each
+    `*Url.txt` file in the info folders) and returns them."""
+    url_files = sorted(
+        glob.glob("./info/scraper/*Url.txt")
+        + glob.glob("./info/recruitops/*Url.txt")
+    )
+
+    return [read_line_from_file(url_file).strip() for url_file in url_files]
+
+
+def sync_data_sources(args: argparse.Namespace) -> None:
+    """Downloads every JSON this program uses into args.data_dir, so
+    that `--offline` can read them instead of the internet.
+
+    All the JSONs are downloaded at the same time. If any of them
+    fails, the rest are still saved, and the ones that failed are
+    listed. Prints directly to the screen and returns nothing.
+    """
+    spinner = Halo(text="Syncing...", spinner="dots", color="cyan")
+    spinner.start()
+
+    all_urls = get_all_source_urls()
+
+    # Two urls with the same file name would overwrite each other
+    all_paths = [get_snapshot_path(url, args.data_dir) for url in all_urls]
+    if len(set(all_paths)) != len(all_paths):
+        spinner.fail("Failed.")
+        sys.stdout.write(
+            "\n\nTwo urls would be saved under the same file name!\n\n"
+        )
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    failed_urls = []
+    for url, path, response in zip(
+            all_urls,
+            all_paths,
+            scrape_all_websites(all_urls)
+    ):
+        if response is None:
+            failed_urls.append(url)
+            continue
+
+        with open(path, "wb") as f:
+            f.write(response.content)
+
+    if len(failed_urls) > 0:
+        spinner.fail("Failed.")
+        sys.stdout.write("\n\nCould not download:\n")
+        for url in failed_urls:
+            sys.stdout.write(url + "\n")
+        sys.stdout.write("\n")
+    else:
+        spinner.succeed("Success!")
+        sys.stdout.write(
+            f"\n\nSaved {len(all_urls)} files to '{args.data_dir}'.\n\n"
+        )
+
+
+if __name__ == "__main__":
+    sys.stdout.write(
+        "Wrong python file to run! The main file to run is `ark.py`.\n\n"
+    )
@@ -0,0 +1,10 @@
+"""Lets the tests import the program's modules the same way `ark.py`
+does (from inside `src`)."""
+
+import os
+import sys
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+)
@@ -0,0 +1,121 @@
+"""Tests for the on-disk caches: the HTTP response cache and the
+record files that record tables are read from."""
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from inputfuncs.http_cache import ResponseCache
+from inputfuncs.record_store import RecordStore, write_record_store
+
+
+def test_store_and_load_body(tmp_path):
+    cache = ResponseCache(str(tmp_path), 60, 1 << 20)
+    entry = cache.store(
+        "https://example.com/a.json",
+        {"ETag": '"1"', "Set-Cookie": "nope"},
+        b'{"a": 1}'
+    )
+
+    assert entry["body_hash"] == hashlib.sha256(b'{"a": 1}').hexdigest()
+    assert entry["headers"] == {"ETag": '"1"'}
+    assert cache.lookup("https://example.com/a.json") == entry
+    assert cache.lookup("https://example.com/b.json") is None
+    assert cache.is_fresh(entry)
+
+    assert cache.load_body(entry) == b'{"a": 1}'
+    with cache.open_body(entry) as body_file:
+        assert body_file.read() == b'{"a": 1}'
+
+
+def test_tampered_body_is_not_loaded(tmp_path):
+    cache = ResponseCache(str(tmp_path), 60, 1 << 20)
+    entry = cache.store("https://example.com/a.json", {}, b"old")
+
+    with open(
+            os.path.join(str(tmp_path), "blobs", entry["body_hash"]),
+            "wb"
+    ) as f:
+        f.write(b"new")
+
+    assert cache.load_body(entry) is None
+
+
+def test_revalidation(tmp_path):
+    cache = ResponseCache(str(tmp_path), 0, 1 << 20)
+    entry = cache.store(
+        "https://example.com/a.json",
+        {"ETag": '"1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        b"body"
+    )
+
+    assert not cache.is_fresh(entry)
+    assert cache.get_conditional_headers(entry) == {
+        "If-None-Match": '"1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"
+    }
+
+    fetched = entry["fetched"]
+    time.sleep(0.01)
+    cache.revalidate(entry, {"ETag": '"2"'})
+
+    entry = cache.lookup("https://example.com/a.json")
+    assert entry["fetched"] > fetched
+    assert entry["headers"]["ETag"] == '"2"'
+    assert cache.get_conditional_headers(entry)["If-None-Match"] == '"2"'
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path), 60, 10)
+    first = cache.store("https://example.com/1", {}, b"11111")
+    time.sleep(0.01)
+    cache.store("https://example.com/2", {}, b"22222")
+    time.sleep(0.01)
+
+    # Reading the first one makes the second the least recently used
+    assert cache.load_body(first) == b"11111"
+    time.sleep(0.01)
+    cache.store("https://example.com/3", {}, b"33333")
+
+    assert cache.lookup("https://example.com/1") is not None
+    assert cache.lookup("https://example.com/2") is None
+    assert cache.lookup("https://example.com/3") is not None
+
+
+def test_shared_body_is_stored_once(tmp_path):
+    cache = ResponseCache(str(tmp_path), 60, 10)
+    cache.store("https://example.com/1", {}, b"same body")
+    cache.store("https://example.com/2", {}, b"same body")
+
+    assert cache.lookup("https://example.com/1") is not None
+    assert len(os.listdir(os.path.join(str(tmp_path), "blobs"))) == 1
+
+
+def test_record_store(tmp_path):
+    path = os.path.join(str(tmp_path), "records", "table.records")
+    table = {
+        "char_001": {"name": "Amiya", "rarity": 5},
+        "char_002": {"name": "Kal'tsit", "phases": [1, 2, 3]},
+        "char_003": None,
+    }
+    write_record_store(path, table.items())
+
+    records = RecordStore(path)
+    assert len(records) == 3
+    assert list(records) == list(table.keys())
+    assert "char_002" in records
+    assert "char_004" not in records
+    assert dict(records.items()) == table
+    assert records.get("char_004") is None
+    records.close()
+
+
+def test_not_a_record_file(tmp_path):
+    path = os.path.join(str(tmp_path), "table.records")
+    with open(path, "wb") as f:
+        f.write(b"definitely not a record file")
+
+    with pytest.raises(ValueError):
+        RecordStore(path)
@@ -0,0 +1,55 @@
+"""Tests for reading JSON documents piece by piece, with the document
+split at every possible place."""
+
+import json
+
+import pytest
+
+from inputfuncs.json_stream import iter_json_members
+from inputfuncs.table_trimmers import trim_table_stream
+
+
+DOCUMENTS = [
+    '{"a": 1.5, "b": -12, "c": 3e10, "d": 1.5E-3, "e": [0, 10]}',
+    '[1.25, 100, -0.5e+2, {"x": 7}, true, null]',
+    '{"only": 123456}',
+    '{"nested": {"n": 0.000001}, "s": "1.5e"}',
+    ' [ ] ',
+    '{}',
+]
+
+
+def split_at(document, position):
+    """Returns a document as two chunks of bytes, split at the
+    specified byte."""
+    raw = document.encode("utf8")
+    return [raw[:position], raw[position:]]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_members_at_every_split(document):
+    expected = json.loads(document)
+    expected_members = (
+        list(enumerate(expected))
+        if isinstance(expected, list)
+        else list(expected.items())
+    )
+
+    for position in range(len(document.encode("utf8")) + 1):
+        chunks = split_at(document, position)
+        assert list(iter_json_members(chunks)) == expected_members
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_trimmed_table_at_every_split(document):
+    expected = json.loads(document)
+
+    for position in range(len(document.encode("utf8")) + 1):
+        chunks = split_at(document, position)
+        table = trim_table_stream("untrimmed", chunks)
+        assert table == expected
+        assert type(table) is type(expected)
+
+
+def test_number_cut_off_after_the_point():
+    assert list(iter_json_members([b'{"a": 1.', b'5}'])) == [("a", 1.5)]
@@ -0,0 +1,223 @@
+"""Tests for the combo table, the best-first combo search, and the
+screen oracle, checked against simply trying every combination by hand
+on a small recruitment pool."""
+
+import itertools
+
+import pytest
+
+from operatorclasses.tagged_operator import TaggedOperator
+from operatorclasses.operator_tag_index import OperatorTagIndex
+from operatorclasses.rarity_stats import RarityStats
+from recruitfuncs.combo_table import MAX_COMBO_LENGTH, build_combo_table
+from recruitfuncs.combo_search import iter_best_combos
+from recruitfuncs.screen_oracle import (
+    SCREEN_SIZE,
+    build_screen_oracle,
+    find_best_combo
+)
+from recruitop import (
+    PRIORITY_VALUES,
+    RecruitmentData,
+    find_best_guarantee,
+    is_not_top_op
+)
+
+
+TOP_TAG = "Top Operator"
+
+TAGS = [
+    TOP_TAG,
+    "Senior Operator",
+    "Guard",
+    "Sniper",
+    "Melee",
+    "Ranged",
+    "DPS",
+    "Healing",
+]
+
+POOL = [
+    TaggedOperator("Siege", 6, ["Top Operator", "Guard", "Melee", "DPS"]),
+    TaggedOperator("Exusiai", 6, ["Top Operator", "Sniper", "Ranged", "DPS"]),
+    TaggedOperator("Texas", 5, ["Senior Operator", "Melee", "DPS"]),
+    TaggedOperator("Platinum", 5, ["Senior Operator", "Sniper", "Ranged"]),
+    TaggedOperator("Dobermann", 4, ["Guard", "Melee", "DPS"]),
+    TaggedOperator("Jessica", 4, ["Sniper", "Ranged", "DPS"]),
+    TaggedOperator("Melantha", 3, ["Guard", "Melee", "DPS"]),
+    TaggedOperator("Kroos", 3, ["Sniper", "Ranged", "DPS"]),
+    TaggedOperator("Ansel", 3, ["Ranged", "Healing"]),
+    TaggedOperator("Lancet-2", 1, ["Ranged", "Healing"]),
+]
+
+
+def get_matching_operators(combo):
+    """Returns every operator in the pool that a combination of tags
+    could give, found by checking every operator one by one."""
+    return [
+        operator
+        for operator in POOL
+        if set(combo) <= set(operator.tags)
+        and (is_not_top_op(operator) or TOP_TAG in combo)
+    ]
+
+
+def get_all_position_combos(screen):
+    """Returns every 1-3 tag combination of a screen, in the same order
+    as recruitop's get_all_combinations()."""
+    return [
+        combo
+        for length in range(1, MAX_COMBO_LENGTH + 1)
+        for combo in itertools.combinations(screen, length)
+    ]
+
+
+def get_best_guarantee(screen):
+    """Returns the best rarity a screen can guarantee and the combo
+    that guarantees it (the one with the highest priority, and then
+    the first one found), found by trying every combo of the screen."""
+    best_rarity, best_priority, best_combo = 0, 0, None
+
+    for combo in get_all_position_combos(sorted(set(screen))):
+        operators = get_matching_operators(combo)
+        if len(operators) == 0:
+            continue
+
+        stats = RarityStats.from_operators(operators, PRIORITY_VALUES)
+        if best_combo is None or (stats.min_rarity, stats.priority) > (
+                best_rarity,
+                best_priority
+        ):
+            best_rarity, best_priority, best_combo = (
+                stats.min_rarity,
+                stats.priority,
+                combo
+            )
+
+    return best_rarity, best_combo
+
+
+@pytest.fixture(scope="module")
+def tag_index():
+    return OperatorTagIndex(POOL, TAGS, is_not_top_op)
+
+
+@pytest.fixture(scope="module")
+def combo_table(tag_index):
+    return build_combo_table(tag_index, TOP_TAG, PRIORITY_VALUES)
+
+
+def test_combo_table_matches_brute_force(tag_index, combo_table):
+    expected_keys = set()
+
+    for combo in get_all_position_combos(sorted(TAGS)):
+        operators = get_matching_operators(combo)
+        if len(operators) == 0:
+            assert combo not in combo_table.keys()
+            continue
+
+        expected_keys.add(combo)
+        mask, stats = combo_table[combo]
+        assert set(tag_index.decode(mask)) == set(operators)
+        assert stats == RarityStats.from_operators(
+            operators,
+            PRIORITY_VALUES
+        )
+
+    assert set(combo_table.keys()) == expected_keys
+
+
+SCREENS = [
+    list(screen)
+    for screen in itertools.combinations(TAGS, SCREEN_SIZE)
+] + [
+    # A tag can be given more than once
+    ["Guard", "Guard", "Melee", "DPS", "Top Operator"],
+    ["Healing"],
+]
+
+
+@pytest.mark.parametrize("top", [1, 3, None])
+@pytest.mark.parametrize("min_rarity", [0, 3, 4, 5, 6])
+def test_best_combos_match_brute_force(combo_table, top, min_rarity):
+    for screen in SCREENS:
+        brute_force = []
+        for rank, combo in enumerate(get_all_position_combos(screen)):
+            operators = get_matching_operators(combo)
+            if len(operators) == 0:
+                continue
+
+            stats = RarityStats.from_operators(operators, PRIORITY_VALUES)
+            if stats.min_rarity < min_rarity:
+                continue
+
+            brute_force.append((-stats.priority, -rank, combo, stats))
+
+        brute_force.sort(key=lambda result: result[:2])
+        expected = [
+            (combo, stats)
+            for _, _, combo, stats in brute_force[:top]
+        ]
+
+        best_combos = itertools.islice(
+            iter_best_combos(screen, combo_table, min_rarity),
+            top
+        )
+        assert [
+            (combo, stats)
+            for combo, _, stats in best_combos
+        ] == expected
+
+
+@pytest.fixture(scope="module")
+def oracle(tag_index, combo_table):
+    return build_screen_oracle(
+        tag_index,
+        combo_table,
+        TOP_TAG,
+        PRIORITY_VALUES,
+        jobs=1,
+        pool_digest="test"
+    )
+
+
+def test_oracle_matches_brute_force(combo_table, oracle):
+    for screen in itertools.combinations(TAGS, SCREEN_SIZE):
+        expected = get_best_guarantee(screen)
+
+        assert oracle.lookup(screen) == expected
+        assert find_best_combo(screen, combo_table) == expected
+
+
+@pytest.mark.parametrize("pool_digest", ["test", "another pool"])
+def test_best_guarantee_falls_back_to_combo_table(
+        tag_index,
+        combo_table,
+        oracle,
+        pool_digest
+):
+    recruitment_data = RecruitmentData(
+        tag_index,
+        {},
+        {},
+        combo_table,
+        pool_digest
+    )
+
+    # The oracle was never built with the last tag
+    screen = ["Guard", "Melee", "DPS", TOP_TAG, "Not A Tag"]
+    assert find_best_guarantee(screen, recruitment_data, oracle) == (
+        get_best_guarantee(screen)
+    )
+
+    screen = ["Guard", "Melee", "DPS", "Sniper", "Healing"]
+    assert find_best_guarantee(screen, recruitment_data, oracle) == (
+        get_best_guarantee(screen)
+    )
+
+    # Not a full screen
+    assert find_best_guarantee(
+        ["Guard", "Melee"],
+        recruitment_data,
+        oracle
+    ) == (None, None)